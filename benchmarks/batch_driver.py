@@ -0,0 +1,85 @@
+"""
+Driver local de lotes: envia um arquivo JSONL pelo evento {"type": "batch"} do lambda_handler
+
+Cada linha do arquivo vira um item do lote. O texto vem do campo 'text' ou, no formato do
+requests.jsonl, de 'title' + 'body'; 'voice_id', 'speed' e o identificador ('id' ou
+'request_id') são repassados quando existirem.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.batch_driver requests.jsonl --batch-size 25 --max-workers 8 --stub
+"""
+import os
+import json
+import time
+import argparse
+
+
+def load_items(path: str) -> list:
+    items = []
+    with open(path, 'r', encoding='utf-8') as jsonl_file:
+        for line_number, line in enumerate(jsonl_file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            text = record.get('text') or '. '.join(
+                part for part in (record.get('title'), record.get('body')) if part
+            )
+            item = {'id': record.get('id') or record.get('request_id') or line_number, 'text': text}
+            for field in ('voice_id', 'speed', 'use_neural'):
+                if field in record:
+                    item[field] = record[field]
+            items.append(item)
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Driver local de lotes para o lambda_handler')
+    parser.add_argument('jsonl', help='Arquivo JSONL com um item por linha')
+    parser.add_argument('--batch-size', type=int, default=25)
+    parser.add_argument('--max-workers', type=int, default=8)
+    parser.add_argument('--stub', action='store_true', help='Usa o stub local do Polly (sem AWS)')
+    args = parser.parse_args()
+
+    if args.stub:
+        os.environ.setdefault('AWS_LAMBDA_FUNCTION_NAME', 'batch-driver')
+        os.environ.pop('S3_BUCKET_NAME', None)
+        from benchmarks.polly_stub import PollyStub
+        from utils.client_registry import register_client
+        register_client('polly', 'us-east-1', PollyStub())
+
+    import lambda_function
+
+    items = load_items(args.jsonl)
+    total_chars = sum(len(item['text'] or '') for item in items)
+    succeeded = 0
+    failures = []
+
+    start = time.perf_counter()
+    for offset in range(0, len(items), args.batch_size):
+        batch = items[offset:offset + args.batch_size]
+        response = lambda_function.lambda_handler(
+            {'type': 'batch', 'items': batch, 'max_workers': args.max_workers}, None
+        )
+        body = json.loads(response['body'])
+        for result in body.get('items', []):
+            if result['success']:
+                succeeded += 1
+            else:
+                failures.append({'id': result['id'], 'error': result.get('error')})
+    elapsed = time.perf_counter() - start
+
+    report = {
+        'items': len(items),
+        'succeeded': succeeded,
+        'failed': len(failures),
+        'elapsed_seconds': round(elapsed, 3),
+        'items_per_second': round(len(items) / elapsed, 2) if elapsed else None,
+        'characters_per_second': round(total_chars / elapsed, 1) if elapsed else None,
+        'failures': failures
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
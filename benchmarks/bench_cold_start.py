@@ -0,0 +1,101 @@
+"""
+Benchmark de cold start da Lambda
+
+Executa, em um interpretador Python novo, a importação de lambda_function e a primeira
+invocação com um cliente Polly stub, medindo:
+    - tempo de importação do pacote
+    - tempo até a primeira resposta (inicialização dos serviços + síntese stub + resposta)
+    - se a importação carregou boto3/dotenv ou criou sessões AWS
+
+Falha (código de saída 1) se algum tempo passar do limite configurado.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_cold_start --max-import-ms 150 --max-first-response-ms 250
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# Código executado no interpretador novo (a medição começa antes de qualquer importação do projeto)
+PROBE = r'''
+import sys, time, json
+start = time.perf_counter()
+import lambda_function
+imported = time.perf_counter()
+heavy_modules = [name for name in ('boto3', 'dotenv', 'botocore.config') if name in sys.modules]
+
+from benchmarks.polly_stub import PollyStub
+from utils.client_registry import register_client
+register_client('polly', 'us-east-1', PollyStub())
+
+ready = time.perf_counter()
+response = lambda_function.lambda_handler({'text': 'Hello! This is a cold start probe.'}, None)
+done = time.perf_counter()
+
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'first_response_ms': (done - ready) * 1000,
+    'status_code': response['statusCode'],
+    'heavy_modules': heavy_modules
+}))
+'''
+
+
+def run_probe(project_dir: str) -> dict:
+    env = dict(os.environ)
+    env['AWS_LAMBDA_FUNCTION_NAME'] = 'cold-start-benchmark'
+    env['TMP_DIR'] = tempfile.mkdtemp(prefix='tts_cold_start_')
+    env['TTS_CACHE_MAX_MB'] = '0'
+    env.pop('TTS_S3_CACHE_BUCKET', None)
+
+    completed = subprocess.run([sys.executable, '-c', PROBE], cwd=project_dir, env=env,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de cold start da Lambda')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-import-ms', type=float, default=150.0)
+    parser.add_argument('--max-first-response-ms', type=float, default=250.0)
+    parser.add_argument('--output', help='Arquivo JSON para gravar os resultados')
+    args = parser.parse_args()
+
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    probes = [run_probe(project_dir) for _ in range(args.runs)]
+
+    results = {
+        'runs': args.runs,
+        'import_ms_median': round(statistics.median(p['import_ms'] for p in probes), 2),
+        'first_response_ms_median': round(statistics.median(p['first_response_ms'] for p in probes), 2),
+        'heavy_modules_on_import': sorted({m for p in probes for m in p['heavy_modules']}),
+        'failed_responses': sum(1 for p in probes if p['status_code'] != 200)
+    }
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    failures = []
+    if results['import_ms_median'] > args.max_import_ms:
+        failures.append(f"import time {results['import_ms_median']} ms > {args.max_import_ms} ms")
+    if results['first_response_ms_median'] > args.max_first_response_ms:
+        failures.append(f"first response {results['first_response_ms_median']} ms > {args.max_first_response_ms} ms")
+    if results['heavy_modules_on_import']:
+        failures.append(f"modules loaded on import: {results['heavy_modules_on_import']}")
+    if results['failed_responses']:
+        failures.append(f"{results['failed_responses']} probe invocations failed")
+
+    if failures:
+        print('[ERROR] Cold start budget exceeded: ' + '; '.join(failures))
+        sys.exit(1)
+    print('[DEBUG] Cold start within budget')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Pico de memória por requisição: caminho legado (arquivo em /tmp + releitura) vs. caminho em memória
+
+Usa o stub local do Polly e mede o pico de alocações Python (tracemalloc) de cada caminho,
+do retorno do Polly até o corpo JSON da resposta.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_memory --chars 1000 3000 20000 100000
+"""
+import os
+import json
+import base64
+import argparse
+import tempfile
+import tracemalloc
+
+from benchmarks.polly_stub import PollyStub
+from services.polly_services import TTSPollyService
+
+
+def legacy_response(service: TTSPollyService, text: str) -> str:
+    """
+    Caminho anterior do lambda_handler: grava o arquivo, relê e codifica em base64
+    """
+    result = service.text_to_speech(text=text, write_file=True)
+    with open(result['file_path'], 'rb') as audio_file:
+        audio_data = audio_file.read()
+        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
+    return json.dumps({'success': True, 'audio_data': audio_base64, 'duration': result['duration']})
+
+
+def in_memory_response(service: TTSPollyService, text: str) -> str:
+    """
+    Caminho atual do lambda_handler: áudio em memória, sem gravação em /tmp
+    """
+    result = service.text_to_speech(text=text, write_file=False)
+    audio_data = result.pop('audio_data')
+    audio_base64 = base64.b64encode(audio_data).decode('ascii')
+    del audio_data
+    return json.dumps({'success': True, 'audio_data': audio_base64, 'duration': result['duration']})
+
+
+def measure(path, service: TTSPollyService, text: str) -> dict:
+    tmp_before = sum(entry.stat().st_size for entry in os.scandir(service.output_dir) if entry.is_file())
+    tracemalloc.start()
+    body = path(service, text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tmp_after = sum(entry.stat().st_size for entry in os.scandir(service.output_dir) if entry.is_file())
+    return {'peak_mb': round(peak / (1024 * 1024), 3), 'body_mb': round(len(body) / (1024 * 1024), 3),
+            'tmp_written_mb': round((tmp_after - tmp_before) / (1024 * 1024), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pico de memória por requisição')
+    parser.add_argument('--chars', type=int, nargs='+', default=[1000, 3000, 20000, 100000])
+    args = parser.parse_args()
+
+    service = TTSPollyService(output_dir=tempfile.mkdtemp(prefix='tts_memory_'), cache_max_mb=0,
+                              polly_client=PollyStub())
+
+    results = []
+    for chars in args.chars:
+        text = ('The transmission began as a whisper, faint and broken. ' * (chars // 55 + 1))[:chars]
+        for label, path in (('legacy', legacy_response), ('in_memory', in_memory_response)):
+            row = {'chars': chars, 'path': label, **measure(path, service, text)}
+            results.append(row)
+            print(f"{chars:>8} chars  {label:<10} peak {row['peak_mb']:>8.3f} MB  "
+                  f"body {row['body_mb']:>8.3f} MB  /tmp written {row['tmp_written_mb']:>8.3f} MB")
+
+    print(json.dumps(results))
+
+
+if __name__ == '__main__':
+    main()
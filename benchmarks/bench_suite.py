@@ -0,0 +1,250 @@
+"""
+Suíte de benchmarks offline (sem acessar a AWS)
+
+Mede latência (p50/p95/p99), vazão e pico de memória de lambda_handler, text_to_speech e
+text_to_speech_streaming para textos de 100 B a 1 MB, com Polly e S3 stub (latência e
+limitações configuráveis). Os resultados são gravados em JSON e podem ser comparados
+com os de outro commit; a execução falha (código de saída 1) se houver regressão acima do limite.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_suite --output bench_results.json
+    python -m benchmarks.bench_suite --compare bench_baseline.json --threshold 10
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+
+TARGETS = ('lambda_handler', 'text_to_speech', 'text_to_speech_streaming')
+
+# Texto base do benchmark (ASCII: tamanho em bytes = caracteres)
+SENTENCES = (
+    "The transmission began as a whisper, faint and broken, bouncing across the void of space. ",
+    "No one on the Odyssey was supposed to be awake when it arrived. ",
+    "Mr. Vey rubbed her eyes as the console flickered, and the hum of life support filled the bay. ",
+    "She replayed the fragment: same broken words, same static!\n",
+    "Was it a distress call from the relay station near Titan? ",
+)
+
+# Métricas comparadas entre execuções (maior = pior)
+COMPARED_METRICS = ('p50_ms', 'p95_ms', 'peak_mb')
+
+
+def build_text(size: int) -> str:
+    """
+    Gera um texto determinístico com o tamanho informado em bytes
+    """
+    base = ''.join(SENTENCES)
+    return (base * (size // len(base) + 1))[:size].rstrip() or 'Hello.'
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    Percentil pelo método nearest-rank
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def configure_environment(args):
+    """
+    Ajusta o ambiente antes de importar o projeto (as configurações são lidas na importação)
+    """
+    os.environ['AWS_LAMBDA_FUNCTION_NAME'] = 'offline-benchmark'
+    os.environ['TMP_DIR'] = tempfile.mkdtemp(prefix='tts_bench_')
+    os.environ['TTS_CACHE_MAX_MB'] = '0'
+    os.environ['TTS_LOG_LEVEL'] = 'ERROR'
+    os.environ['TTS_METRICS_ENABLED'] = 'false'
+    os.environ['S3_BUCKET_NAME'] = 'offline-benchmark'
+    os.environ['TTS_POLLY_NEURAL_TPS'] = os.environ['TTS_POLLY_STANDARD_TPS'] = str(args.polly_tps)
+    os.environ['TTS_POLLY_NEURAL_BURST'] = os.environ['TTS_POLLY_STANDARD_BURST'] = str(args.polly_tps)
+    os.environ.pop('TTS_S3_CACHE_BUCKET', None)
+
+
+def make_runner(target: str, service, lambda_function):
+    """
+    Retorna a chamada medida para o alvo; cada chamada produz a resposta completa do alvo
+    """
+    if target == 'lambda_handler':
+        def run(text):
+            response = lambda_function.lambda_handler({'text': text}, None)
+            if response['statusCode'] >= 400:
+                raise RuntimeError(response['body'][:200])
+            return response
+    elif target == 'text_to_speech':
+        def run(text):
+            result = service.text_to_speech(text, write_file=False)
+            if not result['success']:
+                raise RuntimeError(result['error'])
+            return result
+    else:
+        def run(text):
+            result = service.text_to_speech_streaming(text, write_file=False)
+            if not result['success']:
+                raise RuntimeError(result['error'])
+            return result
+    return run
+
+
+def measure(run, text: str, iterations: int) -> dict:
+    """
+    Executa as iterações medindo latência e vazão; o pico de memória é medido em uma execução à parte
+    (o tracemalloc distorce os tempos)
+    """
+    try:
+        run(text)  # aquecimento
+    except Exception as e:
+        print(f"[ERROR] Warm-up call failed: {str(e)[:200]}")
+
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        try:
+            run(text)
+        except Exception:
+            errors += 1
+        latencies.append((time.perf_counter() - call_start) * 1000)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        run(text)
+    except Exception:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'throughput_rps': round(iterations / elapsed, 3),
+        'chars_per_second': round(iterations * len(text) / elapsed, 1),
+        'peak_mb': round(peak / (1024 * 1024), 3)
+    }
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """
+    Compara com os resultados de outra execução
+
+    Returns:
+        list: Regressões acima do limite (percentual)
+    """
+    previous = {(entry['target'], entry['size']): entry for entry in baseline.get('results', [])}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry['target'], entry['size']))
+        if before is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if not before.get(metric):
+                continue
+            change = (entry[metric] - before[metric]) / before[metric] * 100
+            marker = ' <-- regression' if change > threshold else ''
+            print(f"  {entry['target']:<26} {entry['size']:>8} B  {metric:<8} "
+                  f"{before[metric]:>10.3f} -> {entry[metric]:>10.3f} ({change:+.1f}%){marker}")
+            if change > threshold:
+                regressions.append({'target': entry['target'], 'size': entry['size'], 'metric': metric,
+                                    'before': before[metric], 'after': entry[metric], 'change_pct': round(change, 1)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks offline com Polly stub')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000, 1000000],
+                        help='Tamanhos de texto em bytes')
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=list(TARGETS))
+    parser.add_argument('--iterations', type=int, default=20, help='Iterações por tamanho (máximo)')
+    parser.add_argument('--budget-mb', type=float, default=200.0,
+                        help='Volume de áudio por tamanho; reduz as iterações dos textos grandes')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Latência fixa do Polly stub')
+    parser.add_argument('--latency-per-kchar-ms', type=float, default=20.0,
+                        help='Latência do Polly stub por 1000 caracteres')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fração de chamadas limitadas')
+    parser.add_argument('--polly-tps', type=float, default=1000.0, help='Cota do limitador de taxa')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='Arquivo de resultados de outra execução')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Regressão máxima aceita (%%)')
+    args = parser.parse_args()
+
+    configure_environment(args)
+
+    import lambda_function
+    from benchmarks.polly_stub import PollyStub
+    from benchmarks.s3_stub import S3Stub
+    from services.polly_services import AUDIO_BYTES_PER_SECOND, SPEECH_CHARS_PER_SECOND, get_tts_service
+    from utils.client_registry import register_client
+
+    polly_stub = PollyStub(latency=args.latency_ms / 1000, latency_per_char=args.latency_per_kchar_ms / 1e6,
+                           throttle_rate=args.throttle_rate, seed=args.seed)
+    s3_stub = S3Stub()
+    register_client('polly', 'us-east-1', polly_stub)
+    register_client('s3', 'us-east-1', s3_stub)
+    register_client('s3', lambda_function.S3_BUCKET_REGION, s3_stub)
+    service = get_tts_service(output_dir=os.environ['TMP_DIR'])
+
+    results = []
+    for target in args.targets:
+        run = make_runner(target, service, lambda_function)
+        for size in args.sizes:
+            text = build_text(size)
+            audio_bytes = size / SPEECH_CHARS_PER_SECOND * AUDIO_BYTES_PER_SECOND['mp3']
+            iterations = max(1, min(args.iterations, int(args.budget_mb * 1024 * 1024 // audio_bytes)))
+
+            entry = {'target': target, 'size': size}
+            entry.update(measure(run, text, iterations))
+            results.append(entry)
+            print(f"{target:<26} {size:>8} B  p50 {entry['p50_ms']:>10.2f} ms  p95 {entry['p95_ms']:>10.2f} ms  "
+                  f"p99 {entry['p99_ms']:>10.2f} ms  {entry['throughput_rps']:>8.2f} req/s  "
+                  f"peak {entry['peak_mb']:>9.2f} MB  errors {entry['errors']}")
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': int(time.time()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'stub': {'latency_ms': args.latency_ms, 'latency_per_kchar_ms': args.latency_per_kchar_ms,
+                     'throttle_rate': args.throttle_rate, 'seed': args.seed, 'polly_tps': args.polly_tps},
+            'polly_calls': polly_stub.calls,
+            'polly_throttled': polly_stub.throttled
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"[DEBUG] Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"[DEBUG] Comparing with {args.compare} (commit {baseline.get('meta', {}).get('commit')})")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"[ERROR] {len(regressions)} regression(s) above {args.threshold}%")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark do divisor de texto em chunks (utils.text_splitter)
+
+Compara o divisor atual com a implementação anterior (split em '. ') em entradas
+de vários megabytes e valida os limites de cada chunk.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_text_splitter --sizes-mb 1 4 8
+"""
+import time
+import random
+import argparse
+
+from utils.text_splitter import MAX_BILLED_CHARACTERS, MAX_TOTAL_CHARACTERS, SSML_TAG, split_text
+
+WORDS = ['the', 'signal', 'Odyssey', 'drifted', 'through', 'a', 'debris', 'field', 'Mr.', 'Vey',
+         'U.S.', 'captain', 'whispered', 'anomalies', 'transmission', 'coordinates', 'void']
+
+
+def legacy_split(text: str, max_length: int = 2500) -> list:
+    """
+    Implementação anterior de _split_text_for_streaming (referência)
+    """
+    sentences = text.split('. ')
+    chunks = []
+    current_chunk = ""
+    for sentence in sentences:
+        if len(current_chunk + sentence) < max_length:
+            current_chunk += sentence + ". "
+        else:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            current_chunk = sentence + ". "
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+    return chunks
+
+
+def build_text(size_bytes: int, seed: int = 42) -> str:
+    """
+    Gera um texto sintético com sentenças, perguntas, exclamações, parágrafos e abreviações
+    """
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size_bytes:
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 30)))
+        sentence = sentence.capitalize() + rng.choice(['.', '.', '.', '?', '!'])
+        separator = '\n\n' if rng.random() < 0.05 else ' '
+        parts.append(sentence + separator)
+        total += len(sentence) + len(separator)
+    return ''.join(parts)[:size_bytes]
+
+
+def build_ssml(size_bytes: int) -> str:
+    body = build_text(size_bytes).replace('Odyssey', '<emphasis level="strong">Odyssey</emphasis>')
+    return f'<speak><prosody rate="fast">{body}</prosody></speak>'
+
+
+def measure(label: str, splitter, text: str, repeat: int):
+    best = float('inf')
+    chunks = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = splitter(text)
+        best = min(best, time.perf_counter() - start)
+
+    billed = [len(SSML_TAG.sub('', chunk)) for chunk in chunks]
+    over_limit = sum(1 for b, chunk in zip(billed, chunks)
+                     if b > MAX_BILLED_CHARACTERS or len(chunk) > MAX_TOTAL_CHARACTERS)
+    size_mb = len(text) / (1024 * 1024)
+    print(f'{label:<28} {size_mb:>6.1f} MB {best * 1000:>10.1f} ms {size_mb / best:>8.1f} MB/s '
+          f'{len(chunks):>7} chunks  avg {sum(billed) / max(len(chunks), 1):>7.0f} chars  over limit: {over_limit}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do divisor de texto')
+    parser.add_argument('--sizes-mb', type=float, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for size_mb in args.sizes_mb:
+        size_bytes = int(size_mb * 1024 * 1024)
+        text = build_text(size_bytes)
+        measure('legacy (split ". ")', legacy_split, text, args.repeat)
+        measure('split_text', split_text, text, args.repeat)
+        measure('split_text (ssml)', split_text, build_ssml(size_bytes), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+"""
+Replay de carga concorrente contra o lambda_handler (sem acessar a AWS)
+
+Reproduz os eventos de um arquivo JSONL em uma instância "warm" (um único processo, como um
+contêiner da Lambda reaproveitado), com Polly e S3 stub, em concorrência fixa (--concurrency)
+ou taxa de chegada (--rate, chegadas de Poisson com semente fixa). Durante a execução registra
+o crescimento do /tmp (TMP_DIR) e da memória do processo, e no fim reporta histograma de
+latência, percentis, taxa de erro e a linha do tempo das amostras.
+
+Cada linha do arquivo é um evento do lambda_handler ('text', 'type' ou 'Records'); linhas no
+formato do requests.jsonl viram {"text": title + body}.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.load_replay requests.jsonl --concurrency 8 --duration 60
+    python -m benchmarks.load_replay requests.jsonl --rate 20 --requests 2000 --output replay.json
+"""
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Limites superiores (ms) das faixas do histograma de latência
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def load_events(path: str) -> list:
+    """
+    Lê os eventos do arquivo JSONL
+    """
+    events = []
+    with open(path, 'r', encoding='utf-8') as jsonl_file:
+        for line in jsonl_file:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if any(field in record for field in ('text', 'type', 'Records')):
+                events.append(record)
+                continue
+            text = '. '.join(part for part in (record.get('title'), record.get('body')) if part)
+            event = {'text': text}
+            for field in ('voice_id', 'speed', 'use_neural', 'save_file', 'delivery'):
+                if field in record:
+                    event[field] = record[field]
+            events.append(event)
+    return events
+
+
+def directory_usage(path: str) -> tuple:
+    """
+    Soma tamanho e número de arquivos do diretório (recursivo)
+
+    Returns:
+        tuple: (bytes, arquivos)
+    """
+    total = 0
+    files = 0
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        try:
+                            total += entry.stat().st_size
+                            files += 1
+                        except FileNotFoundError:
+                            pass
+        except FileNotFoundError:
+            continue
+    return total, files
+
+
+def process_rss_mb() -> float:
+    """
+    Memória residente atual do processo (Linux); 0 se indisponível
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def histogram(latencies: list) -> dict:
+    """
+    Agrupa as latências nas faixas de HISTOGRAM_BUCKETS_MS
+    """
+    counts = {f'<={bucket}ms': 0 for bucket in HISTOGRAM_BUCKETS_MS}
+    counts[f'>{HISTOGRAM_BUCKETS_MS[-1]}ms'] = 0
+    for latency in latencies:
+        for bucket in HISTOGRAM_BUCKETS_MS:
+            if latency <= bucket:
+                counts[f'<={bucket}ms'] += 1
+                break
+        else:
+            counts[f'>{HISTOGRAM_BUCKETS_MS[-1]}ms'] += 1
+    return counts
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+class ReplayStats:
+    """
+    Resultados das invocações, compartilhados entre as threads
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.status_codes = {}
+        self.errors = 0
+        self.exceptions = {}
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float, status_code, error: str = None):
+        with self._lock:
+            self.latencies.append(latency_ms)
+            self.status_codes[str(status_code)] = self.status_codes.get(str(status_code), 0) + 1
+            if error is not None:
+                self.errors += 1
+                self.exceptions[error] = self.exceptions.get(error, 0) + 1
+
+    def snapshot(self) -> tuple:
+        with self._lock:
+            return len(self.latencies), self.errors
+
+
+def invoke(lambda_function, event: dict, stats: ReplayStats):
+    """
+    Executa uma invocação e registra latência, status e erro
+    """
+    start = time.perf_counter()
+    try:
+        response = lambda_function.lambda_handler(dict(event), None)
+        status_code = response.get('statusCode', 200) if isinstance(response, dict) else 200
+        error = None if status_code < 400 else f'HTTP {status_code}'
+        if error is None and isinstance(response, dict) and response.get('batchItemFailures'):
+            error = 'batch item failures'
+    except Exception as e:
+        status_code = 'exception'
+        error = type(e).__name__
+    stats.record((time.perf_counter() - start) * 1000, status_code, error)
+
+
+def sampler(tmp_dir: str, stats: ReplayStats, interval: float, started: float, stop: threading.Event,
+            timeline: list):
+    """
+    Registra periodicamente o uso do /tmp, a memória do processo e o progresso
+    """
+    while True:
+        tmp_bytes, tmp_files = directory_usage(tmp_dir)
+        completed, errors = stats.snapshot()
+        timeline.append({
+            'elapsed_s': round(time.perf_counter() - started, 2),
+            'completed': completed,
+            'errors': errors,
+            'tmp_mb': round(tmp_bytes / (1024 * 1024), 3),
+            'tmp_files': tmp_files,
+            'rss_mb': round(process_rss_mb(), 1)
+        })
+        if stop.wait(interval):
+            return
+
+
+def run_closed_loop(lambda_function, events: list, stats: ReplayStats, concurrency: int,
+                    total_requests: int, deadline: float):
+    """
+    Concorrência fixa: cada worker envia o próximo evento assim que o anterior termina
+    """
+    counter = iter(range(total_requests))
+    counter_lock = threading.Lock()
+
+    def worker():
+        while time.perf_counter() < deadline:
+            with counter_lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            invoke(lambda_function, events[index % len(events)], stats)
+
+    threads = [threading.Thread(target=worker, name=f'replay-{n}') for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_open_loop(lambda_function, events: list, stats: ReplayStats, rate: float, total_requests: int,
+                  deadline: float, max_in_flight: int, seed: int):
+    """
+    Taxa de chegada: eventos enviados em instantes de Poisson, independentemente das respostas
+    (chegadas que encontram max_in_flight invocações em andamento aguardam na fila do pool)
+    """
+    arrivals = random.Random(seed)
+    next_arrival = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='replay') as executor:
+        for index in range(total_requests):
+            next_arrival += arrivals.expovariate(rate)
+            wait = next_arrival - time.perf_counter()
+            if next_arrival > deadline:
+                break
+            if wait > 0:
+                time.sleep(wait)
+            executor.submit(invoke, lambda_function, events[index % len(events)], stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay de carga concorrente para o lambda_handler')
+    parser.add_argument('jsonl', help='Arquivo JSONL com um evento por linha')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--concurrency', type=int, default=4, help='Invocações simultâneas (carga fechada)')
+    mode.add_argument('--rate', type=float, help='Chegadas por segundo (carga aberta)')
+    parser.add_argument('--requests', type=int, default=500, help='Número máximo de invocações')
+    parser.add_argument('--duration', type=float, default=60.0, help='Duração máxima em segundos')
+    parser.add_argument('--max-in-flight', type=int, default=64, help='Invocações simultâneas no modo --rate')
+    parser.add_argument('--sample-interval', type=float, default=1.0, help='Intervalo das amostras (s)')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Latência fixa do Polly stub')
+    parser.add_argument('--latency-per-kchar-ms', type=float, default=20.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fração de chamadas limitadas')
+    parser.add_argument('--cache-mb', type=float, default=128.0, help='Cache local de áudio (0 desativa)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Arquivo JSON com o relatório completo')
+    args = parser.parse_args()
+
+    # Configuração lida na importação do projeto
+    tmp_dir = tempfile.mkdtemp(prefix='tts_replay_')
+    os.environ['AWS_LAMBDA_FUNCTION_NAME'] = 'load-replay'
+    os.environ['TMP_DIR'] = tmp_dir
+    os.environ['TTS_CACHE_MAX_MB'] = str(args.cache_mb)
+    os.environ['TTS_LOG_LEVEL'] = 'ERROR'
+    os.environ['TTS_METRICS_ENABLED'] = 'false'
+    os.environ.setdefault('S3_BUCKET_NAME', 'load-replay')
+    os.environ.pop('TTS_S3_CACHE_BUCKET', None)
+
+    import lambda_function
+    from benchmarks.polly_stub import PollyStub
+    from benchmarks.s3_stub import S3Stub
+    from utils.client_registry import register_client
+
+    polly_stub = PollyStub(latency=args.latency_ms / 1000, latency_per_char=args.latency_per_kchar_ms / 1e6,
+                           throttle_rate=args.throttle_rate, seed=args.seed)
+    s3_stub = S3Stub()
+    register_client('polly', 'us-east-1', polly_stub)
+    register_client('s3', 'us-east-1', s3_stub)
+    register_client('s3', lambda_function.S3_BUCKET_REGION, s3_stub)
+
+    events = load_events(args.jsonl)
+    if not events:
+        raise SystemExit(f'[ERROR] No events in {args.jsonl}')
+
+    stats = ReplayStats()
+    timeline = []
+    stop = threading.Event()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    sampler_thread = threading.Thread(target=sampler, name='replay-sampler', daemon=True,
+                                      args=(tmp_dir, stats, args.sample_interval, started, stop, timeline))
+    sampler_thread.start()
+
+    if args.rate:
+        run_open_loop(lambda_function, events, stats, args.rate, args.requests, deadline,
+                      args.max_in_flight, args.seed)
+    else:
+        run_closed_loop(lambda_function, events, stats, args.concurrency, args.requests, deadline)
+
+    elapsed = time.perf_counter() - started
+    stop.set()
+    sampler_thread.join()
+
+    latencies = stats.latencies
+    completed = len(latencies)
+    report = {
+        'mode': {'rate': args.rate} if args.rate else {'concurrency': args.concurrency},
+        'events_in_file': len(events),
+        'completed': completed,
+        'errors': stats.errors,
+        'error_rate': round(stats.errors / completed, 4) if completed else 0.0,
+        'error_types': stats.exceptions,
+        'status_codes': stats.status_codes,
+        'elapsed_seconds': round(elapsed, 3),
+        'throughput_rps': round(completed / elapsed, 3) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50), 3),
+            'p95': round(percentile(latencies, 0.95), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+            'max': round(max(latencies), 3) if latencies else 0.0
+        },
+        'latency_histogram': histogram(latencies),
+        'tmp_growth_mb': round(timeline[-1]['tmp_mb'] - timeline[0]['tmp_mb'], 3),
+        'rss_growth_mb': round(timeline[-1]['rss_mb'] - timeline[0]['rss_mb'], 1),
+        'polly_calls': polly_stub.calls,
+        'polly_throttled': polly_stub.throttled,
+        's3_objects': s3_stub.object_count(),
+        'timeline': timeline
+    }
+
+    print(f"{'elapsed':>8} {'done':>7} {'errors':>7} {'tmp MB':>10} {'files':>7} {'rss MB':>9}")
+    for sample in timeline:
+        print(f"{sample['elapsed_s']:>8} {sample['completed']:>7} {sample['errors']:>7} "
+              f"{sample['tmp_mb']:>10} {sample['tmp_files']:>7} {sample['rss_mb']:>9}")
+    print(json.dumps({key: value for key, value in report.items() if key != 'timeline'}, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f'[DEBUG] Report written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Stub local e determinístico do cliente Amazon Polly para benchmarks
+
+Retorna áudio com tamanho realista (frames MP3 válidos ou PCM 16-bit) sem acessar a AWS.
+Latência e limitações (ThrottlingException) são configuráveis e determinísticas (semente fixa).
+"""
+import io
+import re
+import time
+import uuid
+import random
+import threading
+
+from botocore.exceptions import ClientError
+
+# Velocidade média de fala usada para dimensionar o áudio gerado
+CHARS_PER_SECOND = 15
+
+# Frame MPEG-2 Layer III, 48 kbps, 24 kHz, mono: 576 amostras (24 ms) em 144 bytes
+MP3_FRAME_HEADER = b'\xff\xf3\x64\xc0'
+MP3_FRAME_BYTES = 144
+MP3_FRAME_SECONDS = 576 / 24000
+
+SSML_TAG = re.compile(r'<[^>]*>')
+
+# Vozes retornadas por describe_voices: (Id, Gender, LanguageCode, SupportedEngines)
+VOICES = (
+    ('Joanna', 'Female', 'en-US', ['standard', 'neural']),
+    ('Matthew', 'Male', 'en-US', ['standard', 'neural']),
+    ('Ivy', 'Female', 'en-US', ['standard', 'neural']),
+    ('Justin', 'Male', 'en-US', ['standard', 'neural']),
+    ('Kendra', 'Female', 'en-US', ['standard', 'neural']),
+    ('Kimberly', 'Female', 'en-US', ['standard', 'neural']),
+    ('Salli', 'Female', 'en-US', ['standard', 'neural']),
+    ('Joey', 'Male', 'en-US', ['standard', 'neural']),
+    ('Kevin', 'Male', 'en-US', ['neural']),
+    ('Ruth', 'Female', 'en-US', ['neural', 'long-form', 'generative']),
+    ('Amy', 'Female', 'en-GB', ['standard', 'neural']),
+    ('Camila', 'Female', 'pt-BR', ['standard', 'neural']),
+    ('Vitoria', 'Female', 'pt-BR', ['standard', 'neural']),
+    ('Ricardo', 'Male', 'pt-BR', ['standard']),
+    ('Lupe', 'Female', 'es-US', ['standard', 'neural']),
+)
+
+
+class PollyStub:
+    """
+    Substituto de TTSPollyService.polly_client que implementa synthesize_speech
+    """
+
+    def __init__(self, latency: float = 0.0, latency_per_char: float = 0.0, throttle_rate: float = 0.0,
+                 seed: int = 42):
+        """
+        Args:
+            latency (float): Latência fixa de cada chamada em segundos
+            latency_per_char (float): Latência adicional por caractere cobrado em segundos
+            throttle_rate (float): Fração das chamadas que falham com ThrottlingException (0 a 1)
+            seed (int): Semente do sorteio das limitações
+        """
+        self.latency = latency
+        self.latency_per_char = latency_per_char
+        self.throttle_rate = throttle_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tasks = {}
+
+        self.calls = 0
+        self.throttled = 0
+        self.billed_characters = 0
+
+    def _audio_seconds(self, text: str, text_type: str) -> float:
+        if text_type == 'ssml':
+            text = SSML_TAG.sub('', text)
+        return max(len(text), 1) / CHARS_PER_SECOND
+
+    def _build_audio(self, seconds: float, output_format: str, sample_rate: str) -> bytes:
+        if output_format == 'pcm':
+            samples = int(seconds * int(sample_rate or 16000))
+            return bytes(samples * 2)
+
+        frame = MP3_FRAME_HEADER + bytes(MP3_FRAME_BYTES - len(MP3_FRAME_HEADER))
+        return frame * max(int(seconds / MP3_FRAME_SECONDS), 1)
+
+    def _simulate_call(self, operation: str, billed: int, per_char_latency: bool = True):
+        with self._lock:
+            self.calls += 1
+            throttled = self.throttle_rate > 0 and self._random.random() < self.throttle_rate
+            if throttled:
+                self.throttled += 1
+            else:
+                self.billed_characters += billed
+
+        delay = self.latency + (self.latency_per_char * billed if per_char_latency else 0)
+        if delay > 0:
+            time.sleep(delay)
+        if throttled:
+            raise ClientError({'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, operation)
+
+    def describe_voices(self, IncludeAdditionalLanguageCodes: bool = False, NextToken: str = None, **_) -> dict:
+        self._simulate_call('DescribeVoices', 0, per_char_latency=False)
+        return {'Voices': [{'Id': voice_id, 'Name': voice_id, 'Gender': gender, 'LanguageCode': language,
+                            'LanguageName': language, 'SupportedEngines': list(engines)}
+                           for voice_id, gender, language, engines in VOICES]}
+
+    def synthesize_speech(self, **params) -> dict:
+        text = params['Text']
+        text_type = params.get('TextType', 'text')
+        billed = len(SSML_TAG.sub('', text)) if text_type == 'ssml' else len(text)
+
+        self._simulate_call('SynthesizeSpeech', billed)
+
+        audio = self._build_audio(self._audio_seconds(text, text_type),
+                                  params.get('OutputFormat', 'mp3'),
+                                  params.get('SampleRate'))
+        return {
+            'AudioStream': io.BytesIO(audio),
+            'ContentType': 'audio/pcm' if params.get('OutputFormat') == 'pcm' else 'audio/mpeg',
+            'RequestCharacters': billed
+        }
+
+    def start_speech_synthesis_task(self, **params) -> dict:
+        text = params['Text']
+        billed = len(SSML_TAG.sub('', text)) if params.get('TextType') == 'ssml' else len(text)
+        # A tarefa só é agendada: a latência não depende do tamanho do texto
+        self._simulate_call('StartSpeechSynthesisTask', billed, per_char_latency=False)
+
+        task_id = uuid.uuid4().hex
+        extension = 'pcm' if params.get('OutputFormat') == 'pcm' else 'mp3'
+        task = {
+            'TaskId': task_id,
+            'TaskStatus': 'completed',
+            'OutputUri': f"https://s3.us-east-1.amazonaws.com/{params['OutputS3BucketName']}/"
+                         f"{params.get('OutputS3KeyPrefix', '')}{task_id}.{extension}",
+            'RequestCharacters': billed
+        }
+        with self._lock:
+            self._tasks[task_id] = task
+        return {'SynthesisTask': dict(task, TaskStatus='scheduled')}
+
+    def get_speech_synthesis_task(self, TaskId: str) -> dict:
+        with self._lock:
+            task = self._tasks.get(TaskId)
+        if task is None:
+            raise ClientError({'Error': {'Code': 'SynthesisTaskNotFoundException', 'Message': TaskId}},
+                              'GetSpeechSynthesisTask')
+        return {'SynthesisTask': dict(task)}
@@ -0,0 +1,225 @@
+"""
+Stub local do cliente Amazon S3 para benchmarks
+
+Implementa as operações usadas por S3BucketClass (PUT, multipart, upload/download de arquivos,
+HEAD, GET, DELETE, listagem paginada e URL pré-assinada) em memória. Com store_bodies=False apenas os tamanhos são guardados,
+para medir o serviço sem acumular o áudio de todas as requisições.
+"""
+import io
+import os
+import time
+import hashlib
+import uuid
+import threading
+from datetime import datetime, timezone
+
+from botocore.exceptions import ClientError
+
+
+class S3Stub:
+    """
+    Substituto do cliente boto3 do S3
+    """
+
+    def __init__(self, latency: float = 0.0, store_bodies: bool = False):
+        """
+        Args:
+            latency (float): Latência fixa de cada chamada em segundos
+            store_bodies (bool): Se o conteúdo dos objetos deve ser mantido (GET retorna zeros caso contrário)
+        """
+        self.latency = latency
+        self.store_bodies = store_bodies
+        self._objects = {}
+        self._uploads = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.bytes_uploaded = 0
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _store(self, bucket: str, key: str, data, size: int, metadata: dict = None, etag: str = None):
+        if etag is None:
+            etag = f'"{hashlib.md5(data).hexdigest()}"' if data is not None else f'"{uuid.uuid4().hex}"'
+        with self._lock:
+            self._objects[(bucket, key)] = {
+                'Body': data if self.store_bodies else None,
+                'ContentLength': size,
+                'Metadata': dict(metadata or {}),
+                'LastModified': datetime.now(timezone.utc),
+                'ETag': etag
+            }
+
+    @staticmethod
+    def _not_found(operation: str):
+        raise ClientError({'Error': {'Code': '404', 'Message': 'Not Found'}}, operation)
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, Metadata: dict = None, **_) -> dict:
+        self._call()
+        with self._lock:
+            self.bytes_uploaded += len(Body)
+        self._store(Bucket, Key, Body, len(Body), Metadata)
+        return {'ETag': self._objects[(Bucket, Key)]['ETag']}
+
+    def create_multipart_upload(self, Bucket: str, Key: str, Metadata: dict = None, **_) -> dict:
+        self._call()
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._uploads[upload_id] = {'parts': {}, 'metadata': Metadata}
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes, **_) -> dict:
+        self._call()
+        with self._lock:
+            self._uploads[UploadId]['parts'][PartNumber] = Body if self.store_bodies else len(Body)
+            self.bytes_uploaded += len(Body)
+        return {'ETag': f'"{uuid.uuid4().hex}"'}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **_) -> dict:
+        self._call()
+        with self._lock:
+            upload = self._uploads.pop(UploadId)
+        parts = [upload['parts'][number] for number in sorted(upload['parts'])]
+        if self.store_bodies:
+            data = b''.join(parts)
+            self._store(Bucket, Key, data, len(data), upload['metadata'])
+        else:
+            self._store(Bucket, Key, None, sum(parts), upload['metadata'])
+        return {'Bucket': Bucket, 'Key': Key}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **_) -> dict:
+        self._call()
+        with self._lock:
+            self._uploads.pop(UploadId, None)
+        return {}
+
+    def upload_file(self, Filename: str, Bucket: str, Key: str, Config=None, **_):
+        """
+        Upload de arquivo com o ETag que o S3 atribuiria (MD5, ou MD5 das partes no multipart)
+        """
+        self._call()
+        with open(Filename, 'rb') as local_file:
+            data = local_file.read()
+        threshold = getattr(Config, 'multipart_threshold', 8 * 1024 * 1024)
+        part_size = getattr(Config, 'multipart_chunksize', 8 * 1024 * 1024)
+        if len(data) < threshold:
+            etag = f'"{hashlib.md5(data).hexdigest()}"'
+        else:
+            digests = [hashlib.md5(data[start:start + part_size]).digest() for start in range(0, len(data), part_size)]
+            etag = f'"{hashlib.md5(b"".join(digests)).hexdigest()}-{len(digests)}"'
+        with self._lock:
+            self.bytes_uploaded += len(data)
+        self._store(Bucket, Key, data, len(data), etag=etag)
+
+    def download_file(self, Bucket: str, Key: str, Filename: str, **_):
+        response = self.get_object(Bucket, Key)
+        tmp_path = f'{Filename}.{uuid.uuid4().hex[:8]}'
+        with open(tmp_path, 'wb') as local_file:
+            local_file.write(response['Body'].read())
+        os.replace(tmp_path, Filename)
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        self._call()
+        with self._lock:
+            entry = self._objects.get((Bucket, Key))
+        if entry is None:
+            self._not_found('HeadObject')
+        return {key: value for key, value in entry.items() if key != 'Body'}
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        self._call()
+        with self._lock:
+            entry = self._objects.get((Bucket, Key))
+        if entry is None:
+            raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject')
+        body = entry['Body'] if entry['Body'] is not None else bytes(entry['ContentLength'])
+        return dict(entry, Body=io.BytesIO(body))
+
+    def delete_object(self, Bucket: str, Key: str) -> dict:
+        self._call()
+        with self._lock:
+            self._objects.pop((Bucket, Key), None)
+        return {}
+
+    def delete_objects(self, Bucket: str, Delete: dict, **_) -> dict:
+        self._call()
+        with self._lock:
+            for entry in Delete['Objects']:
+                self._objects.pop((Bucket, entry['Key']), None)
+        if Delete.get('Quiet'):
+            return {}
+        return {'Deleted': [{'Key': entry['Key']} for entry in Delete['Objects']]}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = '', Delimiter: str = '', StartAfter: str = '',
+                        ContinuationToken: str = None, MaxKeys: int = 1000, **_) -> dict:
+        """
+        Listagem em páginas de até MaxKeys entradas (objetos e prefixos comuns), como no S3
+        """
+        self._call()
+        start_after = ContinuationToken or StartAfter
+        with self._lock:
+            keys = sorted(key for bucket, key in self._objects
+                          if bucket == Bucket and key.startswith(Prefix) and key > start_after)
+            contents = []
+            prefixes = []
+            last_key = None
+            truncated = False
+            for key in keys:
+                if len(contents) + len(prefixes) >= MaxKeys:
+                    truncated = True
+                    break
+                if Delimiter and Delimiter in key[len(Prefix):]:
+                    common = key[:key.index(Delimiter, len(Prefix)) + len(Delimiter)]
+                    if prefixes and prefixes[-1]['Prefix'] == common:
+                        last_key = key
+                        continue
+                    prefixes.append({'Prefix': common})
+                else:
+                    entry = self._objects[(Bucket, key)]
+                    contents.append({'Key': key, 'Size': entry['ContentLength'], 'ETag': entry['ETag'],
+                                     'LastModified': entry['LastModified']})
+                last_key = key
+        response = {'KeyCount': len(contents) + len(prefixes), 'IsTruncated': truncated}
+        if contents:
+            response['Contents'] = contents
+        if prefixes:
+            response['CommonPrefixes'] = prefixes
+        if truncated:
+            response['NextContinuationToken'] = last_key
+        return response
+
+    def get_paginator(self, operation: str):
+        return _ListObjectsPaginator(self)
+
+    def generate_presigned_url(self, operation: str, Params: dict, ExpiresIn: int = 3600) -> str:
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}?X-Amz-Expires={ExpiresIn}"
+
+    def object_count(self) -> int:
+        with self._lock:
+            return len(self._objects)
+
+
+class _ListObjectsPaginator:
+    """
+    Paginador de list_objects_v2 (segue NextContinuationToken)
+    """
+
+    def __init__(self, stub: S3Stub):
+        self.stub = stub
+
+    def paginate(self, PaginationConfig: dict = None, **params):
+        config = PaginationConfig or {}
+        if config.get('StartingToken'):
+            params['ContinuationToken'] = config['StartingToken']
+        if config.get('PageSize'):
+            params['MaxKeys'] = config['PageSize']
+        while True:
+            page = self.stub.list_objects_v2(**params)
+            yield page
+            if not page['IsTruncated']:
+                return
+            params['ContinuationToken'] = page['NextContinuationToken']
@@ -1,32 +1,165 @@
 import os
 import json
+import time
 import base64
-from dotenv import load_dotenv
+import threading
+from urllib.parse import urlparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Importar as classes de serviços necessárias para a Lambda Function
-from services.polly_services import TTSPollyService
-
-load_dotenv()
+from services.polly_services import S3_CACHE_BUCKET, SYNC_MAX_CHARACTERS, get_tts_service
+from utils.audio_cache import synthesis_cache_key
+from utils.audio_stitcher import container_extension
+from utils.rate_limiter import is_retryable_error, rate_limiter_stats
+from utils.tmp_storage import get_tmp_storage, manages_tmp_storage
+from utils import telemetry
+
+# Carrega o .env apenas no desenvolvimento local (na Lambda as variáveis já estão no ambiente)
+if not os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Obtém o diretório temporário do arquivo .env
 TMP_DIR = os.getenv('TMP_DIR', './tmp')
 
+# Bucket para entrega de áudios grandes via URL pré-assinada (opcional)
+S3_BUCKET_NAME = os.getenv('S3_BUCKET_NAME')
+S3_BUCKET_REGION = os.getenv('S3_BUCKET_REGION', 'ca-central-1')
+PRESIGNED_URL_EXPIRATION = int(os.getenv('PRESIGNED_URL_EXPIRATION', '3600'))
+
+# Tamanho máximo da resposta inline (a Lambda limita a resposta síncrona a 6 MB)
+INLINE_MAX_BYTES = int(os.getenv('TTS_INLINE_MAX_BYTES', str(5 * 1024 * 1024)))
+
+# Bucket/prefixo de saída das tarefas assíncronas do Polly para textos muito longos. O bucket precisa estar
+# na região do Polly, por isso não herda S3_BUCKET_NAME (S3_BUCKET_REGION); sem ele, textos longos usam chunks
+TASK_BUCKET_NAME = os.getenv('TTS_TASK_BUCKET')
+TASK_OUTPUT_PREFIX = os.getenv('TTS_TASK_OUTPUT_PREFIX', 'tts-tasks/')
+
+# Código HTTP das consultas de status com TaskId desconhecido ou inválido
+TASK_STATUS_CODES = {'not_found': 404, 'validation_error': 400}
+
+# Código HTTP dos erros de síntese causados pela requisição (ex.: voz inexistente); os demais retornam 500
+REQUEST_ERROR_CODES = {'validation_error': 400}
+
+# Número máximo de itens processados simultaneamente em eventos de lote
+BATCH_MAX_WORKERS = int(os.getenv('TTS_BATCH_MAX_WORKERS', '8'))
+
+# Prefixo dos áudios gerados a partir da fila SQS (a chave deriva do conteúdo da mensagem)
+QUEUE_OUTPUT_PREFIX = os.getenv('TTS_QUEUE_OUTPUT_PREFIX', 'tts-queue/')
+
+# Espera máxima, antes de cada resposta, pelas gravações pendentes do cache S3 (a instância é congelada depois)
+S3_CACHE_FLUSH_TIMEOUT = float(os.getenv('TTS_S3_CACHE_FLUSH_TIMEOUT_SECONDS', '2'))
+
+# Intervalo mínimo entre remoções das entradas expiradas do cache S3 (feitas no evento warmup)
+S3_CACHE_PURGE_INTERVAL = int(os.getenv('TTS_S3_CACHE_PURGE_INTERVAL_SECONDS', '3600'))
+
+# Fila para onde vão as mensagens SQS com erro permanente (opcional; sem ela são apenas registradas no log)
+QUEUE_DLQ_URL = os.getenv('TTS_QUEUE_DLQ_URL')
+
+# Mensagens já processadas nesta instância (hash do conteúdo -> chave de saída)
+_processed_messages = OrderedDict()
+_processed_messages_lock = threading.Lock()
+PROCESSED_MESSAGES_MAX = 10000
+
+
+class RequestError(Exception):
+    """
+    Erro de síntese causado pela requisição, respondido com o código HTTP de REQUEST_ERROR_CODES
+    """
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class InlineBudget:
+    """
+    Orçamento compartilhado pelos itens de um lote entregues em base64 na mesma resposta
+    """
+
+    def __init__(self, max_bytes):
+        self.remaining = max_bytes
+        self._lock = threading.Lock()
+
+    def fits(self, size):
+        return size <= self.remaining
+
+    def reserve(self, size):
+        """
+        Reserva size bytes da resposta; False se não couberem no que resta do orçamento
+        """
+        with self._lock:
+            if size > self.remaining:
+                return False
+            self.remaining -= size
+            return True
+
+
+def _raise_for_result(result, context):
+    """
+    Converte um resultado sem sucesso do serviço TTS em exceção (RequestError para erros do cliente)
+    """
+    if result['success']:
+        return
+    status_code = REQUEST_ERROR_CODES.get(result.get('error_type'))
+    if status_code is not None:
+        raise RequestError(result['error'], status_code)
+    raise Exception(f"{context}: {result['error']}")
+
+def _flush_s3_caches():
+    """
+    Conclui as gravações do cache S3 feitas em background antes de a resposta ser devolvida
+    """
+    if not S3_CACHE_BUCKET:
+        return
+    from services.s3_audio_cache import flush_s3_caches
+    with telemetry.stage('s3_cache_flush'):
+        flush_s3_caches(S3_CACHE_FLUSH_TIMEOUT)
+
+
 # ============================================================================
-# Função Lambda para Text-to-Speech usando Amazon Polly (Processamento Local)
+# Função Lambda para Text-to-Speech usando Amazon Polly
 # ----------------------------------------------------------------------------
+@telemetry.instrumented_handler('lambda_handler')
+@manages_tmp_storage(TMP_DIR, on_finish=_flush_s3_caches)
 def lambda_handler(event, context):
     """
     Função Lambda para converter texto em fala usando Amazon Polly
-    Processamento totalmente local, sem armazenamento em S3
+    
+    Eventos {"text": ...} são sintetizados com o serviço compartilhado entre invocações "warm" e
+    respondidos de acordo com o tamanho:
+    - inline: áudio em base64 na resposta (padrão; arquivo em TMP_DIR apenas com "save_file")
+    - S3: quando a resposta passaria de INLINE_MAX_BYTES (ou com "delivery": "s3"), o áudio é
+      enviado ao S3_BUCKET_NAME e a resposta traz uma URL pré-assinada
+    - tarefa assíncrona: textos acima de TTS_SYNC_MAX_CHARACTERS (ou com "mode": "async") iniciam
+      uma tarefa do Polly gravando em TTS_TASK_BUCKET e a resposta 202 traz o task_id
+    
+    Também encaminha os eventos {"type": "warmup"}, {"type": "batch"}, {"type": "task_status"} e os
+    eventos da fila SQS para os handlers correspondentes
     """
     
-    # 1 - Imprime o evento recebido
-    print('*********** Start TTS Lambda ***************') 
-    print(f'[DEBUG] Event: {event}') 
+    # 1 - Imprime o evento recebido (apenas em DEBUG e com os textos truncados)
+    telemetry.debug('*********** Start TTS Lambda ***************')
+    if telemetry.log_enabled('DEBUG'):
+        telemetry.debug(f'Event: {_event_summary(event)}')
+    
+    # 2 - Evento de aquecimento: inicializa os serviços e retorna imediatamente
+    if event.get('type') == 'warmup':
+        return warmup_handler(event, context)
     
-    # 2 - Garantir que o diretório temporário existe
-    os.makedirs(TMP_DIR, exist_ok=True)
-    print(f'[DEBUG] Temporary directory configured: {TMP_DIR}')
+    # 2.1 - Evento de lote: vários textos processados em paralelo na mesma invocação
+    if event.get('type') == 'batch':
+        return batch_handler(event, context)
+    
+    # 2.2 - Evento da fila SQS (mapeamento de origem de eventos)
+    records = event.get('Records')
+    if records and records[0].get('eventSource') == 'aws:sqs':
+        return sqs_handler(event, context)
+    
+    # 2.3 - Consulta de status de uma tarefa assíncrona iniciada anteriormente
+    if event.get('type') == 'task_status':
+        return task_status_handler(event, context)
     
     try:
 
@@ -34,51 +167,71 @@ def lambda_handler(event, context):
         text = event.get('text', None)
         if not text:
             raise ValueError("[ERROR] 'text' parameter is required")
-        print(f'[DEBUG] Text for conversion (length: {len(text)} characters): {text[:100]}...')        
+        telemetry.debug(f'Text for conversion (length: {len(text)} characters): {text[:100]}...')        
         
-        # 4 - Instanciar serviço TTS com diretório temporário personalizado
-        tts_service = TTSPollyService(output_dir=TMP_DIR)
-        print(f'[DEBUG] TTS service successfully initialized')
+        # 4 - Obter o serviço TTS compartilhado (criado apenas no cold start)
+        with telemetry.stage('init'):
+            tts_service = get_tts_service(output_dir=TMP_DIR)
         
-        # 5 - Converter texto para fala
-        audio_result = tts_service.text_to_speech(text=text)
+        # 4.1 - Textos muito longos viram uma tarefa assíncrona do Polly (resposta 202 com o ID da tarefa)
+        if _choose_mode(event, tts_service, text) == 'async':
+            return _async_task_response(tts_service, text, event)
         
-        # 6 - Verificar se a conversão foi bem-sucedida
-        if not audio_result['success']:
-            raise Exception(f"TTS conversion error: {audio_result['error']}")
+        # 4.2 - Áudios que não cabem na resposta inline são enviados ao S3 (URL pré-assinada)
+        delivery = _choose_delivery(event, tts_service, text)
+        if delivery == 's3':
+            return _s3_delivery_response(tts_service, text, event)
         
-        print(f'[DEBUG] TTS conversion completed successfully:')
-        print(f'        - File: {audio_result["filename"]}')
-        print(f'        - Size: {audio_result["file_size_mb"]} MB')
-        print(f'        - Duration: {audio_result["duration"]} seconds')
-        print(f'        - Processing time: {audio_result["processing_time"]} seconds')
+        # 5 - Converter texto para fala (em memória; arquivo em TMP_DIR apenas se solicitado)
+        save_file = bool(event.get('save_file', False))
+        audio_result = tts_service.text_to_speech(
+            text=text,
+            voice_id=event.get('voice_id'),
+            speed=event.get('speed'),
+            use_neural=event.get('use_neural'),
+            write_file=save_file,
+            return_audio=True
+        )
         
-        local_file_path = audio_result['file_path']
+        # 6 - Verificar se a conversão foi bem-sucedida
+        _raise_for_result(audio_result, 'TTS conversion error')
+        
+        telemetry.debug(f'TTS conversion completed successfully: file={audio_result["filename"]}, '
+                        f'size={audio_result["file_size_mb"]} MB, duration={audio_result["duration"]} s, '
+                        f'processing_time={audio_result["processing_time"]} s')
         
-        # 8 - Ler o arquivo de áudio e converter para base64
-        with open(local_file_path, 'rb') as audio_file:
-            audio_data = audio_file.read()
-            audio_base64 = base64.b64encode(audio_data).decode('utf-8')
+        # 8 - Converter o áudio em memória para base64 (sem reler o arquivo)
+        audio_data = audio_result.pop('audio_data')
+        with telemetry.stage('base64'):
+            audio_base64 = base64.b64encode(audio_data).decode('ascii')
         
-        print(f'[DEBUG] File converted to base64 (size: {len(audio_base64)} characters)')
+        telemetry.debug(f'Audio converted to base64 (size: {len(audio_base64)} characters)')
         
-        # 9 - Obter informações do arquivo para resposta
+        # 9 - Obter informações do áudio para resposta
         file_size_bytes = len(audio_data)
         file_size_mb = round(file_size_bytes / (1024 * 1024), 2)
-        relative_path = os.path.relpath(local_file_path, os.getcwd())
+        
+        # Libera os bytes do áudio antes de serializar a resposta (reduz o pico de memória)
+        del audio_data
         
         # 10 - Preparar resposta de sucesso
         response_data = {
             'success': True,
             'message': 'Text successfully converted to speech',
+            'delivery': 'inline',
             'audio_data': audio_base64,
             'file_size_mb': file_size_mb,
             'duration': audio_result.get('duration', 0),
-            'processing_time': audio_result.get('processing_time', 0)
+            'processing_time': audio_result.get('processing_time', 0),
+            'billed_characters': audio_result.get('billed_characters', 0),
+            'cached_characters': audio_result.get('cached_characters', 0)
         }
         
-        print(f'[DEBUG] Response prepared successfully')
-        print('*********** End TTS Lambda ***************')
+        with telemetry.stage('json_serialize'):
+            body = json.dumps(response_data)
+        
+        telemetry.debug(f'Response prepared successfully')
+        telemetry.debug('*********** End TTS Lambda ***************')
         
         return {
             'statusCode': 200,
@@ -86,11 +239,25 @@ def lambda_handler(event, context):
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps(response_data)
+            'body': body
         }
         
+    except RequestError as e:
+        telemetry.debug(f'Invalid request: {e}')
+        return {
+            'statusCode': e.status_code,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'success': False,
+                'error': 'Invalid request',
+                'message': str(e)
+            })
+        }
     except Exception as e:
-        print(f'[ERROR] Internal error: {e}')
+        telemetry.error(f'Internal error: {e}')
         return {
             'statusCode': 500,
             'headers': {
@@ -105,6 +272,634 @@ def lambda_handler(event, context):
         }
 
 
+def _event_summary(event):
+    """
+    Resume o evento para o log, truncando textos longos
+    """
+    return {key: value[:100] + '...' if isinstance(value, str) and len(value) > 100 else value
+            for key, value in event.items()}
+
+
+def _choose_mode(event, tts_service, text):
+    """
+    Escolhe a síntese 'sync' (resposta com o áudio) ou 'async' (tarefa do Polly gravando no S3)
+    O evento pode forçar a escolha com "mode": "sync" | "async"
+    """
+    mode = event.get('mode', 'auto')
+    if mode == 'async' and not TASK_BUCKET_NAME:
+        raise ValueError("[ERROR] Asynchronous synthesis requires the TTS_TASK_BUCKET environment variable")
+    if mode != 'auto':
+        return mode
+    
+    # Acima do limite de uma tarefa do Polly o texto segue pela síntese síncrona em chunks
+    if TASK_BUCKET_NAME and tts_service.fits_speech_task(text):
+        telemetry.debug(f'Text exceeds {SYNC_MAX_CHARACTERS} characters, using asynchronous synthesis task')
+        return 'async'
+    return 'sync'
+
+
+def _async_task_response(tts_service, text, event):
+    """
+    Inicia a tarefa assíncrona e responde imediatamente com o identificador para consulta posterior
+    """
+    task_result = tts_service.synthesize(
+        text=text,
+        voice_id=event.get('voice_id'),
+        speed=event.get('speed'),
+        use_neural=event.get('use_neural'),
+        task_bucket=TASK_BUCKET_NAME,
+        task_prefix=TASK_OUTPUT_PREFIX,
+        mode='async'
+    )
+    _raise_for_result(task_result, 'TTS task error')
+    
+    telemetry.debug(f'Synthesis task {task_result["task_id"]} started ({task_result["billed_characters"]} characters)')
+    
+    response_data = {
+        'success': True,
+        'message': 'Speech synthesis task started',
+        'mode': 'async',
+        'task_id': task_result['task_id'],
+        'status': task_result['status'],
+        'poll_after': task_result['poll_after']
+    }
+    
+    return {
+        'statusCode': 202,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json.dumps(response_data)
+    }
+
+
+def _choose_delivery(event, tts_service, text):
+    """
+    Escolhe a entrega 'inline' (base64) ou 's3' (URL pré-assinada) pelo tamanho esperado da resposta
+    O evento pode forçar a escolha com "delivery": "inline" | "s3"
+    """
+    delivery = event.get('delivery', 'auto')
+    if delivery == 's3' and not S3_BUCKET_NAME:
+        raise ValueError("[ERROR] S3 delivery requires the S3_BUCKET_NAME environment variable")
+    if delivery != 'auto':
+        return delivery
+    
+    # Base64 aumenta o tamanho em 4/3
+    expected_payload = tts_service.estimate_audio_bytes(text) * 4 // 3
+    if S3_BUCKET_NAME and expected_payload > INLINE_MAX_BYTES:
+        telemetry.debug(f'Expected payload {expected_payload} bytes exceeds inline limit, using S3 delivery')
+        return 's3'
+    return 'inline'
+
+
+def _s3_delivery_response(tts_service, text, event):
+    """
+    Sintetiza o áudio direto para o S3 e responde com a URL pré-assinada
+    """
+    from services.s3bucket_services import S3BucketClass
+    
+    audio_result = tts_service.synthesize_to_s3(
+        text=text,
+        bucket=S3_BUCKET_NAME,
+        voice_id=event.get('voice_id'),
+        speed=event.get('speed'),
+        use_neural=event.get('use_neural'),
+        s3_bucket=S3BucketClass(region_name=S3_BUCKET_REGION),
+        expiration=PRESIGNED_URL_EXPIRATION
+    )
+    _raise_for_result(audio_result, 'TTS conversion error')
+    
+    telemetry.debug(f'Audio uploaded to s3://{audio_result["bucket"]}/{audio_result["key"]} '
+                    f'({audio_result["file_size_mb"]} MB, {audio_result["upload_parts"]} parts)')
+    
+    response_data = {
+        'success': True,
+        'message': 'Text successfully converted to speech',
+        'delivery': 's3',
+        'audio_url': audio_result['audio_url'],
+        'expires_in': audio_result['expires_in'],
+        'file_size_mb': round(audio_result['file_size_bytes'] / (1024 * 1024), 2),
+        'duration': audio_result.get('duration', 0),
+        'processing_time': audio_result.get('processing_time', 0),
+        'billed_characters': audio_result.get('billed_characters', 0),
+        'cached_characters': audio_result.get('cached_characters', 0)
+    }
+    
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json.dumps(response_data)
+    }
+
+
+# ============================================================================
+# Função Lambda para consulta de tarefas assíncronas (sem bloquear à espera do Polly)
+# ----------------------------------------------------------------------------
+@telemetry.instrumented_handler('task_status_handler')
+def task_status_handler(event, context):
+    """
+    Retorna o status de uma tarefa assíncrona e, quando concluída, a URL pré-assinada do áudio
+    
+    Evento esperado:
+        {"type": "task_status", "task_id": "...", "attempt": 0}
+    """
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*'
+    }
+    
+    task_id = event.get('task_id')
+    if not task_id:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'success': False, 'error': "'task_id' parameter is required"})
+        }
+    
+    with telemetry.stage('init'):
+        tts_service = get_tts_service(output_dir=TMP_DIR)
+    status = tts_service.get_speech_task_status(task_id, attempt=int(event.get('attempt', 0)))
+    if not status['success']:
+        # TaskId desconhecido ou inválido é erro do cliente; os demais são falhas do serviço
+        status_code = TASK_STATUS_CODES.get(status['error_type'], 500)
+        error = 'Internal server error' if status_code == 500 else 'Invalid task_id'
+        return {
+            'statusCode': status_code,
+            'headers': headers,
+            'body': json.dumps({'success': False, 'error': error, 'message': status['error']})
+        }
+    
+    response_data = {
+        'success': True,
+        'mode': 'async',
+        'task_id': task_id,
+        'status': status['status']
+    }
+    if status['status'] == 'completed' and status.get('output_uri'):
+        from services.s3bucket_services import S3BucketClass
+        
+        # OutputUri: https://s3.<região>.amazonaws.com/<bucket>/<chave>
+        bucket, key = urlparse(status['output_uri']).path.lstrip('/').split('/', 1)
+        response_data['audio_url'] = S3BucketClass(region_name=tts_service.region_name).generate_presigned_url(
+            bucket, key, expiration=PRESIGNED_URL_EXPIRATION
+        )
+        response_data['expires_in'] = PRESIGNED_URL_EXPIRATION
+    elif status['status'] == 'failed':
+        response_data['success'] = False
+        response_data['error'] = status.get('failure_reason')
+    else:
+        response_data['poll_after'] = status['poll_after']
+    
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': json.dumps(response_data)
+    }
+
+
+# ============================================================================
+# Função Lambda para lotes de textos (processamento concorrente por item)
+# ----------------------------------------------------------------------------
+@telemetry.instrumented_handler('batch_handler')
+@manages_tmp_storage(TMP_DIR, on_finish=_flush_s3_caches)
+def batch_handler(event, context):
+    """
+    Processa um lote de textos na mesma invocação, com um pool limitado de workers
+    
+    Cada item tem seu próprio texto, voz e velocidade; resultados e erros são reportados
+    por item, de modo que a falha de um item não falha o lote. Com S3_BUCKET_NAME
+    configurado, cada áudio é entregue por URL pré-assinada; caso contrário, em base64, e os
+    itens que não cabem em INLINE_MAX_BYTES (somado por todo o lote) falham individualmente
+    com 'payload_too_large'.
+    
+    Evento:
+        {"type": "batch", "max_workers": 8,
+         "items": [{"id": "a1", "text": "...", "voice_id": "Joanna", "speed": "fast"}, ...]}
+    """
+    start_time = time.time()
+    
+    items = event.get('items')
+    error = None
+    if not isinstance(items, list) or not items:
+        error = "[ERROR] 'items' must be a non-empty list"
+    else:
+        try:
+            max_workers = int(event.get('max_workers') or BATCH_MAX_WORKERS)
+        except (TypeError, ValueError):
+            error = "[ERROR] 'max_workers' must be an integer"
+    if error:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({
+                'success': False,
+                'error': 'Bad request',
+                'message': error
+            })
+        }
+    
+    with telemetry.stage('init'):
+        tts_service = get_tts_service(output_dir=TMP_DIR)
+    max_workers = max(1, min(max_workers, len(items)))
+    telemetry.debug(f'Processing batch of {len(items)} items with {max_workers} workers')
+    
+    # Sem S3 todos os áudios vão na mesma resposta, limitada pela Lambda a 6 MB
+    inline_budget = InlineBudget(INLINE_MAX_BYTES)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tts-batch') as executor:
+        results = list(executor.map(
+            lambda indexed_item: _process_batch_item(tts_service, *indexed_item, inline_budget),
+            enumerate(items)
+        ))
+    
+    succeeded = sum(1 for result in results if result['success'])
+    response_data = {
+        'success': succeeded == len(results),
+        'total': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'processing_time': round(time.time() - start_time, 2),
+        'items': results
+    }
+    telemetry.debug(f'Batch completed: {succeeded}/{len(results)} items succeeded')
+    
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json.dumps(response_data)
+    }
+
+
+def _process_batch_item(tts_service, index, item, inline_budget):
+    """
+    Sintetiza um item do lote, convertendo qualquer erro em um resultado de falha do item
+    """
+    item_id = item.get('id', index) if isinstance(item, dict) else index
+    try:
+        if not isinstance(item, dict) or not item.get('text'):
+            raise ValueError("[ERROR] 'text' parameter is required")
+        
+        if S3_BUCKET_NAME:
+            from services.s3bucket_services import S3BucketClass
+            audio_result = tts_service.synthesize_to_s3(
+                text=item['text'],
+                bucket=S3_BUCKET_NAME,
+                voice_id=item.get('voice_id'),
+                speed=item.get('speed'),
+                use_neural=item.get('use_neural'),
+                s3_bucket=S3BucketClass(region_name=S3_BUCKET_REGION),
+                expiration=PRESIGNED_URL_EXPIRATION
+            )
+        else:
+            # Itens que certamente não cabem no orçamento falham sem chamar o Polly
+            if not inline_budget.fits(tts_service.estimate_audio_bytes(item['text']) * 4 // 3):
+                return _inline_budget_exceeded(index, item_id)
+            audio_result = tts_service.text_to_speech(
+                text=item['text'],
+                voice_id=item.get('voice_id'),
+                speed=item.get('speed'),
+                use_neural=item.get('use_neural'),
+                write_file=False
+            )
+        
+        if not audio_result['success']:
+            return {'index': index, 'id': item_id, 'success': False,
+                    'error': audio_result['error'], 'error_type': audio_result.get('error_type')}
+        
+        result = {
+            'index': index,
+            'id': item_id,
+            'success': True,
+            'file_size_mb': round(audio_result['file_size_bytes'] / (1024 * 1024), 2),
+            'duration': audio_result.get('duration', 0),
+            'processing_time': audio_result.get('processing_time', 0),
+            'billed_characters': audio_result.get('billed_characters', 0),
+            'cached_characters': audio_result.get('cached_characters', 0)
+        }
+        if 'audio_url' in audio_result:
+            result.update({'delivery': 's3', 'audio_url': audio_result['audio_url']})
+        else:
+            audio_base64 = base64.b64encode(audio_result['audio_data']).decode('ascii')
+            if not inline_budget.reserve(len(audio_base64)):
+                return _inline_budget_exceeded(index, item_id)
+            result.update({'delivery': 'inline', 'audio_data': audio_base64})
+        return result
+    
+    except Exception as e:
+        telemetry.error(f'Batch item {item_id} failed: {e}')
+        return {'index': index, 'id': item_id, 'success': False, 'error': str(e), 'error_type': 'general_error'}
+
+
+def _inline_budget_exceeded(index, item_id):
+    return {'index': index, 'id': item_id, 'success': False, 'error_type': 'payload_too_large',
+            'error': 'Inline response budget exceeded; configure S3_BUCKET_NAME or send fewer items'}
+
+
+# ============================================================================
+# Função Lambda para mensagens da fila SQS (falhas parciais por mensagem)
+# ----------------------------------------------------------------------------
+@telemetry.instrumented_handler('sqs_handler')
+@manages_tmp_storage(TMP_DIR, on_finish=_flush_s3_caches)
+def sqs_handler(event, context):
+    """
+    Processa um lote de mensagens SQS em paralelo e retorna apenas as mensagens com falha transitória
+    
+    O corpo de cada mensagem é um JSON com 'text' e, opcionalmente, 'voice_id', 'speed' e
+    'use_neural'. O áudio é gravado no S3_BUCKET_NAME em uma chave derivada do conteúdo da
+    mensagem, o que torna o processamento idempotente: mensagens reentregues (ou repetidas no
+    mesmo lote) não são sintetizadas novamente.
+    
+    Apenas falhas transitórias (limitação, erros 5xx, falhas de conexão) voltam para a fila.
+    Mensagens inválidas (JSON inválido, sem 'text', voz inexistente...) falhariam em todas as
+    entregas: são enviadas para TTS_QUEUE_DLQ_URL, se configurada, ou registradas no log e confirmadas.
+    
+    Requer "ReportBatchItemFailures" no mapeamento de origem de eventos da fila.
+    
+    Returns:
+        dict: {'batchItemFailures': [{'itemIdentifier': messageId}, ...]}
+    """
+    start_time = time.time()
+    records = event.get('Records', [])
+    with telemetry.stage('init'):
+        tts_service = get_tts_service(output_dir=TMP_DIR)
+    
+    # Agrupa mensagens com o mesmo conteúdo para sintetizá-las uma única vez
+    failures = []
+    rejected = 0
+    groups = OrderedDict()
+    for record in records:
+        # Nenhum erro de uma mensagem pode escapar do laço (o lote inteiro voltaria para a fila)
+        try:
+            message = _parse_sqs_message(record)
+            content_hash = synthesis_cache_key(message)
+        except Exception as e:
+            rejected += 1
+            if not _reject_sqs_message(record, str(e)):
+                failures.append({'itemIdentifier': record.get('messageId')})
+            continue
+        groups.setdefault(content_hash, (message, []))[1].append(record)
+    
+    if groups:
+        max_workers = max(1, min(BATCH_MAX_WORKERS, len(groups)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tts-sqs') as executor:
+            outcomes = executor.map(
+                lambda group: _process_sqs_message(tts_service, group[0], group[1][0], group[1][1][0].get('messageId')),
+                groups.items()
+            )
+            for (_, group_records), (status, error) in zip(groups.values(), outcomes):
+                if status == 'retry':
+                    failures.extend({'itemIdentifier': record.get('messageId')} for record in group_records)
+                elif status == 'rejected':
+                    rejected += len(group_records)
+                    failures.extend({'itemIdentifier': record.get('messageId')} for record in group_records
+                                    if not _reject_sqs_message(record, error))
+    
+    telemetry.debug(f'SQS batch completed: {len(records) - len(failures) - rejected}/{len(records)} messages '
+                    f'succeeded, {rejected} rejected, in {round(time.time() - start_time, 2)} seconds')
+    return {'batchItemFailures': failures}
+
+
+def _reject_sqs_message(record, reason):
+    """
+    Descarta uma mensagem com erro permanente: envia-a para TTS_QUEUE_DLQ_URL (se configurada)
+    ou apenas registra o erro; em ambos os casos a mensagem é confirmada e não volta para a fila
+    
+    Returns:
+        bool: False se o envio para a fila de erros falhou (a mensagem deve voltar para a fila)
+    """
+    message_id = record.get('messageId')
+    telemetry.error(f'Rejected SQS message {message_id}: {reason}')
+    if not QUEUE_DLQ_URL:
+        return True
+    
+    from botocore.exceptions import BotoCoreError, ClientError
+    from utils.client_registry import get_client
+    
+    # eventSourceARN: arn:aws:sqs:<região>:<conta>:<fila>
+    region_name = (record.get('eventSourceARN') or '').split(':')[3:4] or [S3_BUCKET_REGION]
+    try:
+        get_client('sqs', region_name[0]).send_message(
+            QueueUrl=QUEUE_DLQ_URL,
+            MessageBody=record.get('body') or '',
+            MessageAttributes={
+                'error': {'DataType': 'String', 'StringValue': reason[:1000] or 'unknown'},
+                'source-message-id': {'DataType': 'String', 'StringValue': str(message_id)}
+            }
+        )
+    except (BotoCoreError, ClientError) as e:
+        telemetry.error(f'Could not send SQS message {message_id} to the dead-letter queue: {e}')
+        return False
+    return True
+
+
+def _parse_sqs_message(record):
+    """
+    Extrai e normaliza os parâmetros de síntese do corpo da mensagem
+    """
+    try:
+        body = json.loads(record.get('body') or '')
+    except json.JSONDecodeError:
+        raise ValueError('message body is not valid JSON')
+    
+    if not isinstance(body, dict) or not body.get('text'):
+        raise ValueError("'text' parameter is required")
+    if not isinstance(body['text'], str):
+        raise ValueError("'text' parameter must be a string")
+    
+    return {
+        'text': ' '.join(body['text'].split()),
+        'voice_id': body.get('voice_id'),
+        'speed': body.get('speed'),
+        'use_neural': body.get('use_neural')
+    }
+
+
+def _process_sqs_message(tts_service, content_hash, message, message_id):
+    """
+    Sintetiza uma mensagem, pulando conteúdos já processados
+
+    Returns:
+        tuple: (status, erro) com status 'done' (processada agora ou antes), 'retry' (falha
+               transitória, a mensagem volta para a fila) ou 'rejected' (erro permanente)
+    """
+    try:
+        with _processed_messages_lock:
+            if content_hash in _processed_messages:
+                telemetry.debug(f'SQS message {message_id} already processed in this instance, skipping')
+                return 'done', None
+        
+        extension = container_extension(tts_service.default_config['output_format'])
+        output_key = f'{QUEUE_OUTPUT_PREFIX}{content_hash}.{extension}'
+        
+        if S3_BUCKET_NAME:
+            from services.s3bucket_services import S3BucketClass
+            s3_bucket = S3BucketClass(region_name=S3_BUCKET_REGION)
+            
+            # Reentrega: o áudio desta mensagem já está no bucket
+            if s3_bucket.head_object(S3_BUCKET_NAME, output_key) is not None:
+                telemetry.debug(f'SQS message {message_id} already processed (s3://{S3_BUCKET_NAME}/{output_key}), skipping')
+                _remember_processed(content_hash, output_key)
+                return 'done', None
+        
+        if S3_BUCKET_NAME:
+            audio_result = tts_service.synthesize_to_s3(
+                text=message['text'],
+                bucket=S3_BUCKET_NAME,
+                key=output_key,
+                voice_id=message['voice_id'],
+                speed=message['speed'],
+                use_neural=message['use_neural'],
+                s3_bucket=s3_bucket,
+                metadata={'message-id': str(message_id), 'content-hash': content_hash}
+            )
+        else:
+            # Sem bucket (desenvolvimento local): grava o áudio em TMP_DIR
+            audio_result = tts_service.text_to_speech(
+                text=message['text'],
+                voice_id=message['voice_id'],
+                speed=message['speed'],
+                use_neural=message['use_neural']
+            )
+            output_key = audio_result.get('file_path')
+        
+        if not audio_result['success']:
+            if audio_result.get('retryable'):
+                telemetry.error(f'SQS message {message_id} failed: {audio_result["error"]}')
+                return 'retry', audio_result['error']
+            return 'rejected', audio_result['error']
+        
+        _remember_processed(content_hash, output_key)
+        return 'done', None
+    
+    except Exception as e:
+        if is_retryable_error(e):
+            telemetry.error(f'SQS message {message_id} failed: {e}')
+            return 'retry', str(e)
+        return 'rejected', str(e)
+
+
+def _remember_processed(content_hash, output_key):
+    with _processed_messages_lock:
+        _processed_messages[content_hash] = output_key
+        _processed_messages.move_to_end(content_hash)
+        while len(_processed_messages) > PROCESSED_MESSAGES_MAX:
+            _processed_messages.popitem(last=False)
+
+
+# ============================================================================
+# Função Lambda com resposta em streaming (entrega progressiva dos chunks)
+# ----------------------------------------------------------------------------
+@telemetry.instrumented_handler('stream_handler')
+@manages_tmp_storage(TMP_DIR, on_finish=_flush_s3_caches)
+def stream_handler(event, response_stream, context):
+    """
+    Variante do lambda_handler que escreve o áudio em um stream de resposta à medida que
+    cada chunk é sintetizado, de modo que o primeiro byte depende apenas do primeiro chunk
+    
+    O runtime Python gerenciado da Lambda não oferece response streaming nativo; este handler
+    recebe qualquer objeto com write() (ex.: Lambda Web Adapter, runtime customizado ou um
+    arquivo/socket no desenvolvimento local).
+    
+    Args:
+        event (dict): Evento com 'text' e, opcionalmente, 'voice_id', 'speed', 'use_neural' e 'first_chunk_chars'
+        response_stream: Objeto com write() (e, opcionalmente, flush()) que recebe o áudio
+        context: Contexto da Lambda
+        
+    Returns:
+        dict: Resumo da entrega (bytes, chunks, tempo até o primeiro byte)
+    """
+    telemetry.debug('*********** Start TTS Stream Lambda ***************')
+    
+    text = event.get('text', None)
+    if not text:
+        raise ValueError("[ERROR] 'text' parameter is required")
+    
+    start_time = time.time()
+    with telemetry.stage('init'):
+        tts_service = get_tts_service(output_dir=TMP_DIR)
+    
+    total_bytes = 0
+    chunks_sent = 0
+    first_byte_time = None
+    
+    for chunk_data in tts_service.iter_speech(
+        text=text,
+        voice_id=event.get('voice_id'),
+        speed=event.get('speed'),
+        use_neural=event.get('use_neural'),
+        first_chunk_chars=event.get('first_chunk_chars')
+    ):
+        response_stream.write(chunk_data)
+        if hasattr(response_stream, 'flush'):
+            response_stream.flush()
+        
+        if first_byte_time is None:
+            first_byte_time = time.time() - start_time
+        total_bytes += len(chunk_data)
+        chunks_sent += 1
+    
+    summary = {
+        'success': True,
+        'bytes_sent': total_bytes,
+        'chunks_sent': chunks_sent,
+        'time_to_first_byte': round(first_byte_time or 0, 3),
+        'processing_time': round(time.time() - start_time, 2)
+    }
+    telemetry.debug(f'Stream completed: {summary}')
+    telemetry.debug('*********** End TTS Stream Lambda ***************')
+    return summary
+
+
+# ============================================================================
+# Aquecimento da Lambda (cold start antecipado)
+# ----------------------------------------------------------------------------
+@telemetry.instrumented_handler('warmup_handler')
+def warmup_handler(event, context):
+    """
+    Inicializa o cliente Polly, o serviço TTS, o catálogo de vozes e o diretório temporário
+    sem sintetizar áudio
+    Usado por eventos agendados {"type": "warmup"} para manter a instância pronta
+    """
+    start_time = time.time()
+    with telemetry.stage('init'):
+        tts_service = get_tts_service(output_dir=TMP_DIR)
+    voice_catalog_ready = tts_service.voice_catalog.available
+    
+    # Remove as entradas expiradas do cache S3 (no máximo uma vez por S3_CACHE_PURGE_INTERVAL em cada instância)
+    # e grava as alterações pendentes do índice do cache (fora do caminho das requisições de síntese)
+    s3_cache_purged = None
+    if tts_service.s3_cache is not None:
+        s3_cache_purged = tts_service.s3_cache.maybe_purge_expired(S3_CACHE_PURGE_INTERVAL)
+        if s3_cache_purged is None:
+            tts_service.s3_cache.flush(S3_CACHE_FLUSH_TIMEOUT, write_index=True)
+    
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json.dumps({
+            'success': True,
+            'message': 'Lambda warmed up',
+            'init_time': round(time.time() - start_time, 3),
+            'rate_limiter': rate_limiter_stats(),
+            'voice_catalog': voice_catalog_ready,
+            's3_cache_purged': s3_cache_purged,
+            'tmp_storage': get_tmp_storage(TMP_DIR).usage()
+        })
+    }
+
+
 # Teste da função lambda (apenas para desenvolvimento local)
 if __name__ == "__main__":
     test_event = {
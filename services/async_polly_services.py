@@ -0,0 +1,377 @@
+import os
+import time
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+from services.polly_services import (MAX_BILLED_CHARACTERS, MAX_CONCURRENCY, ChunkAccumulator, TTSPollyService,
+                                     get_tts_service)
+from utils.audio_cache import synthesis_cache_key
+from utils.rate_limiter import call_with_retry_async, get_rate_limiter
+from utils import telemetry
+
+# Chamadas simultâneas ao Polly por processo, somando todas as requisições em andamento
+ASYNC_MAX_CONCURRENCY = int(os.getenv('TTS_ASYNC_MAX_CONCURRENCY', '32'))
+
+# Threads extras para leituras de cache e gravação de arquivos (não esperam pelas vagas do Polly)
+IO_WORKERS = 4
+
+T = TypeVar('T')
+
+
+class AsyncTTSPollyService:
+    """
+    API asyncio do TTSPollyService, para uso dentro de um loop de eventos (ex.: servidores web)
+
+    Configuração, catálogo de vozes, caches e limitadores são os do TTSPollyService informado, assim
+    como a preparação dos parâmetros, o resultado e o mapeamento de erros (métodos compartilhados).
+    Apenas as chamadas bloqueantes (preparação do texto, que pode consultar o catálogo de vozes no
+    disco ou no Polly, Polly, cache e disco) vão para um pool fixo de threads; as
+    esperas do limitador de taxa, do backoff e das vagas de concorrência são corrotinas, de modo
+    que centenas de sínteses podem estar em andamento sem uma thread por requisição.
+    Cancelar a tarefa que aguarda uma síntese interrompe os chunks ainda não iniciados e remove
+    o arquivo parcial.
+    """
+
+    def __init__(self, service: Optional[TTSPollyService] = None, region_name: str = 'us-east-1',
+                 output_dir: str = None, max_concurrency: Optional[int] = None):
+        """
+        Args:
+            service (TTSPollyService, optional): Serviço síncrono compartilhado (padrão: get_tts_service)
+            region_name (str): Região AWS para o serviço Polly
+            output_dir (str): Diretório para salvar arquivos de áudio (padrão: /tmp)
+            max_concurrency (int, optional): Chamadas simultâneas ao Polly (padrão: TTS_ASYNC_MAX_CONCURRENCY)
+        """
+        self.service = service or get_tts_service(region_name, output_dir)
+        self.max_concurrency = max(1, max_concurrency or ASYNC_MAX_CONCURRENCY)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency + IO_WORKERS,
+                                            thread_name_prefix='polly-async')
+
+        # Semáforo criado no loop em que é usado (um asyncio.Semaphore fica preso ao primeiro loop que o usa)
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    @property
+    def default_config(self) -> Dict:
+        return self.service.default_config
+
+    def _slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        """
+        Executa uma chamada bloqueante no pool de threads do serviço
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args))
+
+    async def _call_polly(self, synthesis_params: Dict, cache_key: Optional[str] = None) -> bytes:
+        """
+        Chama o synthesize_speech pelo limitador compartilhado da engine, ocupando uma vaga
+        de concorrência (e uma thread) apenas durante a chamada
+        """
+        limiter = get_rate_limiter(synthesis_params.get('Engine', 'standard'))
+
+        def request() -> bytes:
+            audio_data = self.service._request_audio(synthesis_params)
+            # Gravado ainda na thread: se a requisição for cancelada durante a chamada, o áudio já cobrado fica no cache
+            if cache_key is not None:
+                self.service._store_audio(cache_key, audio_data, synthesis_params['OutputFormat'])
+            return audio_data
+
+        async def call() -> bytes:
+            async with self._slots():
+                return await self._run(request)
+
+        return await call_with_retry_async(limiter, call)
+
+    async def _synthesize_audio(self, synthesis_params: Dict) -> Tuple[bytes, str]:
+        """
+        Versão assíncrona de TTSPollyService._synthesize_audio (mesmos caches e chaves)
+
+        Returns:
+            tuple: (bytes do áudio, status do cache: 'hit', 's3_hit', 'miss' ou 'disabled')
+        """
+        service = self.service
+        if service.audio_cache is None and service.s3_cache is None:
+            return await self._call_polly(synthesis_params), 'disabled'
+
+        cache_key = synthesis_cache_key(synthesis_params)
+        audio_data, cache_status = await self._run(service._cached_audio, cache_key)
+        if audio_data is not None:
+            return audio_data, cache_status
+
+        return await self._call_polly(synthesis_params, cache_key), 'miss'
+
+    @staticmethod
+    def _write_file(file_path: str, audio_data: bytes):
+        with open(file_path, 'wb') as audio_file:
+            audio_file.write(audio_data)
+
+    async def text_to_speech(self, text: str, voice_id: Optional[str] = None, speed: Optional[str] = None,
+                             use_neural: Optional[bool] = None, write_file: bool = True,
+                             return_audio: bool = False) -> Dict:
+        """
+        Converte texto para fala sem bloquear o loop de eventos (mesmo resultado de TTSPollyService.text_to_speech)
+
+        Args:
+            text (str): Texto para conversão
+            voice_id (str, optional): ID da voz a ser usada.
+            speed (str, optional): Velocidade da fala ('x-slow', 'slow', 'medium', 'fast', 'x-fast').
+            use_neural (bool, optional): Se deve usar o motor neural.
+            write_file (bool): Se deve gravar o áudio em output_dir.
+            return_audio (bool): Se deve retornar os bytes do áudio em 'audio_data' (sempre True sem arquivo).
+
+        Returns:
+            dict: Resultado da conversão
+        """
+        service = self.service
+        try:
+            start_time = time.time()
+            final_voice_id, final_speed, final_use_neural = service._final_options(voice_id, speed, use_neural)
+            processed_text = text.strip()
+
+            # Textos acima do limite do Polly são divididos em chunks e gerados como um único áudio
+            if len(processed_text) > MAX_BILLED_CHARACTERS:
+                result = await self.text_to_speech_streaming(
+                    processed_text,
+                    voice_id=final_voice_id,
+                    speed=final_speed,
+                    use_neural=final_use_neural,
+                    write_file=write_file,
+                    return_audio=return_audio
+                )
+                return service._long_text_result(result, text, processed_text, start_time)
+
+            synthesis_params = await self._run(service._prepare_params, processed_text, final_voice_id, final_speed,
+                                               final_use_neural)
+            raw_audio, cache_status = await self._synthesize_audio(synthesis_params)
+            audio_data, extension = service._single_container(raw_audio)
+
+            filename = None
+            file_path = None
+            if write_file:
+                filename, file_path = service._output_path('tts_audio', extension)
+                try:
+                    with telemetry.stage('file_write'):
+                        await self._run(self._write_file, file_path, audio_data)
+                except asyncio.CancelledError:
+                    service._remove_partial(file_path)
+                    raise
+                service.storage.track(file_path, len(audio_data))
+
+            return service._speech_result(text, processed_text, final_voice_id, synthesis_params, raw_audio,
+                                          audio_data, cache_status, start_time, file_path, filename,
+                                          keep_audio=return_audio or not write_file)
+        except Exception as e:
+            return service._error_result(e)
+
+    async def text_to_speech_streaming(self, text: str, voice_id: str = None, speed: Optional[str] = None,
+                                       use_neural: Optional[bool] = None, max_workers: Optional[int] = None,
+                                       write_file: bool = True, return_audio: bool = False) -> Dict:
+        """
+        Converte textos longos em chunks sintetizados concorrentemente, gravados no arquivo na ordem original
+        (mesmo resultado de TTSPollyService.text_to_speech_streaming)
+
+        Args:
+            text (str): Texto para conversão
+            voice_id (str, optional): ID da voz a ser usada.
+            speed (str, optional): Velocidade da fala ('x-slow', 'slow', 'medium', 'fast', 'x-fast').
+            use_neural (bool, optional): Se deve usar o motor neural.
+            max_workers (int, optional): Limite de chamadas simultâneas ao Polly nesta requisição.
+            write_file (bool): Se deve gravar o áudio em output_dir.
+            return_audio (bool): Se deve retornar os bytes do áudio em 'audio_data' (sempre True sem arquivo).
+
+        Returns:
+            dict: Resultado da conversão
+        """
+        service = self.service
+        try:
+            start_time = time.time()
+            final_voice_id, final_speed, final_use_neural = service._final_options(voice_id, speed, use_neural)
+            final_max_workers = max(1, max_workers or MAX_CONCURRENCY)
+            chunks, chunk_params = await self._run(service._prepare_chunks, text, final_voice_id, final_speed,
+                                                   final_use_neural)
+
+            output = ChunkAccumulator(service, chunks, chunk_params, keep_audio=return_audio or not write_file)
+            filename = None
+            file_path = None
+            output_file = None
+            if write_file:
+                filename, file_path = service._output_path('tts_streaming', output.stitcher.extension)
+                output_file = await self._run(open, file_path, 'wb')
+
+            completed = False
+            chunk_results = self._synthesize_chunks(chunk_params, final_max_workers)
+            try:
+                if output_file is not None:
+                    await self._run(output_file.write, output.stitcher.header())
+
+                async for chunk_data, timing in chunk_results:
+                    chunk_data = output.add(chunk_data, timing)
+                    if output_file is not None:
+                        with telemetry.stage('file_write'):
+                            await self._run(output_file.write, chunk_data)
+
+                # O tamanho total só é conhecido no fim: reescreve o cabeçalho com o valor final
+                header = output.final_header()
+                if output_file is not None and header:
+                    await self._run(self._rewrite_header, output_file, header)
+                completed = True
+            finally:
+                await chunk_results.aclose()
+                if output_file is not None:
+                    output_file.close()
+                    if not completed:
+                        service._remove_partial(file_path)
+
+            if file_path is not None:
+                service.storage.track(file_path, output.size)
+            return output.result(start_time, final_voice_id, final_max_workers, file_path, filename)
+        except Exception as e:
+            return service._error_result(e)
+
+    @staticmethod
+    def _rewrite_header(output_file, header: bytes):
+        output_file.seek(0)
+        output_file.write(header)
+
+    async def _synthesize_chunks(self, chunk_params: Iterable[Dict],
+                                 max_workers: int) -> AsyncIterator[Tuple[bytes, Dict]]:
+        """
+        Sintetiza os chunks como tarefas concorrentes, entregando os resultados na ordem original
+        Apenas uma janela de chunks fica em memória; se a iteração for interrompida (erro, cancelamento
+        ou gerador fechado), as tarefas pendentes são canceladas
+
+        Args:
+            chunk_params (iterable): Parâmetros de synthesize_speech de cada chunk (lista ou gerador)
+            max_workers (int): Número máximo de chamadas simultâneas ao Polly nesta requisição
+
+        Yields:
+            tuple: (bytes do áudio do chunk, tempos e status do chunk)
+        """
+        service = self.service
+        limit = asyncio.Semaphore(max_workers)
+
+        async def synthesize(index: int, params: Dict) -> Tuple[bytes, Dict]:
+            async with limit:
+                chunk_start = time.perf_counter()
+                audio_data, cache_status = await self._synthesize_audio(params)
+            return audio_data, {
+                'index': index,
+                'characters': len(params['Text']),
+                'billed_characters': service.billed_characters(params['Text']),
+                'synthesis_time': round(time.perf_counter() - chunk_start, 3),
+                'cache': cache_status
+            }
+
+        pending_chunks = enumerate(chunk_params)
+        if isinstance(chunk_params, list):
+            async def next_chunk_params():
+                return next(pending_chunks, None)
+        else:
+            # Geradores dividem o texto e consultam o catálogo de vozes a cada chunk: fora do loop
+            async def next_chunk_params():
+                return await self._run(next, pending_chunks, None)
+
+        window = max_workers * 2
+        in_flight = []
+        try:
+            while len(in_flight) < window:
+                next_chunk = await next_chunk_params()
+                if next_chunk is None:
+                    break
+                in_flight.append(asyncio.ensure_future(synthesize(*next_chunk)))
+
+            while in_flight:
+                result = await in_flight[0]
+                in_flight.pop(0)
+                next_chunk = await next_chunk_params()
+                if next_chunk is not None:
+                    in_flight.append(asyncio.ensure_future(synthesize(*next_chunk)))
+                yield result
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def iter_speech(self, text: str, voice_id: Optional[str] = None, speed: Optional[str] = None,
+                          use_neural: Optional[bool] = None, max_workers: Optional[int] = None,
+                          first_chunk_chars: Optional[int] = None,
+                          usage: Optional[Dict] = None) -> AsyncIterator[bytes]:
+        """
+        Gera o áudio chunk a chunk, à medida que cada chamada ao Polly termina
+        (versão assíncrona de TTSPollyService.iter_speech)
+
+        Fechar o gerador (aclose) ou cancelar quem o consome cancela os chunks ainda em andamento.
+        Erros do Polly são propagados como exceções durante a iteração.
+
+        Args:
+            text (str): Texto (ou documento SSML) para conversão
+            voice_id (str, optional): ID da voz a ser usada.
+            speed (str, optional): Velocidade da fala ('x-slow', 'slow', 'medium', 'fast', 'x-fast').
+            use_neural (bool, optional): Se deve usar o motor neural.
+            max_workers (int, optional): Limite de chamadas simultâneas ao Polly nesta requisição.
+            first_chunk_chars (int, optional): Tamanho máximo do primeiro chunk (padrão: TTS_FIRST_CHUNK_CHARS)
+            usage (dict, optional): Acumula 'billed_characters' e 'cached_characters' durante a iteração
+
+        Yields:
+            bytes: Áudio de cada chunk, na ordem do texto (precedido do cabeçalho WAV para PCM)
+        """
+        service = self.service
+        final_voice_id, final_speed, final_use_neural = service._final_options(voice_id, speed, use_neural)
+        final_max_workers = max(1, max_workers or MAX_CONCURRENCY)
+        chunk_params = service._iter_chunk_params(text, final_voice_id, final_speed, final_use_neural,
+                                                  first_chunk_chars)
+
+        # Sem o tamanho total, o cabeçalho (apenas PCM) é enviado com tamanho desconhecido
+        stitcher = service._new_stitcher()
+        header = stitcher.header()
+        if header:
+            yield header
+
+        chunk_results = self._synthesize_chunks(chunk_params, final_max_workers)
+        try:
+            async for chunk_data, timing in chunk_results:
+                if usage is not None:
+                    service._character_usage(timing, timing['cache'], usage)
+                yield stitcher.feed(chunk_data)
+        finally:
+            await chunk_results.aclose()
+
+    def close(self):
+        """
+        Encerra o pool de threads (chamadas já iniciadas terminam em background)
+        """
+        self._executor.shutdown(wait=False)
+
+
+# Serviços assíncronos compartilhados pelo processo (um por serviço síncrono)
+_async_services = {}
+_async_services_lock = threading.Lock()
+
+
+def get_async_tts_service(region_name: str = 'us-east-1', output_dir: str = None) -> AsyncTTSPollyService:
+    """
+    Retorna o AsyncTTSPollyService da região/diretório informados, criando-o apenas uma vez por processo
+    O serviço usa o mesmo TTSPollyService (configuração, catálogo de vozes e caches) de get_tts_service
+
+    Args:
+        region_name (str): Região AWS para o serviço Polly
+        output_dir (str): Diretório para salvar arquivos de áudio (padrão: /tmp)
+    """
+    key = (region_name, output_dir or "/tmp")
+    with _async_services_lock:
+        service = _async_services.get(key)
+        if service is None:
+            service = AsyncTTSPollyService(get_tts_service(region_name, output_dir))
+            _async_services[key] = service
+        return service
@@ -1,34 +1,169 @@
-# +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
-# RUN LOCALY
-from utils.check_aws import AWS_SERVICES
-
-aws_services = AWS_SERVICES()
-session = aws_services.login_session_AWS()
-# +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
-
 import os
 import json
-import boto3
+import uuid
 import time
-from typing import Dict, Optional
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from botocore.exceptions import BotoCoreError, ClientError
 
+from services.voice_catalog import InvalidVoiceError, get_voice_catalog
+from utils.audio_cache import get_local_cache, synthesis_cache_key
+from utils.audio_duration import audio_duration
+from utils.audio_stitcher import AudioStitcher
+from utils.client_registry import get_client
+from utils.rate_limiter import call_with_retry, get_rate_limiter, is_retryable_error
+from utils import telemetry
+from utils.tmp_storage import get_tmp_storage
+from utils.text_splitter import MAX_BILLED_CHARACTERS, MAX_TOTAL_CHARACTERS, SSML_TAG, iter_text_chunks, split_text
+
+# Tamanho máximo do cache local de áudio (0 desativa o cache)
+CACHE_MAX_MB = float(os.getenv('TTS_CACHE_MAX_MB', '128'))
+
+# Cache de segundo nível no S3 (desativado se o bucket não for informado)
+S3_CACHE_BUCKET = os.getenv('TTS_S3_CACHE_BUCKET')
+S3_CACHE_PREFIX = os.getenv('TTS_S3_CACHE_PREFIX', 'tts-cache/')
+S3_CACHE_TTL_SECONDS = int(os.getenv('TTS_S3_CACHE_TTL_SECONDS', '0')) or None
+
+# Número máximo de chamadas simultâneas ao Polly na síntese de textos em chunks
+MAX_CONCURRENCY = int(os.getenv('TTS_MAX_CONCURRENCY', '4'))
+
+# Taxa aproximada de áudio gerado por formato (bytes por segundo) e velocidade média de fala
+AUDIO_BYTES_PER_SECOND = {'mp3': 6000, 'ogg_vorbis': 6000, 'pcm': 32000}
+SPEECH_CHARS_PER_SECOND = 15
+
+# Textos acima deste tamanho (caracteres cobrados) usam a síntese assíncrona do Polly, que grava direto no S3
+SYNC_MAX_CHARACTERS = int(os.getenv('TTS_SYNC_MAX_CHARACTERS', '20000'))
+
+# Limites do StartSpeechSynthesisTask: caracteres cobrados e tamanho total da requisição
+MAX_TASK_BILLED_CHARACTERS = 100000
+MAX_TASK_TOTAL_CHARACTERS = 200000
+
+# Erros de get_speech_synthesis_task causados pelo TaskId informado (erros do cliente, não do serviço)
+TASK_ERROR_TYPES = {
+    'SynthesisTaskNotFoundException': 'not_found',
+    'InvalidTaskIdException': 'validation_error'
+}
+
+# Backoff sugerido entre consultas de status de tarefas assíncronas (segundos)
+TASK_POLL_INITIAL_DELAY = 2.0
+TASK_POLL_MAX_DELAY = 30.0
+
+# Tamanho do primeiro chunk no modo streaming (menor = primeiro áudio mais cedo)
+FIRST_CHUNK_CHARS = int(os.getenv('TTS_FIRST_CHUNK_CHARS', '200'))
+
+# Tamanho médio dos chunks de textos longos, com cortes definidos pelo conteúdo: ao sintetizar
+# de novo um texto editado, só os chunks alterados vão ao Polly. Desativado por padrão (0 = chunks
+# do tamanho máximo), pois chunks menores aumentam o número de chamadas ao Polly
+CHUNK_TARGET_CHARS = int(os.getenv('TTS_CHUNK_TARGET_CHARS', '0'))
+
+class ChunkAccumulator:
+    """
+    Junta os chunks de text_to_speech_streaming na ordem do texto: contêiner único, duração,
+    caracteres cobrados, tempos de cada chunk e, se pedido, o áudio em memória
+    Usado pelas APIs síncrona e asyncio, que diferem apenas em como esperam pelos chunks
+    """
+
+    def __init__(self, service: 'TTSPollyService', chunks: List[str], chunk_params: List[Dict], keep_audio: bool):
+        """
+        Args:
+            service (TTSPollyService): Serviço que sintetiza os chunks
+            chunks (list): Textos dos chunks
+            chunk_params (list): Parâmetros de synthesize_speech de cada chunk
+            keep_audio (bool): Se o áudio deve ser mantido em memória para o resultado
+        """
+        self.service = service
+        self.chunks = chunks
+        self.chunk_params = chunk_params
+        self.keep_audio = keep_audio
+        self.stitcher = service._new_stitcher()
+
+        self.duration = 0.0
+        self.chunk_timings = []
+        self.audio_parts = []
+        self.usage = {'billed_characters': 0, 'cached_characters': 0}
+
+    def add(self, chunk_data: bytes, timing: Dict) -> bytes:
+        """
+        Registra o próximo chunk (na ordem do texto)
+
+        Returns:
+            bytes: Áudio do chunk pronto para ser gravado após o cabeçalho (sem tags repetidas)
+        """
+        index = timing['index']
+        self.duration += self.service._audio_duration(chunk_data, self.chunks[index])
+        self.service._character_usage(self.chunk_params[index], timing['cache'], self.usage)
+        chunk_data = self.stitcher.feed(chunk_data)
+        if self.keep_audio:
+            self.audio_parts.append(chunk_data)
+        self.chunk_timings.append(timing)
+        return chunk_data
+
+    def final_header(self) -> bytes:
+        """
+        Cabeçalho com o tamanho final (vazio para formatos sem cabeçalho)
+        """
+        return self.stitcher.header(self.stitcher.data_size)
+
+    @property
+    def size(self) -> int:
+        return len(self.final_header()) + self.stitcher.data_size
+
+    def result(self, start_time: float, voice_id: str, max_workers: int, file_path: Optional[str] = None,
+               filename: Optional[str] = None) -> Dict:
+        """
+        Monta o resultado de text_to_speech_streaming
+        """
+        header = self.final_header()
+        total_size = self.size
+        cache_statuses = {timing['cache'] for timing in self.chunk_timings}
+        return {
+            'success': True,
+            'file_path': file_path,
+            'filename': filename,
+            'audio_data': header + b''.join(self.audio_parts) if self.keep_audio else None,
+            'file_size_bytes': total_size,
+            'file_size_mb': round(total_size / (1024 * 1024), 3),
+            'processing_time': round(time.time() - start_time, 2),
+            'duration': round(self.duration, 2),
+            'chunks_processed': len(self.chunks),
+            'chunk_timings': self.chunk_timings,
+            'max_workers': max_workers,
+            'voice_id': voice_id,
+            'output_format': self.service.default_config['output_format'],
+            'engine': self.chunk_params[0]['Engine'] if self.chunk_params else None,
+            'cache': cache_statuses.pop() if len(cache_statuses) == 1 else 'partial',
+            'billed_characters': self.usage['billed_characters'],
+            'cached_characters': self.usage['cached_characters']
+        }
+
+
 class TTSPollyService:
     """
     Serviço simplificado para Text-to-Speech usando Amazon Polly
     Focado em performance e qualidade de voz natural
     """
     
-    def __init__(self, region_name: str = 'us-east-1', output_dir: str = None):
+    def __init__(self, region_name: str = 'us-east-1', output_dir: str = None, cache_max_mb: Optional[float] = None,
+                 s3_cache=None, polly_client=None):
         """
         Inicializa o serviço Polly
         
         Args:
             region_name (str): Região AWS para o serviço Polly
             output_dir (str): Diretório para salvar arquivos de áudio (padrão: /tmp)
+            cache_max_mb (float, optional): Tamanho máximo do cache local em MB (0 desativa)
+            s3_cache (S3AudioCache, optional): Cache de segundo nível no S3 (padrão: TTS_S3_CACHE_BUCKET)
+            polly_client (optional): Cliente Polly já criado, usado em todas as operações
+                                     (padrão: clientes compartilhados da região)
         """
         try:
-            self.polly_client = session.client('polly', region_name=region_name)
+            self.region_name = region_name
+            self.polly_client = polly_client or get_client('polly', region_name)
+            # synthesize_speech sem retentativas do botocore: as limitações são repetidas por call_with_retry
+            self.synthesis_client = polly_client or get_client('polly', region_name, profile='synthesis')
             self.output_dir = output_dir or "/tmp"
             
             # Configuração padrão otimizada para voz natural e rápida
@@ -42,12 +177,12 @@ class TTSPollyService:
                 'use_neural': True      # Added default for using neural engine
             }
             
-            print(f'[DEBUG] TTS parameters configured:')
-            print(f'        - Voice ID: {self.default_config["voice_id"]}')
-            print(f'        - Format: {self.default_config["output_format"]}')
-            print(f'        - Speed: {self.default_config.get("speed", "medium")}')
-            print(f'        - Neural Engine: {"neural" if self.default_config.get("use_neural") else "standard"}')
+            telemetry.debug(f'TTS parameters configured: voice_id={self.default_config["voice_id"]}, '
+                            f'format={self.default_config["output_format"]}, '
+                            f'speed={self.default_config.get("speed", "medium")}, '
+                            f'engine={"neural" if self.default_config.get("use_neural") else "standard"}')
             
+            # Vozes recomendadas (usadas na escolha da engine apenas se o catálogo do Polly não puder ser lido)
             self.recommended_voices = {
                 'female': ['Joanna', 'Kimberly', 'Salli', 'Kendra', 'Ivy'],
                 'male': ['Matthew', 'Joey', 'Justin', 'Kevin'],
@@ -56,10 +191,31 @@ class TTSPollyService:
             
             os.makedirs(self.output_dir, exist_ok=True)
             
+            # Catálogo de vozes do Polly: valida voz, engine e idioma localmente antes da síntese
+            self.voice_catalog = get_voice_catalog(self.polly_client, region_name, self.output_dir)
+            
+            # Orçamento de espaço dos arquivos gerados em output_dir (liberado após as respostas)
+            self.storage = get_tmp_storage(self.output_dir)
+            
+            # Cache local endereçado por conteúdo (compartilhado entre instâncias do processo)
+            max_mb = CACHE_MAX_MB if cache_max_mb is None else cache_max_mb
+            if max_mb > 0:
+                cache_dir = os.path.join(self.output_dir, 'tts_cache')
+                self.audio_cache = get_local_cache(cache_dir, int(max_mb * 1024 * 1024))
+            else:
+                self.audio_cache = None
+            
+            # Cache compartilhado no S3, consultado quando o cache local não tem o áudio
+            if s3_cache is None and S3_CACHE_BUCKET:
+                from services.s3_audio_cache import get_s3_cache
+                s3_cache = get_s3_cache(S3_CACHE_BUCKET, S3_CACHE_PREFIX, S3_CACHE_TTL_SECONDS)
+            self.s3_cache = s3_cache
+            
         except Exception as e:
             raise Exception(f"Erro ao inicializar TTSPollyService: {e}")
 
-    def text_to_speech(self, text: str, voice_id: Optional[str] = None, speed: Optional[str] = None, use_neural: Optional[bool] = None) -> Dict:
+    def text_to_speech(self, text: str, voice_id: Optional[str] = None, speed: Optional[str] = None, use_neural: Optional[bool] = None,
+                       write_file: bool = True, return_audio: bool = False) -> Dict:
         """
         Converte texto para fala usando Amazon Polly
         
@@ -68,170 +224,761 @@ class TTSPollyService:
             voice_id (str, optional): ID da voz a ser usada.
             speed (str, optional): Velocidade da fala ('x-slow', 'slow', 'medium', 'fast', 'x-fast').
             use_neural (bool, optional): Se deve usar o motor neural.
+            write_file (bool): Se deve gravar o áudio em output_dir.
+            return_audio (bool): Se deve retornar os bytes do áudio em 'audio_data' (sempre True sem arquivo).
             
         Returns:
             dict: Resultado da conversão
         """
         try:
             start_time = time.time()
-            
-            # --- FIX 3: Prioritize passed arguments over defaults ---
-            final_voice_id = voice_id or self.default_config['voice_id']
-            final_speed = speed or self.default_config['speed']
-            final_use_neural = use_neural if use_neural is not None else self.default_config['use_neural']
-            
+            final_voice_id, final_speed, final_use_neural = self._final_options(voice_id, speed, use_neural)
             processed_text = text.strip()
-            if len(processed_text) > 3000:
-                processed_text = processed_text[:2900] + "..."
-            
-            synthesis_params = {
-                'Text': processed_text,
-                'OutputFormat': self.default_config['output_format'],
-                'VoiceId': final_voice_id,
-                'LanguageCode': self.default_config['language_code'],
-                'SampleRate': self.default_config['sample_rate']
-            }
             
-            if final_use_neural and final_voice_id in self.recommended_voices['neural']:
-                synthesis_params['Engine'] = 'neural'
-            else:
-                synthesis_params['Engine'] = 'standard'
+            # Textos acima do limite do Polly são divididos em chunks e gerados como um único áudio
+            if len(processed_text) > MAX_BILLED_CHARACTERS:
+                result = self.text_to_speech_streaming(
+                    processed_text,
+                    voice_id=final_voice_id,
+                    speed=final_speed,
+                    use_neural=final_use_neural,
+                    write_file=write_file,
+                    return_audio=return_audio
+                )
+                return self._long_text_result(result, text, processed_text, start_time)
             
-            if final_speed != 'medium':
-                ssml_text = f'<speak><prosody rate="{final_speed}">{processed_text}</prosody></speak>'
-                synthesis_params['Text'] = ssml_text
-                synthesis_params['TextType'] = 'ssml'
+            synthesis_params = self._prepare_params(processed_text, final_voice_id, final_speed, final_use_neural)
+            raw_audio, cache_status = self._synthesize_audio(synthesis_params)
+            audio_data, extension = self._single_container(raw_audio)
             
-            response = self.polly_client.synthesize_speech(**synthesis_params)
+            filename = None
+            file_path = None
+            if write_file:
+                filename, file_path = self._output_path('tts_audio', extension)
+                with telemetry.stage('file_write'), open(file_path, 'wb') as audio_file:
+                    audio_file.write(audio_data)
+                self.storage.track(file_path, len(audio_data))
             
-            timestamp = int(time.time() * 1000)
-            filename = f"tts_audio_{timestamp}.{self.default_config['output_format']}"
-            file_path = os.path.join(self.output_dir, filename)
-            
-            with open(file_path, 'wb') as audio_file:
-                audio_file.write(response['AudioStream'].read())
+            return self._speech_result(text, processed_text, final_voice_id, synthesis_params, raw_audio, audio_data,
+                                       cache_status, start_time, file_path, filename,
+                                       keep_audio=return_audio or not write_file)
+        except Exception as e:
+            return self._error_result(e)
+    
+    # ------------------------------------------------------------------------
+    # Etapas compartilhadas com a API asyncio (services.async_polly_services)
+    # ------------------------------------------------------------------------
+    def _final_options(self, voice_id: Optional[str], speed: Optional[str],
+                       use_neural: Optional[bool]) -> Tuple[str, str, bool]:
+        """
+        Aplica a configuração padrão às opções não informadas na requisição
+        """
+        return (voice_id or self.default_config['voice_id'],
+                speed or self.default_config['speed'],
+                use_neural if use_neural is not None else self.default_config['use_neural'])
+    
+    def _prepare_params(self, text: str, voice_id: str, speed: str, use_neural: bool) -> Dict:
+        """
+        Monta os parâmetros de um texto que cabe em uma chamada (etapa 'text_prep')
+        Pode ler o catálogo de vozes do disco ou do Polly (a API asyncio a executa no pool de threads)
+        """
+        with telemetry.stage('text_prep'):
+            return self._build_synthesis_params(text, voice_id, speed, use_neural)
+    
+    def _prepare_chunks(self, text: str, voice_id: str, speed: str, use_neural: bool) -> Tuple[List[str], List[Dict]]:
+        """
+        Divide o texto em chunks e monta os parâmetros de cada um (etapa 'text_prep', ver _prepare_params)
+        """
+        with telemetry.stage('text_prep'):
+            chunks = self._split_text_for_streaming(text, speed)
+            return chunks, [self._build_synthesis_params(chunk, voice_id, speed, use_neural) for chunk in chunks]
+    
+    def _iter_chunk_params(self, text: str, voice_id: str, speed: str, use_neural: bool,
+                           first_chunk_chars: Optional[int]) -> Iterator[Dict]:
+        """
+        Gera os parâmetros de cada chunk sob demanda (usado por iter_speech)
+        """
+        for chunk in self._split_text_for_streaming(text.strip(), speed, first_chunk_chars or FIRST_CHUNK_CHARS,
+                                                    lazy=True):
+            yield self._build_synthesis_params(chunk, voice_id, speed, use_neural)
+    
+    def _single_container(self, raw_audio: bytes) -> Tuple[bytes, str]:
+        """
+        Envolve o áudio de uma única chamada no contêiner final (cabeçalho WAV para PCM)
+        
+        Returns:
+            tuple: (bytes do arquivo, extensão)
+        """
+        stitcher = self._new_stitcher()
+        audio_data = stitcher.feed(raw_audio)
+        return stitcher.header(stitcher.data_size) + audio_data, stitcher.extension
+    
+    def _output_path(self, prefix: str, extension: str) -> Tuple[str, str]:
+        """
+        Gera nome e caminho únicos para um arquivo de saída em output_dir
+        """
+        filename = self._unique_filename(prefix, extension)
+        return filename, os.path.join(self.output_dir, filename)
+    
+    @staticmethod
+    def _remove_partial(file_path: str):
+        """
+        Remove um arquivo de saída incompleto (erro ou cancelamento durante a gravação)
+        """
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+    
+    def _speech_result(self, text: str, processed_text: str, voice_id: str, synthesis_params: Dict, raw_audio: bytes,
+                       audio_data: bytes, cache_status: str, start_time: float, file_path: Optional[str] = None,
+                       filename: Optional[str] = None, keep_audio: bool = True) -> Dict:
+        """
+        Monta o resultado de text_to_speech para um texto sintetizado em uma única chamada
+        """
+        file_size = len(audio_data)
+        usage = self._character_usage(synthesis_params, cache_status)
+        return {
+            'success': True,
+            'file_path': file_path,
+            'filename': filename,
+            'audio_data': audio_data if keep_audio else None,
+            'file_size_bytes': file_size,
+            'file_size_mb': round(file_size / (1024 * 1024), 3),
+            'processing_time': round(time.time() - start_time, 2),
+            'duration': round(self._audio_duration(raw_audio, processed_text), 2),
+            'voice_id': voice_id,
+            'output_format': self.default_config['output_format'],
+            'engine': synthesis_params.get('Engine', 'standard'),
+            'text_length': len(text),
+            'processed_text_length': len(processed_text),
+            'cache': cache_status,
+            'billed_characters': usage['billed_characters'],
+            'cached_characters': usage['cached_characters']
+        }
+    
+    @staticmethod
+    def _long_text_result(result: Dict, text: str, processed_text: str, start_time: float) -> Dict:
+        """
+        Completa o resultado de text_to_speech_streaming quando text_to_speech delega um texto longo
+        """
+        if result.get('success'):
+            result['processing_time'] = round(time.time() - start_time, 2)
+            result['text_length'] = len(text)
+            result['processed_text_length'] = len(processed_text)
+        return result
+    
+    @staticmethod
+    def _error_result(error: Exception) -> Dict:
+        """
+        Converte uma exceção da síntese no resultado de falha (error_type 'validation_error',
+        'aws_error' com 'retryable' ou 'general_error')
+        """
+        if isinstance(error, InvalidVoiceError):
+            return {'success': False, 'error': str(error), 'error_type': 'validation_error'}
+        if isinstance(error, (BotoCoreError, ClientError)):
+            return {'success': False, 'error': str(error), 'error_type': 'aws_error',
+                    'retryable': is_retryable_error(error)}
+        return {'success': False, 'error': str(error), 'error_type': 'general_error'}
             
-            processing_time = time.time() - start_time
-            file_size = os.path.getsize(file_path)
+    def _build_synthesis_params(self, text: str, voice_id: str, speed: str, use_neural: bool) -> Dict:
+        """
+        Monta os parâmetros de synthesize_speech para um trecho de texto
+        
+        Args:
+            text (str): Texto já processado
+            voice_id (str): ID da voz
+            speed (str): Velocidade da fala
+            use_neural (bool): Se deve usar o motor neural
             
-            chars_per_second = 165
-            estimated_duration = len(text) / chars_per_second
+        Returns:
+            dict: Parâmetros finais para synthesize_speech
             
-            return {
-                'success': True,
-                'file_path': file_path,
-                'filename': filename,
-                'file_size_bytes': file_size,
-                'file_size_mb': round(file_size / (1024 * 1024), 3),
-                'processing_time': round(processing_time, 2),
-                'duration': round(estimated_duration, 2),
-                'voice_id': final_voice_id,
-                'output_format': self.default_config['output_format'],
-                'engine': synthesis_params.get('Engine', 'standard'),
-                'text_length': len(text),
-                'processed_text_length': len(processed_text)
-            }
+        Raises:
+            InvalidVoiceError: Se a voz não existir no Polly (verificado no catálogo local)
+        """
+        synthesis_params = {
+            'Text': text,
+            'OutputFormat': self.default_config['output_format'],
+            'VoiceId': voice_id,
+            'LanguageCode': self.default_config['language_code'],
+            'SampleRate': self.default_config['sample_rate']
+        }
+        
+        resolved = self.voice_catalog.resolve(voice_id, use_neural, self.default_config['language_code'])
+        if resolved is not None:
+            synthesis_params['Engine'] = resolved['engine']
+            synthesis_params['LanguageCode'] = resolved['language_code']
+        elif use_neural and voice_id in self.recommended_voices['neural']:
+            synthesis_params['Engine'] = 'neural'
+        else:
+            synthesis_params['Engine'] = 'standard'
+        
+        if self._is_ssml(text):
+            # Documentos SSML já trazem o próprio controle de velocidade
+            synthesis_params['TextType'] = 'ssml'
+        elif speed != 'medium':
+            ssml_text = f'<speak><prosody rate="{speed}">{text}</prosody></speak>'
+            synthesis_params['Text'] = ssml_text
+            synthesis_params['TextType'] = 'ssml'
+        
+        return synthesis_params
+    
+    def _new_stitcher(self) -> AudioStitcher:
+        """
+        Cria o concatenador de chunks para o formato de saída configurado
+        """
+        return AudioStitcher(self.default_config['output_format'], self.default_config['sample_rate'])
+    
+    def _audio_duration(self, audio_data: bytes, text: str) -> float:
+        """
+        Retorna a duração real do áudio lida dos cabeçalhos, com estimativa pelo texto
+        apenas quando o formato não puder ser lido
+        """
+        duration = audio_duration(audio_data, self.default_config['output_format'], self.default_config['sample_rate'])
+        if duration is None:
+            duration = self.billed_characters(text) / SPEECH_CHARS_PER_SECOND
+        return duration
+    
+    @staticmethod
+    def _unique_filename(prefix: str, extension: str) -> str:
+        """
+        Gera um nome de arquivo único mesmo para chamadas concorrentes no mesmo milissegundo
+        """
+        timestamp = int(time.time() * 1000)
+        return f"{prefix}_{timestamp}_{uuid.uuid4().hex[:8]}.{extension}"
+    
+    def _synthesize_audio(self, synthesis_params: Dict) -> Tuple[bytes, str]:
+        """
+        Sintetiza o áudio consultando antes o cache local e o cache no S3
+        
+        Args:
+            synthesis_params (dict): Parâmetros finais para synthesize_speech
             
-        except (BotoCoreError, ClientError) as e:
-            return {'success': False, 'error': str(e), 'error_type': 'aws_error'}
-        except Exception as e:
-            return {'success': False, 'error': str(e), 'error_type': 'general_error'}
+        Returns:
+            tuple: (bytes do áudio, status do cache: 'hit', 's3_hit', 'miss' ou 'disabled')
+        """
+        if self.audio_cache is None and self.s3_cache is None:
+            return self._call_polly(synthesis_params), 'disabled'
+        
+        cache_key = synthesis_cache_key(synthesis_params)
+        audio_data, cache_status = self._cached_audio(cache_key)
+        if audio_data is not None:
+            return audio_data, cache_status
+        
+        audio_data = self._call_polly(synthesis_params)
+        self._store_audio(cache_key, audio_data, synthesis_params['OutputFormat'])
+        return audio_data, 'miss'
+    
+    def _cached_audio(self, cache_key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Consulta o cache local e depois o cache no S3 (acertos do S3 são copiados para o cache local)
+        
+        Returns:
+            tuple: (bytes do áudio ou None, status do cache: 'hit', 's3_hit' ou None)
+        """
+        if self.audio_cache is not None:
+            with telemetry.stage('cache_lookup'):
+                audio_data = self.audio_cache.get(cache_key)
+            if audio_data is not None:
+                return audio_data, 'hit'
+        
+        if self.s3_cache is not None:
+            with telemetry.stage('s3_cache_lookup'):
+                audio_data = self.s3_cache.get(cache_key)
+            if audio_data is not None:
+                if self.audio_cache is not None:
+                    self.audio_cache.put(cache_key, audio_data)
+                return audio_data, 's3_hit'
+        return None, None
+    
+    def _store_audio(self, cache_key: str, audio_data: bytes, output_format: str):
+        """
+        Grava um áudio recém-sintetizado no cache local e agenda a gravação no cache do S3
+        """
+        if self.audio_cache is not None:
+            self.audio_cache.put(cache_key, audio_data)
+        if self.s3_cache is not None:
+            self.s3_cache.put_async(cache_key, audio_data, output_format)
             
-    def text_to_speech_streaming(self, text: str, voice_id: str = None) -> Dict:
+    def _call_polly(self, synthesis_params: Dict) -> bytes:
+        """
+        Chama o synthesize_speech pelo limitador de taxa compartilhado da engine,
+        repetindo limitações (ThrottlingException) com backoff e jitter
+        """
+        limiter = get_rate_limiter(synthesis_params.get('Engine', 'standard'))
+        return call_with_retry(limiter, lambda: self._request_audio(synthesis_params))
+    
+    def _request_audio(self, synthesis_params: Dict) -> bytes:
+        """
+        Uma única chamada ao synthesize_speech (sem limitador nem novas tentativas)
+        """
+        with telemetry.stage('polly_call'):
+            response = self.synthesis_client.synthesize_speech(**synthesis_params)
+        with telemetry.stage('stream_read'):
+            return response['AudioStream'].read()
+    
+    def text_to_speech_streaming(self, text: str, voice_id: str = None, speed: Optional[str] = None,
+                                 use_neural: Optional[bool] = None, max_workers: Optional[int] = None,
+                                 write_file: bool = True, return_audio: bool = False) -> Dict:
         """
         Converte texto para fala usando streaming para textos longos
+        Os chunks são sintetizados em paralelo e gravados no arquivo na ordem original
 
         Args:
             text (str): Texto para conversão
             voice_id (str, optional): ID da voz a ser usada.
+            speed (str, optional): Velocidade da fala ('x-slow', 'slow', 'medium', 'fast', 'x-fast').
+            use_neural (bool, optional): Se deve usar o motor neural.
+            max_workers (int, optional): Limite de chamadas simultâneas ao Polly (1 = sequencial).
+            write_file (bool): Se deve gravar o áudio em output_dir.
+            return_audio (bool): Se deve retornar os bytes do áudio em 'audio_data' (sempre True sem arquivo).
 
         Returns:
             dict: Resultado da conversão
         """
         try:
-            final_voice_id = voice_id or self.default_config['voice_id']
-            chunks = self._split_text_for_streaming(text)
-            
-            timestamp = int(time.time() * 1000)
-            filename = f"tts_streaming_{timestamp}.mp3"
-            file_path = os.path.join(self.output_dir, filename)
-            
-            total_size = 0
-            
-            with open(file_path, 'wb') as output_file:
-                for chunk in chunks:
-                    response = self.polly_client.synthesize_speech(
-                        Text=chunk,
-                        OutputFormat='mp3',
-                        VoiceId=final_voice_id,
-                        Engine='neural' if final_voice_id in self.recommended_voices['neural'] else 'standard'
-                    )
-                    
-                    chunk_data = response['AudioStream'].read()
-                    output_file.write(chunk_data)
-                    total_size += len(chunk_data)
+            start_time = time.time()
+            final_voice_id, final_speed, final_use_neural = self._final_options(voice_id, speed, use_neural)
+            final_max_workers = max(1, max_workers or MAX_CONCURRENCY)
+            chunks, chunk_params = self._prepare_chunks(text, final_voice_id, final_speed, final_use_neural)
+            
+            # Os chunks são concatenados sem recodificação, com um único contêiner para o arquivo todo
+            output = ChunkAccumulator(self, chunks, chunk_params, keep_audio=return_audio or not write_file)
+            filename = None
+            file_path = None
+            output_file = None
+            if write_file:
+                filename, file_path = self._output_path('tts_streaming', output.stitcher.extension)
+                output_file = open(file_path, 'wb')
+            
+            completed = False
+            try:
+                if output_file is not None:
+                    output_file.write(output.stitcher.header())
+                for chunk_data, timing in self._synthesize_chunks(chunk_params, final_max_workers):
+                    chunk_data = output.add(chunk_data, timing)
+                    if output_file is not None:
+                        with telemetry.stage('file_write'):
+                            output_file.write(chunk_data)
+                
+                # O tamanho total só é conhecido no fim: reescreve o cabeçalho com o valor final
+                header = output.final_header()
+                if output_file is not None and header:
+                    output_file.seek(0)
+                    output_file.write(header)
+                completed = True
+            finally:
+                if output_file is not None:
+                    output_file.close()
+                    if not completed:
+                        self._remove_partial(file_path)
+            
+            if file_path is not None:
+                self.storage.track(file_path, output.size)
+            return output.result(start_time, final_voice_id, final_max_workers, file_path, filename)
+        except Exception as e:
+            return self._error_result(e)
+    
+    def _synthesize_chunks(self, chunk_params: Iterable[Dict], max_workers: int) -> Iterator[Tuple[bytes, Dict]]:
+        """
+        Sintetiza os chunks com um pool limitado de threads, entregando os resultados na ordem original
+        Apenas uma janela de chunks fica em memória, mesmo quando os últimos terminam antes dos primeiros
+
+        Args:
+            chunk_params (iterable): Parâmetros de synthesize_speech de cada chunk (lista ou gerador)
+            max_workers (int): Número máximo de chamadas simultâneas ao Polly
+
+        Yields:
+            tuple: (bytes do áudio do chunk, tempos e status do chunk)
+        """
+        def synthesize(index: int, params: Dict) -> Tuple[bytes, Dict]:
+            chunk_start = time.perf_counter()
+            audio_data, cache_status = self._synthesize_audio(params)
+            return audio_data, {
+                'index': index,
+                'characters': len(params['Text']),
+                'billed_characters': self.billed_characters(params['Text']),
+                'synthesis_time': round(time.perf_counter() - chunk_start, 3),
+                'cache': cache_status
+            }
+        
+        if max_workers <= 1:
+            for index, params in enumerate(chunk_params):
+                yield synthesize(index, params)
+            return
+        
+        pending_chunks = iter(enumerate(chunk_params))
+        window = max_workers * 2
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='polly-chunk') as executor:
+            in_flight = deque()
+            try:
+                for index, params in pending_chunks:
+                    in_flight.append(executor.submit(synthesize, index, params))
+                    if len(in_flight) >= window:
+                        break
+                
+                while in_flight:
+                    yield in_flight.popleft().result()
+                    next_chunk = next(pending_chunks, None)
+                    if next_chunk is not None:
+                        in_flight.append(executor.submit(synthesize, *next_chunk))
+            finally:
+                # Em caso de erro (ou gerador abandonado), não inicia os chunks restantes
+                for future in in_flight:
+                    future.cancel()
+    
+    def iter_speech(self, text: str, voice_id: Optional[str] = None, speed: Optional[str] = None,
+                    use_neural: Optional[bool] = None, max_workers: Optional[int] = None,
+                    first_chunk_chars: Optional[int] = None, usage: Optional[Dict] = None) -> Iterator[bytes]:
+        """
+        Gera o áudio chunk a chunk, à medida que cada chamada ao Polly termina
+        
+        O primeiro chunk é propositalmente pequeno para reduzir o tempo até o primeiro byte de áudio;
+        os chunks seguintes são sintetizados em paralelo enquanto os anteriores são consumidos.
+        Erros do Polly são propagados como exceções durante a iteração.
+        
+        Args:
+            text (str): Texto (ou documento SSML) para conversão
+            voice_id (str, optional): ID da voz a ser usada.
+            speed (str, optional): Velocidade da fala ('x-slow', 'slow', 'medium', 'fast', 'x-fast').
+            use_neural (bool, optional): Se deve usar o motor neural.
+            max_workers (int, optional): Limite de chamadas simultâneas ao Polly.
+            first_chunk_chars (int, optional): Tamanho máximo do primeiro chunk (padrão: TTS_FIRST_CHUNK_CHARS)
+            usage (dict, optional): Acumula 'billed_characters' e 'cached_characters' durante a iteração
+            
+        Yields:
+            bytes: Áudio de cada chunk, na ordem do texto (precedido do cabeçalho WAV para PCM)
+        """
+        final_voice_id, final_speed, final_use_neural = self._final_options(voice_id, speed, use_neural)
+        final_max_workers = max(1, max_workers or MAX_CONCURRENCY)
+        chunk_params = self._iter_chunk_params(text, final_voice_id, final_speed, final_use_neural, first_chunk_chars)
+        
+        # Sem o tamanho total, o cabeçalho (apenas PCM) é enviado com tamanho desconhecido
+        stitcher = self._new_stitcher()
+        header = stitcher.header()
+        if header:
+            yield header
+        
+        for chunk_data, timing in self._synthesize_chunks(chunk_params, final_max_workers):
+            if usage is not None:
+                self._character_usage(timing, timing['cache'], usage)
+            yield stitcher.feed(chunk_data)
+    
+    def synthesize_to_s3(self, text: str, bucket: str, key: Optional[str] = None, voice_id: Optional[str] = None,
+                         speed: Optional[str] = None, use_neural: Optional[bool] = None, s3_bucket=None,
+                         expiration: int = 3600, metadata: Optional[Dict] = None) -> Dict:
+        """
+        Sintetiza o texto enviando o áudio direto para o S3 (upload multipart), sem arquivo local,
+        e retorna uma URL pré-assinada para download
+        
+        Args:
+            text (str): Texto para conversão
+            bucket (str): Bucket S3 de destino
+            key (str, optional): Chave do objeto (padrão: nome único em tts-output/)
+            voice_id (str, optional): ID da voz a ser usada.
+            speed (str, optional): Velocidade da fala.
+            use_neural (bool, optional): Se deve usar o motor neural.
+            s3_bucket (S3BucketClass, optional): Cliente S3 já inicializado
+            expiration (int): Validade da URL pré-assinada em segundos
+            metadata (dict, optional): Metadados gravados no objeto
+            
+        Returns:
+            dict: Resultado da conversão com 'audio_url'
+        """
+        from services.s3bucket_services import S3BucketClass
+        
+        try:
+            start_time = time.time()
+            output_format = self.default_config['output_format']
+            container = self._new_stitcher()
+            key = key or 'tts-output/' + self._unique_filename('tts_audio', container.extension)
+            s3_bucket = s3_bucket or S3BucketClass()
+            
+            # Mede a duração de cada chunk enquanto ele é enviado
+            durations = []
+            usage = {'billed_characters': 0, 'cached_characters': 0}
+            def measured_chunks():
+                for chunk_data in self.iter_speech(text, voice_id=voice_id, speed=speed, use_neural=use_neural,
+                                                   first_chunk_chars=MAX_BILLED_CHARACTERS, usage=usage):
+                    durations.append(audio_duration(chunk_data, output_format, self.default_config['sample_rate']) or 0.0)
+                    yield chunk_data
+            
+            # O cabeçalho WAV (PCM) sai de iter_speech com tamanho desconhecido; o objeto final recebe
+            # os tamanhos reais antes de o upload ser concluído
+            finalize_head = None
+            header_size = len(container.header())
+            if header_size:
+                def finalize_head(head, total_size):
+                    return container.header(total_size - header_size) + head[header_size:]
+            
+            upload = s3_bucket.upload_stream(
+                measured_chunks(),
+                bucket,
+                key,
+                content_type=container.content_type,
+                metadata=metadata,
+                finalize_head=finalize_head
+            )
+            audio_url = s3_bucket.generate_presigned_url(bucket, key, expiration=expiration)
             
             return {
                 'success': True,
-                'file_path': file_path,
-                'filename': filename,
-                'file_size_bytes': total_size,
-                'file_size_mb': round(total_size / (1024 * 1024), 3),
-                'chunks_processed': len(chunks),
-                'voice_id': final_voice_id
+                'audio_url': audio_url,
+                'bucket': bucket,
+                'key': key,
+                'expires_in': expiration,
+                'file_size_bytes': upload['size'],
+                'file_size_mb': round(upload['size'] / (1024 * 1024), 3),
+                'upload_parts': upload['parts'],
+                'processing_time': round(time.time() - start_time, 2),
+                'duration': round(sum(durations), 2),
+                'voice_id': voice_id or self.default_config['voice_id'],
+                'output_format': output_format,
+                'billed_characters': usage['billed_characters'],
+                'cached_characters': usage['cached_characters']
             }
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return self._error_result(e)
     
-    def _split_text_for_streaming(self, text: str, max_length: int = 2500) -> list:
+    def synthesize(self, text: str, voice_id: Optional[str] = None, speed: Optional[str] = None,
+                   use_neural: Optional[bool] = None, task_bucket: Optional[str] = None,
+                   task_prefix: str = 'tts-tasks/', mode: str = 'auto', **sync_options) -> Dict:
         """
-        Divide texto em chunks para processamento streaming
+        Roteia a síntese pelo tamanho do texto: textos curtos são sintetizados na hora e textos
+        muito longos viram uma tarefa assíncrona do Polly, que grava o áudio direto no S3.
+        Textos acima do limite de uma tarefa seguem pela síntese síncrona em chunks
+        
+        Args:
+            text (str): Texto para conversão
+            voice_id (str, optional): ID da voz a ser usada.
+            speed (str, optional): Velocidade da fala.
+            use_neural (bool, optional): Se deve usar o motor neural.
+            task_bucket (str, optional): Bucket de saída das tarefas assíncronas (sem bucket, sempre síncrono)
+            task_prefix (str): Prefixo das chaves de saída das tarefas
+            mode (str): 'auto', 'sync' ou 'async'
+            **sync_options: Opções repassadas a text_to_speech (write_file, return_audio)
+            
+        Returns:
+            dict: Resultado de text_to_speech ('mode': 'sync') ou de start_speech_task ('mode': 'async')
         """
-        sentences = text.split('. ')
-        chunks = []
-        current_chunk = ""
+        if mode == 'async' or (mode == 'auto' and task_bucket and self.fits_speech_task(text)):
+            if not task_bucket:
+                return {'success': False, 'error': 'Asynchronous synthesis requires an output bucket',
+                        'error_type': 'general_error'}
+            return self.start_speech_task(text, task_bucket, task_prefix, voice_id=voice_id, speed=speed,
+                                          use_neural=use_neural)
         
-        for sentence in sentences:
-            if len(current_chunk + sentence) < max_length:
-                current_chunk += sentence + ". "
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
+        result = self.text_to_speech(text, voice_id=voice_id, speed=speed, use_neural=use_neural, **sync_options)
+        result['mode'] = 'sync'
+        return result
+    
+    def fits_speech_task(self, text: str) -> bool:
+        """
+        Se o texto deve ir para uma tarefa assíncrona no modo automático: acima de SYNC_MAX_CHARACTERS
+        e dentro do limite de caracteres cobrados de uma única tarefa
+        """
+        return SYNC_MAX_CHARACTERS < self.billed_characters(text.strip()) <= MAX_TASK_BILLED_CHARACTERS
+    
+    def start_speech_task(self, text: str, bucket: str, prefix: str = 'tts-tasks/', voice_id: Optional[str] = None,
+                          speed: Optional[str] = None, use_neural: Optional[bool] = None,
+                          sns_topic_arn: Optional[str] = None) -> Dict:
+        """
+        Inicia uma tarefa assíncrona do Polly (StartSpeechSynthesisTask) e retorna imediatamente
+        O áudio é gravado pelo próprio Polly no bucket informado
+        
+        Args:
+            text (str): Texto para conversão (até 100.000 caracteres cobrados)
+            bucket (str): Bucket S3 de saída (na mesma região do Polly)
+            prefix (str): Prefixo da chave de saída
+            voice_id (str, optional): ID da voz a ser usada.
+            speed (str, optional): Velocidade da fala.
+            use_neural (bool, optional): Se deve usar o motor neural.
+            sns_topic_arn (str, optional): Tópico SNS notificado ao fim da tarefa
+            
+        Returns:
+            dict: Identificador e status da tarefa, com a sugestão de espera para a primeira consulta
+        """
+        try:
+            final_voice_id, final_speed, final_use_neural = self._final_options(voice_id, speed, use_neural)
+            
+            processed_text = text.strip()
+            billed = self.billed_characters(processed_text)
+            if billed > MAX_TASK_BILLED_CHARACTERS:
+                return {'success': False, 'error_type': 'general_error',
+                        'error': f'Text has {billed} billed characters, above the {MAX_TASK_BILLED_CHARACTERS} task limit'}
+            
+            task_params = self._build_synthesis_params(processed_text, final_voice_id, final_speed, final_use_neural)
+            if len(task_params['Text']) > MAX_TASK_TOTAL_CHARACTERS:
+                return {'success': False, 'error_type': 'general_error',
+                        'error': f'Request has more than {MAX_TASK_TOTAL_CHARACTERS} characters'}
+            
+            task_params['OutputS3BucketName'] = bucket
+            task_params['OutputS3KeyPrefix'] = prefix
+            if sns_topic_arn:
+                task_params['SnsTopicArn'] = sns_topic_arn
+            
+            task = self.polly_client.start_speech_synthesis_task(**task_params)['SynthesisTask']
+            
+            return {
+                'success': True,
+                'mode': 'async',
+                'task_id': task['TaskId'],
+                'status': task['TaskStatus'],
+                'output_uri': task.get('OutputUri'),
+                'billed_characters': billed,
+                'poll_after': TASK_POLL_INITIAL_DELAY,
+                'voice_id': final_voice_id,
+                'engine': task_params['Engine']
+            }
+        except Exception as e:
+            return self._error_result(e)
+    
+    def get_speech_task_status(self, task_id: str, attempt: int = 0) -> Dict:
+        """
+        Consulta o status de uma tarefa assíncrona sem bloquear
         
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        Args:
+            task_id (str): Identificador retornado por start_speech_task
+            attempt (int): Número de consultas já feitas (define o backoff sugerido)
             
-        return chunks
+        Returns:
+            dict: Status ('scheduled', 'inProgress', 'completed', 'failed'), URI de saída e
+                  'poll_after' com a espera sugerida (backoff exponencial com jitter) até a próxima consulta
+        """
+        try:
+            task = self.polly_client.get_speech_synthesis_task(TaskId=task_id)['SynthesisTask']
+            status = task['TaskStatus']
+            
+            result = {
+                'success': True,
+                'task_id': task_id,
+                'status': status,
+                'done': status in ('completed', 'failed'),
+                'output_uri': task.get('OutputUri'),
+                'failure_reason': task.get('TaskStatusReason'),
+                'billed_characters': task.get('RequestCharacters')
+            }
+            if not result['done']:
+                delay = min(TASK_POLL_MAX_DELAY, TASK_POLL_INITIAL_DELAY * (2 ** attempt))
+                result['poll_after'] = round(random.uniform(delay / 2, delay), 2)
+            return result
+        except ClientError as e:
+            error_type = TASK_ERROR_TYPES.get(e.response.get('Error', {}).get('Code'), 'aws_error')
+            return {'success': False, 'error': str(e), 'error_type': error_type}
+        except BotoCoreError as e:
+            return {'success': False, 'error': str(e), 'error_type': 'aws_error', 'retryable': is_retryable_error(e)}
+    
+    def wait_for_speech_task(self, task_id: str, timeout: float = 600.0) -> Dict:
+        """
+        Aguarda a conclusão de uma tarefa assíncrona consultando o status com backoff
+        (uso local ou em workers; a Lambda deve preferir get_speech_task_status)
+        
+        Args:
+            task_id (str): Identificador retornado por start_speech_task
+            timeout (float): Tempo máximo de espera em segundos
+        """
+        deadline = time.time() + timeout
+        attempt = 0
+        while True:
+            status = self.get_speech_task_status(task_id, attempt)
+            if not status['success'] or status['done']:
+                return status
+            if time.time() + status['poll_after'] > deadline:
+                status['timed_out'] = True
+                return status
+            time.sleep(status['poll_after'])
+            attempt += 1
+    
+    @staticmethod
+    def billed_characters(text: str) -> int:
+        """
+        Conta os caracteres cobrados pelo Polly (tags SSML não são cobradas)
+        """
+        if text.lstrip().startswith('<speak'):
+            return len(SSML_TAG.sub('', text))
+        return len(text)
+    
+    def _character_usage(self, synthesis: Dict, cache_status: str, usage: Optional[Dict] = None) -> Dict:
+        """
+        Soma os caracteres de um chunk como cobrados (sintetizados pelo Polly) ou servidos do cache
+        
+        Args:
+            synthesis (dict): Parâmetros de synthesize_speech ou tempos do chunk (com 'billed_characters')
+            cache_status (str): Status do cache do chunk ('hit', 's3_hit', 'miss' ou 'disabled')
+            usage (dict, optional): Totais a atualizar (padrão: novos totais zerados)
+        """
+        if usage is None:
+            usage = {'billed_characters': 0, 'cached_characters': 0}
+        characters = synthesis.get('billed_characters')
+        if characters is None:
+            characters = self.billed_characters(synthesis['Text'])
+        field = 'cached_characters' if cache_status in ('hit', 's3_hit') else 'billed_characters'
+        usage[field] += characters
+        return usage
+    
+    def estimate_audio_bytes(self, text: str) -> int:
+        """
+        Estima o tamanho do áudio antes da síntese (usado para escolher a forma de entrega)
+        """
+        bytes_per_second = AUDIO_BYTES_PER_SECOND.get(self.default_config['output_format'], 6000)
+        return int(len(text) / SPEECH_CHARS_PER_SECOND * bytes_per_second)
+    
+    def _split_text_for_streaming(self, text: str, speed: str = 'medium', first_chunk_chars: Optional[int] = None,
+                                  lazy: bool = False):
+        """
+        Divide texto em chunks para processamento streaming
+        O envelope SSML de velocidade não é cobrado, mas conta no tamanho total da requisição
+        """
+        wrapper_length = 0
+        if speed != 'medium' and not self._is_ssml(text):
+            wrapper_length = len(f'<speak><prosody rate="{speed}"></prosody></speak>')
+        if lazy:
+            return iter_text_chunks(text, MAX_BILLED_CHARACTERS, MAX_TOTAL_CHARACTERS - wrapper_length,
+                                    first_chunk_chars=first_chunk_chars, target_chunk_chars=CHUNK_TARGET_CHARS)
+        return split_text(text, MAX_BILLED_CHARACTERS, MAX_TOTAL_CHARACTERS - wrapper_length,
+                          first_chunk_chars=first_chunk_chars, target_chunk_chars=CHUNK_TARGET_CHARS)
+    
+    @staticmethod
+    def _is_ssml(text: str) -> bool:
+        return text.lstrip().startswith('<speak')
     
     def cleanup_temp_files(self, max_age_minutes: int = 60) -> int:
         """
-        Remove arquivos temporários antigos
+        Remove arquivos temporários sem uso há mais de max_age_minutes e, se o orçamento
+        de TMP_DIR foi ultrapassado, os usados há mais tempo (ver utils.tmp_storage)
 
         Args:
             max_age_minutes (int): Idade máxima dos arquivos em minutos para serem mantidos
+
+        Returns:
+            int: Número de arquivos removidos
         """
-        try:
-            removed_count = 0
-            current_time = time.time()
-            max_age_seconds = max_age_minutes * 60
-            
-            # Remove only files created by this service
-            for filename in os.listdir(self.output_dir):
-
-                # Consider only files starting with 'tts_'
-                if filename.startswith('tts_'):
-                    file_path = os.path.join(self.output_dir, filename)
-                    file_age = current_time - os.path.getctime(file_path)
-                    
-                    # Remove files older than max_age_seconds
-                    if file_age > max_age_seconds:
-                        os.remove(file_path)
-                        removed_count += 1
-            
-            return removed_count
-        except Exception as e:
-            return 0
+        return self.storage.cleanup(max_age_seconds=max_age_minutes * 60)['removed']
+
+# Serviços compartilhados pelo processo (reaproveitados entre invocações "warm")
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_tts_service(region_name: str = 'us-east-1', output_dir: str = None) -> TTSPollyService:
+    """
+    Retorna o TTSPollyService da região/diretório informados, criando-o apenas uma vez por processo
+    
+    Args:
+        region_name (str): Região AWS para o serviço Polly
+        output_dir (str): Diretório para salvar arquivos de áudio (padrão: /tmp)
+    """
+    key = (region_name, output_dir or "/tmp")
+    service = _services.get(key)
+    if service is None:
+        with _services_lock:
+            service = _services.get(key)
+            if service is None:
+                service = TTSPollyService(region_name=region_name, output_dir=output_dir)
+                _services[key] = service
+    return service
 
 # --- FIX 4: Update quick_tts to pass arguments correctly ---
 def quick_tts(text: str, voice: str = 'Joanna', speed: str = 'medium') -> str:
@@ -239,7 +986,7 @@ def quick_tts(text: str, voice: str = 'Joanna', speed: str = 'medium') -> str:
     Função rápida para TTS simples
     """
     try:
-        tts = TTSPollyService()
+        tts = get_tts_service()
         # The method now correctly accepts these named arguments
         result = tts.text_to_speech(text=text, voice_id=voice, speed=speed)
         
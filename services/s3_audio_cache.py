@@ -0,0 +1,338 @@
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from botocore.exceptions import BotoCoreError, ClientError
+
+from services.s3bucket_services import S3BucketClass
+from utils import telemetry
+
+# Content-Type gravado para cada formato de saída do Polly
+CONTENT_TYPES = {
+    'mp3': 'audio/mpeg',
+    'ogg_vorbis': 'audio/ogg',
+    'pcm': 'audio/pcm',
+    'json': 'application/x-json-stream'
+}
+
+
+class S3AudioCache:
+    """
+    Cache de áudio de segundo nível no S3, compartilhado entre instâncias da Lambda
+    Os objetos são endereçados pela mesma chave do cache local (hash dos parâmetros de síntese)
+    """
+
+    def __init__(self, bucket: str, prefix: str = 'tts-cache/', ttl_seconds: Optional[int] = None,
+                 s3_bucket: Optional[S3BucketClass] = None, index_flush_every: int = 20):
+        """
+        Inicializa o cache no S3
+
+        Args:
+            bucket (str): Nome do bucket S3 do cache
+            prefix (str): Prefixo das chaves do cache no bucket
+            ttl_seconds (int, optional): Validade das entradas em segundos (None = sem expiração)
+            s3_bucket (S3BucketClass, optional): Cliente S3 já inicializado
+            index_flush_every (int): Número de alterações pendentes que dispara a gravação do índice
+        """
+        self.bucket = bucket
+        self.prefix = prefix if not prefix or prefix.endswith('/') else prefix + '/'
+        self.ttl_seconds = ttl_seconds
+        self.s3_bucket = s3_bucket or S3BucketClass()
+        self.index_key = f"{self.prefix}_index.json"
+        self.index_flush_every = index_flush_every
+
+        # Gravações em background (um único worker mantém a ordem das gravações)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='s3-audio-cache')
+        self._pending = []
+
+        # Alterações do índice ainda não gravadas no S3
+        self._lock = threading.Lock()
+        self._pending_entries = {}
+        self._pending_hits = {}
+        self._pending_misses = 0
+        self._pending_changes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        # Última remoção das entradas expiradas nesta instância
+        self._purged_at = 0.0
+
+    def object_key(self, key: str) -> str:
+        """
+        Retorna a chave do objeto S3 para uma chave de cache
+        """
+        return f"{self.prefix}audio/{key}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Obtém o áudio do cache S3, verificando existência e validade com uma requisição HEAD
+
+        Args:
+            key (str): Chave gerada por synthesis_cache_key
+
+        Returns:
+            bytes: Conteúdo do áudio, ou None em caso de miss, expiração ou erro
+        """
+        object_key = self.object_key(key)
+        try:
+            head = self.s3_bucket.head_object(self.bucket, object_key)
+            if head is None or self._is_expired(head):
+                self._record_miss()
+                return None
+
+            response = self.s3_bucket.get_object(self.bucket, object_key)
+            data = response['Body'].read()
+
+        except (BotoCoreError, ClientError) as e:
+            # Falhas do cache nunca devem impedir a síntese
+            telemetry.debug(f"S3 cache lookup failed for {object_key}: {e}")
+            self._record_miss()
+            return None
+
+        self._record_hit(key)
+        return data
+
+    def put_async(self, key: str, data: bytes, output_format: str = 'mp3'):
+        """
+        Agenda a gravação do áudio no cache S3 em background
+
+        Args:
+            key (str): Chave gerada por synthesis_cache_key
+            data (bytes): Conteúdo do áudio
+            output_format (str): Formato do áudio (define o Content-Type)
+        """
+        future = self._executor.submit(self._put, key, data, output_format)
+        with self._lock:
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(future)
+
+    def _put(self, key: str, data: bytes, output_format: str):
+        created_at = int(time.time())
+        try:
+            self.s3_bucket.put_bytes(
+                data,
+                self.bucket,
+                self.object_key(key),
+                content_type=CONTENT_TYPES.get(output_format, 'application/octet-stream'),
+                metadata={'created-at': str(created_at)}
+            )
+        except (BotoCoreError, ClientError) as e:
+            telemetry.debug(f"S3 cache write failed for {key}: {e}")
+            return
+
+        with self._lock:
+            self._pending_entries[key] = {'size': len(data), 'created': created_at, 'format': output_format}
+            self._pending_changes += 1
+            should_flush = self._pending_changes >= self.index_flush_every
+            if should_flush:
+                self._pending_changes = 0
+
+        if should_flush:
+            self._flush_index()
+
+    def _is_expired(self, head: Dict) -> bool:
+        if not self.ttl_seconds:
+            return False
+        created_at = head.get('Metadata', {}).get('created-at')
+        if created_at is not None:
+            created = float(created_at)
+        else:
+            created = head['LastModified'].timestamp()
+        return time.time() - created > self.ttl_seconds
+
+    def _record_hit(self, key: str):
+        with self._lock:
+            self.hits += 1
+            self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+            self._pending_changes += 1
+            if self._pending_changes < self.index_flush_every:
+                return
+            # O contador é zerado aqui para que apenas uma gravação do índice seja agendada
+            self._pending_changes = 0
+            self._pending.append(self._executor.submit(self._flush_index))
+
+    def _record_miss(self):
+        with self._lock:
+            self.misses += 1
+            self._pending_misses += 1
+
+    def load_index(self) -> Dict:
+        """
+        Lê o objeto de índice do cache (entradas, tamanhos e contadores de acerto)
+
+        Returns:
+            dict: Índice do cache, vazio se ainda não existir
+        """
+        try:
+            head = self.s3_bucket.head_object(self.bucket, self.index_key)
+            if head is None:
+                return {'entries': {}, 'hits': 0, 'misses': 0}
+            response = self.s3_bucket.get_object(self.bucket, self.index_key)
+            return json.loads(response['Body'].read())
+        except (BotoCoreError, ClientError, ValueError) as e:
+            telemetry.debug(f"S3 cache index could not be read: {e}")
+            return {'entries': {}, 'hits': 0, 'misses': 0}
+
+    def _flush_index(self):
+        """
+        Mescla as alterações pendentes no objeto de índice do S3 (HEAD + GET + PUT do índice inteiro)
+        O índice é aproximado: gravações concorrentes de outras instâncias podem se sobrepor, por isso
+        ele só é gravado a cada index_flush_every alterações e no evento warmup
+
+        Os misses acumulados são gravados junto com as outras alterações, nunca sozinhos
+        """
+        with self._lock:
+            if not self._pending_entries and not self._pending_hits:
+                return
+            entries, self._pending_entries = self._pending_entries, {}
+            hits, self._pending_hits = self._pending_hits, {}
+            misses, self._pending_misses = self._pending_misses, 0
+            self._pending_changes = 0
+
+        index = self.load_index()
+        index_entries = index.setdefault('entries', {})
+        for key, entry in entries.items():
+            entry['hits'] = index_entries.get(key, {}).get('hits', 0)
+            index_entries[key] = entry
+        for key, count in hits.items():
+            if key in index_entries:
+                index_entries[key]['hits'] = index_entries[key].get('hits', 0) + count
+        index['hits'] = index.get('hits', 0) + sum(hits.values())
+        index['misses'] = index.get('misses', 0) + misses
+        index['size_bytes'] = sum(entry.get('size', 0) for entry in index_entries.values())
+        index['updated'] = int(time.time())
+
+        try:
+            self.s3_bucket.put_bytes(json.dumps(index).encode('utf-8'), self.bucket, self.index_key,
+                                     content_type='application/json')
+        except (BotoCoreError, ClientError) as e:
+            telemetry.debug(f"S3 cache index write failed: {e}")
+
+    def flush(self, timeout: Optional[float] = None, write_index: bool = False) -> bool:
+        """
+        Aguarda as gravações pendentes dos áudios (e do índice, se index_flush_every foi atingido)
+
+        Na Lambda deve ser chamado antes de a resposta ser devolvida: depois dela a instância pode
+        ser congelada com gravações ainda na fila do worker. O índice só é gravado aqui com
+        write_index=True (evento warmup), pois sua gravação custa O(tamanho do índice)
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera em segundos (para todas as gravações)
+            write_index (bool): Se deve gravar também as alterações pendentes do índice
+
+        Returns:
+            bool: False se o tempo se esgotou antes do fim das gravações (elas continuam na fila)
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            # O worker é único: o índice é gravado depois dos objetos pendentes
+            if write_index:
+                pending.append(self._executor.submit(self._flush_index))
+        if not pending:
+            return True
+        _, not_done = wait(pending, timeout=timeout)
+        if not_done:
+            with self._lock:
+                self._pending.extend(not_done)
+            telemetry.debug(f"S3 cache flush timed out with {len(not_done)} writes pending")
+            return False
+        return True
+
+    def expired_keys(self, index: Optional[Dict] = None) -> List[str]:
+        """
+        Lista as chaves expiradas consultando apenas o índice (sem LIST no prefixo)
+
+        Args:
+            index (dict, optional): Índice já carregado
+
+        Returns:
+            list: Chaves de cache expiradas
+        """
+        if not self.ttl_seconds:
+            return []
+        index = index if index is not None else self.load_index()
+        limit = time.time() - self.ttl_seconds
+        return [key for key, entry in index.get('entries', {}).items() if entry.get('created', 0) < limit]
+
+    def purge_expired(self) -> int:
+        """
+        Remove do bucket as entradas expiradas e atualiza o índice
+
+        Returns:
+            int: Número de objetos removidos
+        """
+        self.flush(write_index=True)
+        index = self.load_index()
+        expired = {self.object_key(key): key for key in self.expired_keys(index)}
+        self._purged_at = time.time()
+
+        removed = 0
+        for batch in self.s3_bucket.delete_objects(self.bucket, list(expired)):
+            failed = {error['Key'] for error in batch['errors']}
+            removed += batch['deleted']
+            for object_key in batch['keys']:
+                if object_key not in failed:
+                    index['entries'].pop(expired[object_key], None)
+
+        if removed:
+            index['size_bytes'] = sum(entry.get('size', 0) for entry in index['entries'].values())
+            index['updated'] = int(time.time())
+            self.s3_bucket.put_bytes(json.dumps(index).encode('utf-8'), self.bucket, self.index_key,
+                                     content_type='application/json')
+        return removed
+
+    def maybe_purge_expired(self, min_interval_seconds: float) -> Optional[int]:
+        """
+        Executa purge_expired se a última remoção nesta instância foi há mais de min_interval_seconds
+
+        Returns:
+            int: Número de objetos removidos, ou None se a remoção não era necessária
+        """
+        if not self.ttl_seconds or time.time() - self._purged_at < min_interval_seconds:
+            return None
+        return self.purge_expired()
+
+    def stats(self) -> Dict:
+        """
+        Retorna estatísticas de uso do cache nesta instância
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'pending_writes': len(self._pending)}
+
+
+# Caches S3 compartilhados pelo processo (reaproveitam cliente e worker entre invocações)
+_s3_caches = {}
+_s3_caches_lock = threading.Lock()
+
+
+def get_s3_cache(bucket: str, prefix: str = 'tts-cache/', ttl_seconds: Optional[int] = None) -> S3AudioCache:
+    """
+    Retorna o cache S3 do bucket/prefixo informado, criando-o apenas uma vez por processo
+
+    Args:
+        bucket (str): Nome do bucket S3 do cache
+        prefix (str): Prefixo das chaves do cache no bucket
+        ttl_seconds (int, optional): Validade das entradas em segundos
+    """
+    with _s3_caches_lock:
+        cache = _s3_caches.get((bucket, prefix))
+        if cache is None:
+            cache = S3AudioCache(bucket, prefix=prefix, ttl_seconds=ttl_seconds)
+            _s3_caches[(bucket, prefix)] = cache
+        else:
+            cache.ttl_seconds = ttl_seconds
+        return cache
+
+
+def flush_s3_caches(timeout: Optional[float] = None) -> bool:
+    """
+    Aguarda as gravações pendentes de todos os caches S3 do processo (ver S3AudioCache.flush)
+
+    Returns:
+        bool: False se alguma gravação não terminou dentro do tempo
+    """
+    with _s3_caches_lock:
+        caches = list(_s3_caches.values())
+    return all([cache.flush(timeout) for cache in caches])
@@ -1,32 +1,100 @@
-# +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+ #
-# RUN LOCALY
-from utils.check_aws import AWS_SERVICES
+import os
+import hashlib
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from botocore.exceptions import BotoCoreError, ClientError
 
-aws_services = AWS_SERVICES()
+from utils.client_registry import get_client
+from utils import telemetry
 
-session = aws_services.login_session_AWS()
+# Tamanho das partes do upload multipart (mínimo do S3: 5 MB, exceto a última parte)
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
 
-# +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+ #
+# Transferências em lote: arquivos simultâneos e conexões por arquivo
+# (arquivos x conexões não deve passar de AWS_MAX_POOL_CONNECTIONS do cliente compartilhado)
+TRANSFER_MAX_WORKERS = int(os.getenv('TTS_S3_TRANSFER_WORKERS', '8'))
+TRANSFER_FILE_CONCURRENCY = int(os.getenv('TTS_S3_TRANSFER_FILE_CONCURRENCY', '4'))
+
+# Chaves por requisição DeleteObjects (máximo do S3)
+DELETE_BATCH_SIZE = 1000
+
+# Configuração de transferência compartilhada pelo processo (criada no primeiro uso)
+_transfer_config = None
+
+
+def get_transfer_config():
+    """
+    Retorna o TransferConfig usado em upload_file/download_file
+    As partes têm o mesmo tamanho de MULTIPART_PART_SIZE, o que permite calcular o ETag localmente
+    """
+    global _transfer_config
+    if _transfer_config is None:
+        from boto3.s3.transfer import TransferConfig
+        _transfer_config = TransferConfig(multipart_threshold=MULTIPART_PART_SIZE,
+                                          multipart_chunksize=MULTIPART_PART_SIZE,
+                                          max_concurrency=TRANSFER_FILE_CONCURRENCY,
+                                          use_threads=TRANSFER_FILE_CONCURRENCY > 1)
+    return _transfer_config
+
+
+def local_etag(file_path: str, part_size: int = MULTIPART_PART_SIZE) -> str:
+    """
+    Calcula o ETag que o S3 atribui ao arquivo enviado com get_transfer_config()
+    (MD5 do conteúdo, ou MD5 dos MD5 das partes seguido de '-<partes>' no upload multipart)
+
+    Objetos criptografados com SSE-KMS ou enviados com outro tamanho de parte têm outro ETag;
+    nesses casos o arquivo é apenas transferido de novo.
+    """
+    digests = []
+    size = 0
+    with open(file_path, 'rb') as local_file:
+        while True:
+            block = local_file.read(part_size)
+            if not block:
+                break
+            size += len(block)
+            digests.append(hashlib.md5(block).digest())
+
+    if size < part_size:
+        return f'"{(digests[0] if digests else hashlib.md5().digest()).hex()}"'
+    return f'"{hashlib.md5(b"".join(digests)).hexdigest()}-{len(digests)}"'
+
+
+def is_unchanged(file_path: str, remote: Optional[Dict]) -> bool:
+    """
+    Verifica se o arquivo local tem o mesmo conteúdo do objeto (tamanho e, se igual, ETag)
+
+    Args:
+        file_path (str): Caminho do arquivo local
+        remote (dict, optional): Objeto da listagem ('Size' e 'ETag'), ou None se não existir
+    """
+    if remote is None:
+        return False
+    try:
+        if os.path.getsize(file_path) != remote['Size']:
+            return False
+        return local_etag(file_path) == remote['ETag']
+    except FileNotFoundError:
+        return False
 
-import os
-import boto3
-from typing import Optional
-from botocore.exceptions import ClientError
 
 class S3BucketClass: 
-    def __init__(self):
+    def __init__(self, region_name: str = 'ca-central-1', download_path: str = None):
         """
         Construtor da classe S3BucketClass que inicializa o cliente S3 da sessão.
+
+        Args:
+            region_name (str): Região AWS do bucket S3
+            download_path (str, optional): Diretório local dos downloads (padrão: TMP_DIR ou ./tmp/)
         """
 
-        # Cria uma sessão AWS usando as credenciais configuradas
-        self.s3_client = session.client('s3', region_name='ca-central-1')
+        # Cliente S3 compartilhado pelo processo (sessão e conexões reaproveitadas)
+        self.s3_client = get_client('s3', region_name)
 
         # Define o caminho de download para os arquivos baixados do S3
-        self.download_path = './tmp/' 
-
-        # Cria o diretório de download se não existir
-        os.makedirs(self.download_path, exist_ok=True)
+        # (os diretórios são criados apenas no download, já que /var/task é somente leitura na Lambda)
+        self.download_path = download_path or os.getenv('TMP_DIR', './tmp/')
     
     def upload_file(self, file_path: str, bucket: str, key: str) -> bool:
         """
@@ -43,7 +111,7 @@ class S3BucketClass:
             return True
         
         except ClientError as e:
-            print(f"[DEBUG] Erro ao fazer upload do arquivo para o S3: {e}")
+            telemetry.debug(f"Erro ao fazer upload do arquivo para o S3: {e}")
             raise
     
     def download_file(self, bucket: str, key: str, filename : str = None) -> bool:
@@ -72,7 +140,7 @@ class S3BucketClass:
             return file_path
         
         except ClientError as e:
-            print(f"[DEBUG] Erro ao fazer download do arquivo do S3: {e}")
+            telemetry.debug(f"Erro ao fazer download do arquivo do S3: {e}")
             raise e
               
     def delete_object(self, bucket: str, key: str) -> bool:
@@ -89,7 +157,7 @@ class S3BucketClass:
             return True
         
         except ClientError as e:
-            print(f"[DEBUG] Erro ao deletar objeto do S3: {e}")
+            telemetry.debug(f"Erro ao deletar objeto do S3: {e}")
             raise e
     
     def get_object(self, bucket: str, key: str) -> Optional[dict]:
@@ -105,24 +173,156 @@ class S3BucketClass:
             return response
         
         except ClientError as e:
-            print(f"[DEBUG] Erro ao obter objeto do S3: {e}")
+            telemetry.debug(f"Erro ao obter objeto do S3: {e}")
             raise
     
-    def generate_presigned_url(self, bucket: str, key: str) -> str:
+    def head_object(self, bucket: str, key: str) -> Optional[dict]:
+        """
+        Obter os metadados de um objeto (requisição HEAD) sem baixar o conteúdo
+
+        Args:
+            bucket (str): Nome do bucket S3
+            key (str): Nome do arquivo
+
+        Returns:
+            dict: Metadados do objeto, ou None se o objeto não existir
+        """
+        try:
+            return self.s3_client.head_object(Bucket=bucket, Key=key)
+        
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            telemetry.debug(f"Erro ao obter metadados do objeto do S3: {e}")
+            raise
+    
+    def put_bytes(self, data: bytes, bucket: str, key: str, content_type: str = None, metadata: dict = None) -> bool:
+        """
+        Função para gravar um conteúdo em memória diretamente como objeto no bucket S3
+
+        Args:
+            data (bytes): Conteúdo a ser gravado
+            bucket (str): Nome do bucket S3
+            key (str): Nome do arquivo no bucket
+            content_type (str, optional): Content-Type do objeto
+            metadata (dict, optional): Metadados do objeto
+        """
+        params = {'Bucket': bucket, 'Key': key, 'Body': data}
+        if content_type:
+            params['ContentType'] = content_type
+        if metadata:
+            params['Metadata'] = metadata
+
+        try:
+            self.s3_client.put_object(**params)
+            return True
+        
+        except ClientError as e:
+            telemetry.debug(f"Erro ao gravar objeto no S3: {e}")
+            raise
+    
+    def upload_stream(self, chunks: Iterable[bytes], bucket: str, key: str, content_type: str = None,
+                      part_size: int = MULTIPART_PART_SIZE, metadata: dict = None,
+                      finalize_head: Optional[Callable[[bytes, int], bytes]] = None) -> dict:
+        """
+        Função para enviar um fluxo de bytes para o bucket S3 sem arquivo local
+        Conteúdos menores que uma parte usam um único PUT; os demais usam upload multipart,
+        mantendo em memória apenas uma parte por vez (duas com finalize_head)
+
+        Args:
+            chunks (iterable): Pedaços de bytes a serem enviados, em ordem
+            bucket (str): Nome do bucket S3
+            key (str): Nome do arquivo no bucket
+            content_type (str, optional): Content-Type do objeto
+            part_size (int): Tamanho de cada parte do upload multipart em bytes
+            metadata (dict, optional): Metadados do objeto
+            finalize_head (callable, optional): Recebe a primeira parte e o tamanho total e retorna a
+                primeira parte reescrita, do mesmo tamanho (ex.: cabeçalho WAV com os tamanhos reais).
+                A primeira parte é retida e enviada por último
+
+        Returns:
+            dict: Bucket, chave, tamanho total e número de partes enviadas
+        """
+        buffer = bytearray()
+        upload_id = None
+        parts = []
+        total_size = 0
+        first_part = None
+
+        try:
+            for chunk in chunks:
+                buffer += chunk
+                total_size += len(chunk)
+
+                while len(buffer) >= part_size:
+                    if upload_id is None:
+                        params = {'Bucket': bucket, 'Key': key}
+                        if content_type:
+                            params['ContentType'] = content_type
+                        if metadata:
+                            params['Metadata'] = metadata
+                        upload_id = self.s3_client.create_multipart_upload(**params)['UploadId']
+
+                    if finalize_head is not None and first_part is None:
+                        first_part = bytes(buffer[:part_size])
+                    else:
+                        part_number = len(parts) + (2 if first_part is not None else 1)
+                        response = self.s3_client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id,
+                                                              PartNumber=part_number, Body=bytes(buffer[:part_size]))
+                        parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+                    del buffer[:part_size]
+
+            if upload_id is None:
+                # Conteúdo pequeno: um único PUT é mais rápido que o multipart
+                body = bytes(buffer)
+                if finalize_head is not None:
+                    body = finalize_head(body, total_size)
+                self.put_bytes(body, bucket, key, content_type=content_type, metadata=metadata)
+                return {'bucket': bucket, 'key': key, 'size': total_size, 'parts': 1}
+
+            if buffer:
+                part_number = len(parts) + (2 if first_part is not None else 1)
+                response = self.s3_client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id,
+                                                      PartNumber=part_number, Body=bytes(buffer))
+                parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+
+            if first_part is not None:
+                # As partes podem ser enviadas em qualquer ordem: a primeira vai com o tamanho total já conhecido
+                response = self.s3_client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=1,
+                                                      Body=finalize_head(first_part, total_size))
+                parts.insert(0, {'ETag': response['ETag'], 'PartNumber': 1})
+
+            self.s3_client.complete_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id,
+                                                     MultipartUpload={'Parts': parts})
+            return {'bucket': bucket, 'key': key, 'size': total_size, 'parts': len(parts)}
+
+        except Exception as e:
+            # Aborta o multipart para não deixar partes órfãs cobradas no bucket
+            if upload_id is not None:
+                try:
+                    self.s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+                except (BotoCoreError, ClientError) as abort_error:
+                    telemetry.debug(f"Erro ao abortar upload multipart no S3: {abort_error}")
+            telemetry.debug(f"Erro ao enviar fluxo de bytes para o S3: {e}")
+            raise
+
+    def generate_presigned_url(self, bucket: str, key: str, expiration: int = 3600) -> str:
         """
         Gerar uma URL pré-assinada para um objeto no bucket S3
 
         Args:
             bucket (str): Nome do bucket S3
             key (str): Nome do arquivo
+            expiration (int): Tempo de expiração da URL em segundos
         """
         try:
             # Gerar URL pré-assinada para o objeto no bucket S3
-            presigned_url = self.s3_client.generate_presigned_url('get_object', Params={'Bucket': bucket, 'Key': key})
+            presigned_url = self.s3_client.generate_presigned_url('get_object', Params={'Bucket': bucket, 'Key': key},
+                                                                  ExpiresIn=expiration)
             return presigned_url
        
         except ClientError as e:
-            print(f"[DEBUG] Error generating presigned URL: {e}")
+            telemetry.debug(f"Error generating presigned URL: {e}")
 
 
     def create_presigned_post(self, bucket, object_name,
@@ -148,87 +348,311 @@ class S3BucketClass:
                                                         Conditions=conditions,
                                                         ExpiresIn=expiration)
         except ClientError as e:
-            print(f"[DEBUG] Error generating presigned POST URL: {e}")
+            telemetry.debug(f"Error generating presigned POST URL: {e}")
 
         # The response contains the presigned URL and required fields
         return response
     
-    def upload_dir(self, bucket: str, key: str, dir_path: str):
+    @staticmethod
+    def _run_parallel(items: Iterable, action: Callable[..., Dict], max_workers: Optional[int] = None,
+                      progress: Optional[Callable[[Dict, Dict], None]] = None) -> Iterator[Dict]:
+        """
+        Executa a ação de cada item em um pool limitado de threads, entregando os resultados
+        conforme terminam. Apenas uma janela de itens fica em andamento, então os itens podem
+        vir de um gerador sem que a lista completa seja montada.
+
+        Args:
+            items (iterable): Itens a processar (argumentos da ação)
+            action (callable): Função que processa um item e retorna o resultado (dict com 'status')
+            max_workers (int, optional): Ações simultâneas (padrão: TTS_S3_TRANSFER_WORKERS)
+            progress (callable, optional): Chamada a cada item concluído com (resultado, totais)
+
+        Yields:
+            dict: Resultado de cada item
+        """
+        max_workers = max(1, max_workers or TRANSFER_MAX_WORKERS)
+        totals = {'completed': 0, 'bytes': 0}
+
+        def report(result: Dict) -> Dict:
+            totals['completed'] += 1
+            totals[result['status']] = totals.get(result['status'], 0) + 1
+            if result['status'] in ('uploaded', 'downloaded'):
+                totals['bytes'] += result.get('size', 0)
+            if progress is not None:
+                progress(result, dict(totals))
+            return result
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='s3-transfer') as executor:
+            in_flight = set()
+            try:
+                for item in items:
+                    in_flight.add(executor.submit(action, item))
+                    if len(in_flight) >= max_workers * 2:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield report(future.result())
+
+                while in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield report(future.result())
+            finally:
+                # Gerador abandonado: não inicia os itens restantes
+                for future in in_flight:
+                    future.cancel()
+
+    def _remote_index(self, bucket: str, prefix: str) -> Dict[str, Dict]:
+        """
+        Tamanho e ETag dos objetos do prefixo (uma listagem a cada 1000 objetos em vez de um HEAD por arquivo)
+        """
+        return {obj['Key']: {'Size': obj['Size'], 'ETag': obj['ETag']} for obj in self.iter_objects(bucket, prefix)}
+
+    def upload_dir(self, bucket: str, key: str, dir_path: str, max_workers: Optional[int] = None,
+                   skip_unchanged: bool = True, progress: Optional[Callable[[Dict, Dict], None]] = None) -> List[Dict]:
         """
         Função para fazer upload de um diretório para o bucket S3
+        Os arquivos são enviados em paralelo e os que já existem no bucket com o mesmo
+        tamanho e ETag não são enviados de novo
 
         Args:
             bucket (str): Nome do bucket S3
-            key (str): Nome do arquivo no bucket
+            key (str): Prefixo das chaves no bucket (a estrutura de subdiretórios é mantida)
             dir_path (str): Caminho do diretório a ser enviado
+            max_workers (int, optional): Arquivos enviados simultaneamente (padrão: TTS_S3_TRANSFER_WORKERS)
+            skip_unchanged (bool): Se deve pular arquivos iguais aos do bucket
+            progress (callable, optional): Chamada a cada arquivo concluído com (resultado, totais)
+
+        Returns:
+            list: Resultado de cada arquivo (key, path, status 'uploaded', 'skipped' ou 'failed', size, error)
         """
+        prefix = key.rstrip('/') + '/' if key else ''
         try:
-            # Upload do diretório para o bucket S3
+            remote = self._remote_index(bucket, prefix) if skip_unchanged else {}
+        except ClientError as e:
+            telemetry.debug(f"Erro ao listar o destino do upload no S3: {e}")
+            raise
+
+        def local_files() -> Iterator[tuple]:
             for root, _, files in os.walk(dir_path):
                 for file in files:
                     file_path = os.path.join(root, file)
-                    key_path = os.path.join(key, file)
-                    self.s3_client.upload_file(file_path, bucket, key_path)
-            return True
-        
-        except ClientError as e:
-            print(f"[DEBUG] Erro ao fazer upload do diretório para o S3: {e}")
-            raise e 
+                    relative_path = os.path.relpath(file_path, dir_path).replace(os.sep, '/')
+                    yield file_path, prefix + relative_path
+
+        config = get_transfer_config()
+
+        def upload(item: tuple) -> Dict:
+            file_path, key_path = item
+            result = {'key': key_path, 'path': file_path}
+            try:
+                result['size'] = os.path.getsize(file_path)
+                if skip_unchanged and is_unchanged(file_path, remote.get(key_path)):
+                    result['status'] = 'skipped'
+                    return result
+                self.s3_client.upload_file(file_path, bucket, key_path, Config=config)
+                result['status'] = 'uploaded'
+            except (BotoCoreError, ClientError, OSError) as e:
+                telemetry.debug(f"Erro ao fazer upload do arquivo {file_path} para o S3: {e}")
+                result.update({'status': 'failed', 'error': str(e)})
+            return result
+
+        return list(self._run_parallel(local_files(), upload, max_workers, progress))
     
-    def download_all_files(self, bucket: str, prefix: str = '', sufix: str = '') -> list:
+    def iter_objects(self, bucket: str, prefix: str = '', sufix: str = '', delimiter: Optional[str] = None,
+                     start_after: Optional[str] = None, continuation_token: Optional[str] = None,
+                     page_size: int = 1000, on_page: Optional[Callable[[Optional[str]], None]] = None) -> Iterator[Dict]:
+        """
+        Percorre os objetos do bucket página a página, sem montar a lista completa
+        Apenas uma página (até page_size objetos) fica em memória por vez
+
+        Args:
+            bucket (str): Nome do bucket S3
+            prefix (str, optional): Prefixo para filtrar os objetos. Defaults to ''.
+            sufix (str, optional): Sufixo para filtrar os objetos. Defaults to ''.
+            delimiter (str, optional): Delimitador (ex.: '/'): lista apenas o nível do prefixo, sem "subpastas"
+            start_after (str, optional): Começa depois desta chave
+            continuation_token (str, optional): Token de uma listagem anterior (retoma a partir dele)
+            page_size (int): Objetos por requisição (máximo do S3: 1000)
+            on_page (callable, optional): Chamada ao fim de cada página com o token da próxima
+                (None na última); guardar o token permite retomar a listagem depois
+
+        Yields:
+            dict: Objetos da listagem (Key, Size, ETag, LastModified...)
+        """
+        for page in self._iter_pages(bucket, prefix, delimiter, start_after, continuation_token, page_size):
+            for obj in page.get('Contents', ()):
+                key = obj['Key']
+                # Ignora "pastas" (objetos que terminam com /)
+                if key.endswith('/'):
+                    continue
+
+                # Verifica se o arquivo termina com o sufixo especificado (se fornecido)
+                if sufix and not key.endswith(sufix):
+                    continue
+
+                yield obj
+
+            if on_page is not None:
+                on_page(page.get('NextContinuationToken'))
+
+    def iter_prefixes(self, bucket: str, prefix: str = '', delimiter: str = '/') -> Iterator[str]:
+        """
+        Percorre as "subpastas" diretas do prefixo (CommonPrefixes da listagem com delimitador)
+
+        Args:
+            bucket (str): Nome do bucket S3
+            prefix (str, optional): Prefixo pai. Defaults to ''.
+            delimiter (str): Delimitador das "pastas"
+
+        Yields:
+            str: Prefixos encontrados (terminados pelo delimitador)
+        """
+        for page in self._iter_pages(bucket, prefix, delimiter):
+            for common_prefix in page.get('CommonPrefixes', ()):
+                yield common_prefix['Prefix']
+
+    def _iter_pages(self, bucket: str, prefix: str = '', delimiter: Optional[str] = None,
+                    start_after: Optional[str] = None, continuation_token: Optional[str] = None,
+                    page_size: int = 1000) -> Iterator[Dict]:
+        """
+        Páginas do list_objects_v2, seguindo NextContinuationToken até o fim
+        (páginas sem 'Contents' não encerram a listagem: com delimitador, uma página pode ter apenas prefixos)
+        """
+        params = {'Bucket': bucket, 'Prefix': prefix, 'MaxKeys': page_size}
+        if delimiter:
+            params['Delimiter'] = delimiter
+        if start_after:
+            params['StartAfter'] = start_after
+        if continuation_token:
+            params['ContinuationToken'] = continuation_token
+
+        try:
+            while True:
+                page = self.s3_client.list_objects_v2(**params)
+                yield page
+                if not page.get('IsTruncated'):
+                    return
+                params['ContinuationToken'] = page['NextContinuationToken']
+
+        except ClientError as e:
+            telemetry.debug(f"Erro ao listar arquivos do S3: {e}")
+            raise
+
+    def download_objects(self, bucket: str, objects: Iterable[Dict], max_workers: Optional[int] = None,
+                         skip_unchanged: bool = True,
+                         progress: Optional[Callable[[Dict, Dict], None]] = None) -> Iterator[Dict]:
+        """
+        Baixa em paralelo os objetos recebidos (ex.: de iter_objects) para download_path,
+        entregando o resultado de cada arquivo assim que ele termina
+        Arquivos locais com o mesmo tamanho e ETag do objeto não são baixados de novo
+
+        Args:
+            bucket (str): Nome do bucket S3
+            objects (iterable): Objetos com 'Key' (e 'Size'/'ETag' para pular arquivos iguais)
+            max_workers (int, optional): Downloads simultâneos (padrão: TTS_S3_TRANSFER_WORKERS)
+            skip_unchanged (bool): Se deve pular arquivos locais iguais aos do bucket
+            progress (callable, optional): Chamada a cada arquivo concluído com (resultado, totais)
+
+        Yields:
+            dict: Resultado de cada arquivo (key, path, status 'downloaded', 'skipped' ou 'failed', size, error)
+        """
+        config = get_transfer_config()
+        created_dirs = set()
+        created_dirs_lock = threading.Lock()
+
+        def download(obj: Dict) -> Dict:
+            local_filepath = os.path.join(self.download_path, obj['Key'])
+            result = {'key': obj['Key'], 'path': local_filepath, 'size': obj.get('Size', 0)}
+            try:
+                if skip_unchanged and 'ETag' in obj and is_unchanged(local_filepath, obj):
+                    result['status'] = 'skipped'
+                    return result
+
+                # Cria cada diretório local apenas uma vez
+                directory = os.path.dirname(local_filepath)
+                if directory not in created_dirs:
+                    os.makedirs(directory, exist_ok=True)
+                    with created_dirs_lock:
+                        created_dirs.add(directory)
+
+                self.s3_client.download_file(bucket, obj['Key'], local_filepath, Config=config)
+                result['status'] = 'downloaded'
+            except (BotoCoreError, ClientError, OSError) as e:
+                telemetry.debug(f"Erro ao fazer download do arquivo {obj['Key']} do S3: {e}")
+                result.update({'status': 'failed', 'error': str(e)})
+            return result
+
+        return self._run_parallel(objects, download, max_workers, progress)
+
+    def delete_objects(self, bucket: str, keys: Iterable, max_workers: Optional[int] = None,
+                       progress: Optional[Callable[[Dict, Dict], None]] = None) -> Iterator[Dict]:
+        """
+        Deleta as chaves recebidas (strings ou objetos de iter_objects) em lotes de 1000
+        por requisição (DeleteObjects), com os lotes enviados em paralelo
+
+        Args:
+            bucket (str): Nome do bucket S3
+            keys (iterable): Chaves ou objetos com 'Key'
+            max_workers (int, optional): Requisições simultâneas (padrão: TTS_S3_TRANSFER_WORKERS)
+            progress (callable, optional): Chamada a cada lote concluído com (resultado, totais)
+
+        Yields:
+            dict: Resultado de cada lote (status 'deleted' ou 'failed', keys, deleted, errors com Key/Code/Message)
+        """
+        def batches() -> Iterator[List[str]]:
+            batch = []
+            for key in keys:
+                batch.append(key['Key'] if isinstance(key, dict) else key)
+                if len(batch) == DELETE_BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        def delete(batch: List[str]) -> Dict:
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=bucket,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+            except (BotoCoreError, ClientError) as e:
+                telemetry.debug(f"Erro ao deletar objetos do S3: {e}")
+                return {'status': 'failed', 'keys': batch, 'deleted': 0,
+                        'errors': [{'Key': key, 'Message': str(e)} for key in batch]}
+
+            errors = response.get('Errors', [])
+            return {'status': 'deleted' if not errors else 'failed', 'keys': batch,
+                    'deleted': len(batch) - len(errors), 'errors': errors}
+
+        return self._run_parallel(batches(), delete, max_workers, progress)
+
+    def download_all_files(self, bucket: str, prefix: str = '', sufix: str = '', max_workers: Optional[int] = None,
+                           skip_unchanged: bool = True,
+                           progress: Optional[Callable[[Dict, Dict], None]] = None) -> List[Dict]:
         """
         Realiza o download de todos os arquivos de um bucket S3, opcionalmente
         filtrando por um prefixo e/ou sufixo específico
+        Os downloads começam enquanto a listagem continua e rodam em paralelo; para prefixos muito
+        grandes, use download_objects(bucket, iter_objects(...)), que não acumula os resultados
         
         Args:
             bucket (str): Nome do bucket S3
             prefix (str, optional): Prefixo para filtrar os objetos. Defaults to ''.
             sufix (str, optional): Sufixo para filtrar os objetos. Defaults to ''.
+            max_workers (int, optional): Downloads simultâneos (padrão: TTS_S3_TRANSFER_WORKERS)
+            skip_unchanged (bool): Se deve pular arquivos locais iguais aos do bucket
+            progress (callable, optional): Chamada a cada arquivo concluído com (resultado, totais)
         
         Returns:
-            list: Lista com os caminhos locais dos arquivos baixados
+            list: Resultado de cada arquivo (key, path, status 'downloaded', 'skipped' ou 'failed', size, error)
         """
-        downloaded_files = []
-        
-        try:
-            # Lista todos os objetos no bucket com o prefixo especificado
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            page_iterator = paginator.paginate(Bucket=bucket, Prefix=prefix)
-            
-            for page in page_iterator:
-                if 'Contents' not in page:
-                    print(f"[DEBUG] Nenhum arquivo encontrado no bucket {bucket} com prefixo {prefix}")
-                    return downloaded_files
-                    
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    # Ignora "pastas" (objetos que terminam com /)
-                    if key.endswith('/'):
-                        continue
-                    
-                    # Verifica se o arquivo termina com o sufixo especificado (se fornecido)
-                    if sufix and not key.endswith(sufix):
-                        continue
-                        
-                    # Cria diretórios locais se necessário                   
-                    local_filepath = os.path.join(self.download_path, key)
-                    os.makedirs(os.path.dirname(local_filepath), exist_ok=True)
-                    
-                    # print(f"[DEBUG] Baixando {key} para {local_filepath}")
-                    self.s3_client.download_file(bucket, key, local_filepath)
-                    downloaded_files.append(local_filepath)
-                    
-            return downloaded_files
-            
-        except ClientError as e:
-            print(f"[DEBUG] Erro ao fazer download de todos os arquivos do S3: {e}")
-            raise e
-        
+        objects = self.iter_objects(bucket, prefix, sufix)
+        return list(self.download_objects(bucket, objects, max_workers, skip_unchanged, progress))
     
     def list_files(self, bucket: str, prefix: str = '', sufix: str = '') -> list:
         """
         Lista todos os arquivos de um diretório no bucket S3, opcionalmente
-        filtrando por um prefixo específico
+        filtrando por um prefixo específico (para prefixos grandes, prefira iter_objects)
 
         Args:
             bucket (str): Nome do bucket S3
@@ -238,35 +662,7 @@ class S3BucketClass:
         Returns:
             list: Lista com os nomes dos arquivos no bucket
         """
-        files = []
-
-        try:
-            # Lista todos os objetos no bucket com o prefixo especificado
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            page_iterator = paginator.paginate(Bucket=bucket, Prefix=prefix)
-
-            for page in page_iterator:
-                if 'Contents' not in page:
-                    print(f"[DEBUG] Nenhum arquivo encontrado no bucket {bucket} com prefixo {prefix}")
-                    return files
-                
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    # Ignora "pastas" (objetos que terminam com /)
-                    if key.endswith('/'):
-                        continue
-
-                    # Verifica se o arquivo termina com o sufixo especificado (se fornecido)
-                    if sufix and not key.endswith(sufix):
-                        continue
-                    
-                    files.append(key)
-
-            return files
-
-        except ClientError as e:
-            print(f"[DEBUG] Erro ao listar arquivos do S3: {e}")
-            raise e
+        return [obj['Key'] for obj in self.iter_objects(bucket, prefix, sufix)]
         
 
     def get_file_size(self, bucket: str, key: str) -> float:
@@ -290,5 +686,5 @@ class S3BucketClass:
             return round(size_mb, 2)
         
         except ClientError as e:
-            print(f"[DEBUG] Erro ao obter tamanho do arquivo do S3: {e}")
+            telemetry.debug(f"Erro ao obter tamanho do arquivo do S3: {e}")
             raise e
\ No newline at end of file
@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import threading
+from typing import Dict, FrozenSet, List, Optional
+from botocore.exceptions import BotoCoreError, ClientError
+
+from utils import telemetry
+
+# Validade do catálogo de vozes (memória e disco); o Polly raramente adiciona vozes
+VOICE_CATALOG_TTL_SECONDS = int(os.getenv('TTS_VOICE_CATALOG_TTL_SECONDS', '86400'))
+
+# Espera antes de tentar de novo quando a listagem de vozes falha (ex.: sem polly:DescribeVoices)
+VOICE_CATALOG_RETRY_SECONDS = 60
+
+# Nome do arquivo do catálogo em disco (sem o prefixo tts_, que é removido pelo orçamento do /tmp)
+VOICE_CATALOG_FILENAME = 'polly_voices_{region}.json'
+
+
+class InvalidVoiceError(ValueError):
+    """
+    Voz inexistente no Polly (detectada no catálogo local, sem chamada de síntese)
+    """
+
+
+class VoiceCatalog:
+    """
+    Catálogo das vozes do Polly (describe_voices), indexado por ID, idioma e engine
+
+    A listagem é feita uma vez e guardada em memória e em disco (sobrevive a reinícios da instância
+    enquanto o /tmp existir), de modo que validar a voz e escolher a engine antes de cada síntese
+    são consultas locais em dicionários.
+    """
+
+    def __init__(self, polly_client, cache_path: Optional[str] = None,
+                 ttl_seconds: int = VOICE_CATALOG_TTL_SECONDS):
+        """
+        Args:
+            polly_client: Cliente Polly usado na listagem
+            cache_path (str, optional): Arquivo JSON do catálogo em disco (None = apenas memória)
+            ttl_seconds (int): Validade do catálogo em segundos
+        """
+        self.polly_client = polly_client
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+
+        self._voices = None
+        self._by_language = {}
+        self._by_engine = {}
+        self._loaded_at = 0.0
+        self._failed_at = 0.0
+        self._lock = threading.Lock()
+
+    def _index(self, voices: List[Dict], loaded_at: float):
+        """
+        Monta os índices a partir da lista de vozes no formato do describe_voices
+        """
+        by_id = {}
+        by_language = {}
+        by_engine = {}
+        for voice in voices:
+            languages = [voice['LanguageCode']] + list(voice.get('AdditionalLanguageCodes', []))
+            entry = {
+                'id': voice['Id'],
+                'name': voice.get('Name', voice['Id']),
+                'gender': voice.get('Gender'),
+                'language_code': voice['LanguageCode'],
+                'language_codes': frozenset(languages),
+                'engines': frozenset(voice.get('SupportedEngines', ['standard']))
+            }
+            by_id[entry['id']] = entry
+            for language in languages:
+                by_language.setdefault(language, []).append(entry['id'])
+            for engine in entry['engines']:
+                by_engine.setdefault(engine, set()).add(entry['id'])
+
+        self._voices = by_id
+        self._by_language = by_language
+        self._by_engine = by_engine
+        self._loaded_at = loaded_at
+
+    def _read_disk(self) -> Optional[tuple]:
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as catalog_file:
+                cached = json.load(catalog_file)
+            if time.time() - cached['loaded_at'] > self.ttl_seconds:
+                return None
+            return cached['voices'], cached['loaded_at']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, voices: List[Dict], loaded_at: float):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self.cache_path}.{threading.get_ident()}.part"
+            with open(tmp_path, 'w', encoding='utf-8') as catalog_file:
+                json.dump({'loaded_at': loaded_at, 'voices': voices}, catalog_file)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            telemetry.error(f'Could not write voice catalog to {self.cache_path}: {e}')
+
+    def _describe_voices(self) -> List[Dict]:
+        """
+        Lista todas as vozes do Polly (todas as engines e idiomas adicionais), seguindo NextToken
+        """
+        voices = []
+        params = {'IncludeAdditionalLanguageCodes': True}
+        while True:
+            response = self.polly_client.describe_voices(**params)
+            voices.extend({key: voice[key] for key in ('Id', 'Name', 'Gender', 'LanguageCode',
+                                                       'AdditionalLanguageCodes', 'SupportedEngines')
+                           if key in voice}
+                          for voice in response.get('Voices', []))
+            if not response.get('NextToken'):
+                return voices
+            params['NextToken'] = response['NextToken']
+
+    def _ensure_loaded(self) -> bool:
+        """
+        Garante um catálogo válido (memória, disco ou Polly, nessa ordem)
+
+        Returns:
+            bool: False se o catálogo não está disponível (a síntese segue sem validação local)
+        """
+        now = time.time()
+        if self._voices is not None and now - self._loaded_at <= self.ttl_seconds:
+            return True
+
+        with self._lock:
+            if self._voices is not None and now - self._loaded_at <= self.ttl_seconds:
+                return True
+
+            cached = self._read_disk()
+            if cached is not None:
+                self._index(*cached)
+                return True
+
+            if now - self._failed_at < VOICE_CATALOG_RETRY_SECONDS:
+                return self._voices is not None
+
+            try:
+                with telemetry.stage('voice_catalog'):
+                    voices = self._describe_voices()
+            except (BotoCoreError, ClientError) as e:
+                # Sem permissão ou sem rede: mantém o catálogo anterior (se houver) e tenta de novo depois
+                self._failed_at = now
+                telemetry.error(f'Could not load Polly voice catalog: {e}')
+                return self._voices is not None
+
+            self._index(voices, now)
+            self._write_disk(voices, now)
+            telemetry.debug(f'Voice catalog loaded: {len(voices)} voices')
+            return True
+
+    @property
+    def available(self) -> bool:
+        return self._ensure_loaded()
+
+    def get(self, voice_id: str) -> Optional[Dict]:
+        """
+        Retorna a voz (id, name, gender, language_code, language_codes, engines), ou None se não existir
+        """
+        if not self._ensure_loaded():
+            return None
+        return self._voices.get(voice_id)
+
+    def voices(self, language_code: Optional[str] = None, engine: Optional[str] = None) -> List[Dict]:
+        """
+        Lista as vozes, opcionalmente filtradas por idioma e engine
+
+        Args:
+            language_code (str, optional): Código do idioma (ex.: 'pt-BR')
+            engine (str, optional): Engine ('standard', 'neural', 'long-form', 'generative')
+        """
+        if not self._ensure_loaded():
+            return []
+        voice_ids = self._by_language.get(language_code, []) if language_code else self._voices
+        engine_ids = self._by_engine.get(engine, set()) if engine else None
+        return [self._voices[voice_id] for voice_id in voice_ids if engine_ids is None or voice_id in engine_ids]
+
+    def engines(self, voice_id: str) -> FrozenSet[str]:
+        voice = self.get(voice_id)
+        return voice['engines'] if voice else frozenset()
+
+    def resolve(self, voice_id: str, use_neural: bool, language_code: str) -> Optional[Dict]:
+        """
+        Valida a voz e escolhe engine e idioma da síntese sem acessar a rede
+
+        A engine neural é usada quando solicitada e suportada pela voz; vozes sem a engine
+        standard (apenas neural/generativa) usam uma engine que suportam. O idioma padrão é mantido
+        quando a voz o suporta (vozes bilíngues); caso contrário, usa o idioma da voz.
+
+        Args:
+            voice_id (str): ID da voz
+            use_neural (bool): Se a engine neural foi solicitada
+            language_code (str): Idioma padrão do serviço
+
+        Returns:
+            dict: {'engine', 'language_code'}, ou None se o catálogo não estiver disponível
+
+        Raises:
+            InvalidVoiceError: Se a voz não existir no Polly
+        """
+        if not self._ensure_loaded():
+            return None
+
+        voice = self._voices.get(voice_id)
+        if voice is None:
+            raise InvalidVoiceError(f"Voice '{voice_id}' is not available in Amazon Polly")
+
+        engines = voice['engines']
+        if use_neural and 'neural' in engines:
+            engine = 'neural'
+        elif 'standard' in engines:
+            engine = 'standard'
+        else:
+            engine = 'neural' if 'neural' in engines else sorted(engines)[0]
+
+        if language_code not in voice['language_codes']:
+            language_code = voice['language_code']
+        return {'engine': engine, 'language_code': language_code}
+
+
+# Catálogos compartilhados pelo processo (um por cliente Polly e diretório)
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_voice_catalog(polly_client, region_name: str, cache_dir: Optional[str] = None) -> VoiceCatalog:
+    """
+    Retorna o catálogo de vozes do cliente informado, criando-o apenas uma vez por processo
+    Os clientes compartilhados (utils.client_registry) são únicos por região, então na Lambda
+    existe um catálogo por região; clientes próprios (ex.: stubs) têm catálogos separados
+
+    Args:
+        polly_client: Cliente Polly da região
+        region_name (str): Região AWS do Polly
+        cache_dir (str, optional): Diretório do arquivo do catálogo em disco
+    """
+    cache_path = os.path.join(cache_dir, VOICE_CATALOG_FILENAME.format(region=region_name)) if cache_dir else None
+    # id() é estável enquanto o catálogo (que guarda o cliente) existir
+    key = (id(polly_client), cache_path)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = VoiceCatalog(polly_client, cache_path)
+            _catalogs[key] = catalog
+        return catalog
@@ -0,0 +1,40 @@
+import pytest
+
+from benchmarks.polly_stub import PollyStub
+from benchmarks.s3_stub import S3Stub
+from services.polly_services import TTSPollyService
+from utils import client_registry, rate_limiter
+
+
+@pytest.fixture(autouse=True)
+def rate_limiters(monkeypatch):
+    """
+    Limitadores novos em cada teste, com cotas altas (o stub do Polly não limita a taxa)
+    """
+    monkeypatch.setattr(rate_limiter, '_limiters', {})
+    monkeypatch.setattr(rate_limiter, 'ENGINE_QUOTAS', {engine: (1000.0, 1000.0) for engine in rate_limiter.ENGINE_QUOTAS})
+
+
+@pytest.fixture
+def polly_stub():
+    return PollyStub()
+
+
+@pytest.fixture
+def s3_stub(monkeypatch):
+    """
+    Stub do S3 registrado nas regiões usadas pelo serviço (os clientes do processo são restaurados no fim)
+    """
+    stub = S3Stub(store_bodies=True)
+    monkeypatch.setattr(client_registry, '_clients', {})
+    for region in ('us-east-1', 'ca-central-1'):
+        client_registry.register_client('s3', region, stub)
+    return stub
+
+
+@pytest.fixture
+def tts_service(tmp_path, polly_stub):
+    """
+    Serviço com o stub do Polly, sem cache local nem cache no S3
+    """
+    return TTSPollyService(output_dir=str(tmp_path), cache_max_mb=0, polly_client=polly_stub)
@@ -0,0 +1,69 @@
+import asyncio
+import os
+
+import pytest
+
+from benchmarks.polly_stub import PollyStub
+from services.async_polly_services import AsyncTTSPollyService
+from services.polly_services import TTSPollyService
+
+LONG_TEXT = ' '.join(f'Sentence number {i} of a long document read aloud.' for i in range(200))
+
+# Campos que variam entre duas execuções da mesma síntese
+VOLATILE_FIELDS = ('processing_time', 'file_path', 'filename', 'chunk_timings')
+
+
+def comparable(result):
+    return {key: value for key, value in result.items() if key not in VOLATILE_FIELDS}
+
+
+@pytest.fixture
+def async_service(tts_service):
+    service = AsyncTTSPollyService(tts_service)
+    yield service
+    service.close()
+
+
+@pytest.mark.parametrize('text', ['A short sentence.', LONG_TEXT], ids=['short', 'long'])
+def test_async_result_matches_sync_result(tts_service, async_service, text):
+    expected = tts_service.text_to_speech(text, write_file=False)
+
+    result = asyncio.run(async_service.text_to_speech(text, write_file=False))
+
+    assert result['success']
+    assert comparable(result) == comparable(expected)
+
+
+def test_async_errors_match_sync_errors(tts_service, async_service):
+    expected = tts_service.text_to_speech('Hello.', voice_id='Nope', write_file=False)
+
+    assert asyncio.run(async_service.text_to_speech('Hello.', voice_id='Nope', write_file=False)) == expected
+
+
+def test_iter_speech_yields_the_sync_audio(tts_service, async_service):
+    async def collect():
+        return b''.join([chunk async for chunk in async_service.iter_speech(LONG_TEXT)])
+
+    assert asyncio.run(collect()) == b''.join(tts_service.iter_speech(LONG_TEXT))
+
+
+def test_cancelled_synthesis_stops_chunks_and_removes_partial_file(tmp_path):
+    polly_stub = PollyStub(latency=0.05)
+    service = AsyncTTSPollyService(TTSPollyService(output_dir=str(tmp_path), cache_max_mb=0,
+                                                   polly_client=polly_stub))
+    text = ' '.join(f'Words of chunk {i} that will never be synthesized.' for i in range(600))
+
+    async def cancel():
+        task = asyncio.ensure_future(service.text_to_speech_streaming(text, max_workers=2))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Chamadas já iniciadas terminam em background sem recriar o arquivo
+        await asyncio.sleep(0.1)
+
+    asyncio.run(cancel())
+    service.close()
+
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('tts_')]
+    assert polly_stub.billed_characters < len(text) // 2
@@ -0,0 +1,55 @@
+from services.polly_services import TTSPollyService
+from utils.audio_cache import LocalAudioCache, synthesis_cache_key
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = LocalAudioCache(str(tmp_path), max_bytes=300)
+    cache.put('a', b'a' * 100)
+    cache.put('b', b'b' * 100)
+    cache.put('c', b'c' * 100)
+
+    # 'a' passa a ser a mais recente; 'b' é a próxima a sair
+    assert cache.get('a') == b'a' * 100
+    cache.put('d', b'd' * 100)
+
+    assert cache.get('b') is None
+    assert cache.get('c') == b'c' * 100
+    assert not (tmp_path / 'b.audio').exists()
+    assert cache.stats() == {'entries': 3, 'size_bytes': 300, 'max_bytes': 300, 'hits': 2, 'misses': 1}
+
+
+def test_entry_larger_than_cache_is_not_stored(tmp_path):
+    cache = LocalAudioCache(str(tmp_path), max_bytes=10)
+
+    assert not cache.put('big', b'x' * 11)
+    assert cache.get('big') is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    LocalAudioCache(str(tmp_path), max_bytes=300).put('a', b'a' * 100)
+
+    cache = LocalAudioCache(str(tmp_path), max_bytes=300)
+
+    assert cache.get('a') == b'a' * 100
+    assert cache.stats()['size_bytes'] == 100
+
+
+def test_cache_key_ignores_whitespace_formatting():
+    params = {'Text': 'Hello   world.\n', 'VoiceId': 'Joanna', 'OutputFormat': 'mp3'}
+
+    assert synthesis_cache_key(params) == synthesis_cache_key(dict(params, Text='Hello world.'))
+    assert synthesis_cache_key(params) != synthesis_cache_key(dict(params, VoiceId='Matthew'))
+
+
+def test_repeated_text_is_served_from_local_cache(tmp_path, polly_stub):
+    service = TTSPollyService(output_dir=str(tmp_path), cache_max_mb=1, polly_client=polly_stub)
+
+    first = service.text_to_speech('Hello from the cache.', write_file=False)
+    second = service.text_to_speech('Hello from the cache.', write_file=False)
+
+    assert first['cache'] == 'miss'
+    assert second['cache'] == 'hit'
+    assert second['audio_data'] == first['audio_data']
+    assert polly_stub.billed_characters == len('Hello from the cache.')
+    assert service.audio_cache.stats()['hits'] == 1
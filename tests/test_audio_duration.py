@@ -0,0 +1,67 @@
+import struct
+
+import pytest
+
+from benchmarks.polly_stub import MP3_FRAME_BYTES, MP3_FRAME_HEADER, MP3_FRAME_SECONDS
+from utils.audio_duration import audio_duration, mp3_duration, pcm_duration
+
+# Frame MPEG-2 Layer III, 32 kbps, 24 kHz, mono (mesma duração do frame do stub em 96 bytes)
+LOW_BITRATE_HEADER = b'\xff\xf3\x44\xc0'
+LOW_BITRATE_FRAME_BYTES = 96
+
+ID3V2_TAG = b'ID3\x04\x00\x00\x00\x00\x00\x0a' + bytes(10)
+ID3V1_TAG = b'TAG' + bytes(125)
+
+
+def frames(count, header=MP3_FRAME_HEADER, size=MP3_FRAME_BYTES):
+    return (header + bytes(size - len(header))) * count
+
+
+def info_frame(frame_count, stream_bytes):
+    # Tag Info (Xing de um CBR) logo após o cabeçalho e o side info de um frame MPEG-2 mono
+    tag = b'Info' + struct.pack('>III', 0x03, frame_count, stream_bytes)
+    frame = MP3_FRAME_HEADER + bytes(9) + tag
+    return frame + bytes(MP3_FRAME_BYTES - len(frame))
+
+
+@pytest.mark.parametrize('concatenated', [False, True])
+def test_polly_mp3_duration(concatenated):
+    assert mp3_duration(frames(250), concatenated) == pytest.approx(250 * MP3_FRAME_SECONDS)
+
+
+def test_id3_tags_do_not_count_as_audio():
+    data = ID3V2_TAG + frames(100) + ID3V1_TAG
+
+    assert mp3_duration(data) == pytest.approx(100 * MP3_FRAME_SECONDS)
+
+
+def test_concatenated_streams_with_different_bitrates():
+    data = frames(100) + ID3V2_TAG + frames(50, LOW_BITRATE_HEADER, LOW_BITRATE_FRAME_BYTES)
+
+    expected = 150 * MP3_FRAME_SECONDS
+    assert mp3_duration(data, concatenated=True) == pytest.approx(expected)
+    # O último frame não confere com o primeiro: o cálculo pelo bitrate é descartado
+    assert mp3_duration(data) == pytest.approx(expected)
+
+
+def test_info_tag_frame_count_is_used_and_not_counted_as_audio():
+    audio = frames(40)
+    data = info_frame(40, MP3_FRAME_BYTES + len(audio)) + audio
+
+    assert mp3_duration(data) == pytest.approx(40 * MP3_FRAME_SECONDS)
+    assert mp3_duration(data, concatenated=True) == pytest.approx(40 * MP3_FRAME_SECONDS)
+
+
+def test_pcm_duration_with_and_without_wav_header():
+    samples = bytes(2 * 16000)
+    header = b'RIFF' + struct.pack('<I', 36 + len(samples)) + b'WAVE' + bytes(32)
+
+    assert pcm_duration(samples, 16000) == pytest.approx(1.0)
+    assert pcm_duration(header + samples, 16000) == pytest.approx(1.0)
+    assert audio_duration(samples, 'pcm', 8000) == pytest.approx(2.0)
+
+
+def test_unreadable_audio():
+    assert audio_duration(b'', 'mp3') == 0.0
+    assert mp3_duration(bytes(1000)) is None
+    assert audio_duration(b'data', 'json') is None
@@ -0,0 +1,69 @@
+import struct
+
+import pytest
+
+from benchmarks.polly_stub import MP3_FRAME_BYTES, MP3_FRAME_HEADER, MP3_FRAME_SECONDS
+from services.s3bucket_services import S3BucketClass
+from utils.audio_duration import mp3_duration, pcm_duration
+from utils.audio_stitcher import WAV_HEADER_BYTES, WAV_UNKNOWN_SIZE, AudioStitcher, stitch_audio, wav_header
+
+ID3V2_TAG = b'ID3\x04\x00\x00\x00\x00\x00\x0a' + bytes(10)
+ID3V1_TAG = b'TAG' + bytes(125)
+
+
+def wav_sizes(data):
+    riff_size, = struct.unpack_from('<I', data, 4)
+    data_size, = struct.unpack_from('<I', data, 40)
+    return riff_size, data_size
+
+
+def polly_mp3(frame_count):
+    # Chunk como um encoder o gravaria: ID3v2, frame Info (sem áudio), frames de áudio e ID3v1
+    audio = (MP3_FRAME_HEADER + bytes(MP3_FRAME_BYTES - 4)) * frame_count
+    info = MP3_FRAME_HEADER + bytes(9) + b'Info' + struct.pack('>III', 0x03, frame_count, len(audio))
+    return ID3V2_TAG + info + bytes(MP3_FRAME_BYTES - len(info)) + audio + ID3V1_TAG
+
+
+def test_wav_header_sizes():
+    header = wav_header(16000, 32000)
+
+    assert len(header) == WAV_HEADER_BYTES
+    assert header[:4] == b'RIFF' and header[8:16] == b'WAVEfmt '
+    assert wav_sizes(header) == (32000 + WAV_HEADER_BYTES - 8, 32000)
+    assert wav_sizes(wav_header(16000)) == (WAV_UNKNOWN_SIZE, WAV_UNKNOWN_SIZE)
+
+
+def test_pcm_chunks_are_wrapped_in_a_single_wav():
+    data = stitch_audio([bytes(16000), bytes(16000)], 'pcm', 16000)
+
+    assert wav_sizes(data) == (len(data) - 8, 32000)
+    assert pcm_duration(data, 16000) == pytest.approx(1.0)
+
+
+def test_mp3_chunks_keep_only_the_first_id3_tag_and_no_info_frames():
+    chunks = [polly_mp3(10), polly_mp3(20), polly_mp3(30)]
+    stitcher = AudioStitcher('mp3', 24000)
+
+    parts = [stitcher.feed(chunk) for chunk in chunks]
+    data = b''.join(parts)
+
+    assert stitcher.header() == b''
+    assert parts[0].startswith(ID3V2_TAG + MP3_FRAME_HEADER)
+    assert all(part.startswith(MP3_FRAME_HEADER) for part in parts[1:])
+    assert b'Info' not in data and b'TAG' not in data
+    assert len(data) == len(ID3V2_TAG) + 60 * MP3_FRAME_BYTES == stitcher.data_size
+    assert mp3_duration(data, concatenated=True) == pytest.approx(60 * MP3_FRAME_SECONDS)
+
+
+@pytest.mark.parametrize('sentences', [20, 130])
+def test_pcm_object_uploaded_to_s3_has_real_wav_sizes(tts_service, s3_stub, sentences):
+    tts_service.default_config.update(output_format='pcm', sample_rate='16000')
+    text = ' '.join(f'Sentence number {i} of a document sent straight to the bucket.' for i in range(sentences))
+
+    result = tts_service.synthesize_to_s3(text, 'bucket', 'speech.wav',
+                                          s3_bucket=S3BucketClass(region_name='us-east-1'))
+
+    assert result['success']
+    data = s3_stub._objects[('bucket', 'speech.wav')]['Body']
+    # Um único PUT (texto curto) ou várias partes do multipart (cabeçalho enviado por último)
+    assert wav_sizes(data) == (len(data) - 8, len(data) - WAV_HEADER_BYTES)
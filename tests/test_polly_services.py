@@ -0,0 +1,25 @@
+from services.polly_services import MAX_BILLED_CHARACTERS
+from utils.text_splitter import split_text
+
+
+def count_synthesis_calls(polly_stub):
+    calls = []
+    synthesize_speech = polly_stub.synthesize_speech
+
+    def counted(**params):
+        calls.append(params)
+        return synthesize_speech(**params)
+
+    polly_stub.synthesize_speech = counted
+    return calls
+
+
+def test_unedited_document_keeps_packed_chunk_count(tts_service, polly_stub):
+    text = ' '.join(f'Sentence number {i} of a long document that nobody edited.' for i in range(170))
+    calls = count_synthesis_calls(polly_stub)
+
+    result = tts_service.text_to_speech(text, write_file=False)
+
+    assert result['success']
+    # Chunks preenchidos até o limite do Polly: o menor número de chamadas possível
+    assert len(calls) == len(split_text(text)) == -(-len(text) // MAX_BILLED_CHARACTERS)
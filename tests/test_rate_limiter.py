@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from botocore.exceptions import ClientError
+
+from benchmarks.polly_stub import PollyStub
+from utils.rate_limiter import (AdaptiveRateLimiter, call_with_retry, call_with_retry_async, get_rate_limiter,
+                                is_retryable_error)
+
+
+def client_error(code, status=400):
+    return ClientError({'Error': {'Code': code, 'Message': code}, 'ResponseMetadata': {'HTTPStatusCode': status}},
+                       'SynthesizeSpeech')
+
+
+def failing(*errors):
+    """
+    Chamada que levanta os erros informados, um por tentativa, e depois retorna 'ok'
+    """
+    pending = list(errors)
+    calls = []
+
+    def call():
+        calls.append(1)
+        if pending:
+            raise pending.pop(0)
+        return 'ok'
+
+    return call, calls
+
+
+def test_throttle_halves_rate_down_to_minimum_and_success_recovers():
+    limiter = AdaptiveRateLimiter(max_rate=8, min_rate=1, increase_per_success=2)
+
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 2
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 1
+
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.stats() == {'rate': 8, 'max_rate': 8, 'queue_depth': 0, 'calls': 0, 'throttles': 4}
+
+
+def test_throttle_empties_the_bucket():
+    limiter = AdaptiveRateLimiter(max_rate=1, burst=5, min_rate=0.5)
+    assert limiter.acquire(timeout=0)
+
+    limiter.on_throttle()
+
+    # Taxa de 0,5/s: o próximo token leva 2 segundos
+    assert not limiter.acquire(timeout=0.05)
+    assert limiter.stats()['queue_depth'] == 0
+
+
+def test_throttled_calls_are_retried_with_backoff():
+    limiter = AdaptiveRateLimiter(max_rate=1000)
+    call, calls = failing(client_error('ThrottlingException'), client_error('ServiceFailureException', 500))
+
+    assert call_with_retry(limiter, call, base_delay=0.001) == 'ok'
+    assert len(calls) == 3
+    # Apenas a limitação reduz a taxa; a falha do serviço é repetida sem reduzi-la
+    assert limiter.throttles == 1
+
+
+def test_permanent_errors_are_not_retried():
+    limiter = AdaptiveRateLimiter(max_rate=1000)
+    call, calls = failing(client_error('ValidationException'))
+
+    with pytest.raises(ClientError):
+        call_with_retry(limiter, call, base_delay=0.001)
+    assert len(calls) == 1
+    assert not is_retryable_error(client_error('ValidationException'))
+
+
+def test_last_throttle_is_raised_when_attempts_run_out():
+    limiter = AdaptiveRateLimiter(max_rate=1000)
+    polly_stub = PollyStub(throttle_rate=1.0)
+
+    with pytest.raises(ClientError) as error:
+        call_with_retry(limiter, lambda: polly_stub.synthesize_speech(Text='Hi'), max_attempts=3, base_delay=0.001)
+
+    assert error.value.response['Error']['Code'] == 'ThrottlingException'
+    assert polly_stub.throttled == limiter.throttles == 3
+
+
+def test_async_calls_are_retried():
+    limiter = AdaptiveRateLimiter(max_rate=1000)
+    call, calls = failing(client_error('ThrottlingException'))
+
+    async def request():
+        return call()
+
+    assert asyncio.run(call_with_retry_async(limiter, request, base_delay=0.001)) == 'ok'
+    assert len(calls) == 2 and limiter.throttles == 1
+
+
+def test_limiters_are_shared_per_engine():
+    assert get_rate_limiter('neural') is get_rate_limiter('neural')
+    assert get_rate_limiter('neural') is not get_rate_limiter('standard')
+    with pytest.raises(ValueError):
+        get_rate_limiter('unknown')
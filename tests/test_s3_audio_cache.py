@@ -0,0 +1,80 @@
+import json
+import time
+
+import pytest
+
+from services.polly_services import TTSPollyService
+from services.s3_audio_cache import S3AudioCache
+from services.s3bucket_services import S3BucketClass
+
+BUCKET = 'tts-cache-bucket'
+
+
+@pytest.fixture
+def s3_cache(s3_stub):
+    return S3AudioCache(BUCKET, ttl_seconds=60, s3_bucket=S3BucketClass(region_name='us-east-1'))
+
+
+def read_index(s3_stub, cache):
+    return json.loads(s3_stub._objects[(BUCKET, cache.index_key)]['Body'])
+
+
+def test_written_entry_is_read_back(s3_cache):
+    s3_cache.put_async('key', b'audio', 'mp3')
+    assert s3_cache.flush(timeout=5)
+
+    assert s3_cache.get('key') == b'audio'
+    assert s3_cache.get('other') is None
+    assert s3_cache.stats() == {'hits': 1, 'misses': 1, 'pending_writes': 0}
+
+
+def test_entry_older_than_ttl_is_a_miss(s3_cache, s3_stub):
+    s3_stub.put_object(Bucket=BUCKET, Key=s3_cache.object_key('old'), Body=b'audio',
+                       Metadata={'created-at': str(int(time.time()) - 120)})
+
+    assert s3_cache.get('old') is None
+    assert s3_cache.stats()['misses'] == 1
+
+
+def test_index_is_written_only_on_request(s3_cache, s3_stub):
+    s3_cache.put_async('key', b'audio', 'mp3')
+    s3_cache.get('missing')
+    s3_cache.flush(timeout=5)
+
+    # Objetos gravados na resposta; o índice fica para o warmup (ou para o limite de alterações)
+    assert (BUCKET, s3_cache.index_key) not in s3_stub._objects
+
+    s3_cache.flush(timeout=5, write_index=True)
+
+    index = read_index(s3_stub, s3_cache)
+    assert list(index['entries']) == ['key']
+    assert index['misses'] == 1
+
+
+def test_purge_removes_only_expired_entries(s3_cache, s3_stub, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(time, 'time', lambda: 1_000_000.0)
+        s3_cache.put_async('old', b'old audio', 'mp3')
+        s3_cache.flush(timeout=5, write_index=True)
+    s3_cache.put_async('new', b'new audio', 'mp3')
+
+    assert s3_cache.purge_expired() == 1
+
+    assert (BUCKET, s3_cache.object_key('old')) not in s3_stub._objects
+    assert s3_cache.get('new') == b'new audio'
+    assert list(read_index(s3_stub, s3_cache)['entries']) == ['new']
+    # Executada há pouco nesta instância: não repete a remoção
+    assert s3_cache.maybe_purge_expired(min_interval_seconds=300) is None
+
+
+def test_service_reads_s3_cache_before_polly(tmp_path, polly_stub, s3_cache):
+    service = TTSPollyService(output_dir=str(tmp_path), cache_max_mb=0, s3_cache=s3_cache,
+                              polly_client=polly_stub)
+    first = service.text_to_speech('Shared between instances.', write_file=False)
+    s3_cache.flush(timeout=5)
+
+    second = service.text_to_speech('Shared between instances.', write_file=False)
+
+    assert (first['cache'], second['cache']) == ('miss', 's3_hit')
+    assert second['audio_data'] == first['audio_data']
+    assert polly_stub.billed_characters == len('Shared between instances.')
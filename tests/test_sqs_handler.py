@@ -0,0 +1,86 @@
+import json
+from collections import OrderedDict
+from functools import partial
+
+import pytest
+
+import lambda_function
+from benchmarks.polly_stub import PollyStub
+from services import polly_services
+from services.polly_services import TTSPollyService
+from utils import rate_limiter
+
+BUCKET = 'tts-output-bucket'
+
+
+@pytest.fixture
+def sqs_environment(tmp_path, s3_stub, monkeypatch):
+    """
+    Configura o lambda_function para gravar no stub do S3 e retorna a função que troca o stub do Polly
+    """
+    monkeypatch.setattr(lambda_function, 'S3_BUCKET_NAME', BUCKET)
+    monkeypatch.setattr(lambda_function, 'QUEUE_DLQ_URL', None)
+    monkeypatch.setattr(lambda_function, '_processed_messages', OrderedDict())
+    # Uma única tentativa: as limitações do stub falham na hora
+    monkeypatch.setattr(polly_services, 'call_with_retry', partial(rate_limiter.call_with_retry, max_attempts=1))
+
+    def use_polly(polly_stub):
+        service = TTSPollyService(output_dir=str(tmp_path), cache_max_mb=0, polly_client=polly_stub)
+        monkeypatch.setattr(lambda_function, 'get_tts_service', lambda **_: service)
+        return polly_stub
+
+    return use_polly
+
+
+def sqs_event(*bodies):
+    return {'Records': [{'messageId': f'm{index}', 'body': body if isinstance(body, str) else json.dumps(body)}
+                        for index, body in enumerate(bodies)]}
+
+
+def queue_objects(s3_stub):
+    return [key for bucket, key in s3_stub._objects if bucket == BUCKET]
+
+
+def test_permanent_errors_are_confirmed_and_duplicates_synthesized_once(sqs_environment, s3_stub):
+    polly_stub = sqs_environment(PollyStub())
+
+    response = lambda_function.sqs_handler(sqs_event(
+        {'text': 'Hello from the queue.'},
+        {'text': '  Hello from   the queue. '},
+        'not json',
+        {'text': 123},
+        {'text': 'Unknown voice.', 'voice_id': 'Nope'},
+        {'voice_id': 'Joanna'}
+    ), None)
+
+    # Nenhuma mensagem volta para a fila: as inválidas nunca teriam sucesso
+    assert response == {'batchItemFailures': []}
+    assert polly_stub.billed_characters == len('Hello from the queue.')
+    [key] = queue_objects(s3_stub)
+    assert key.startswith(lambda_function.QUEUE_OUTPUT_PREFIX) and key.endswith('.mp3')
+
+
+def test_throttled_messages_return_to_the_queue(sqs_environment, s3_stub):
+    sqs_environment(PollyStub(throttle_rate=1.0))
+
+    response = lambda_function.sqs_handler(sqs_event(
+        {'text': 'Throttled message.'},
+        {'text': 'Throttled message.'},
+        {'text': 123}
+    ), None)
+
+    assert response == {'batchItemFailures': [{'itemIdentifier': 'm0'}, {'itemIdentifier': 'm1'}]}
+    assert queue_objects(s3_stub) == []
+
+
+def test_redelivered_message_is_not_synthesized_again(sqs_environment):
+    polly_stub = sqs_environment(PollyStub())
+    event = sqs_event({'text': 'Delivered twice.'})
+
+    lambda_function.sqs_handler(event, None)
+    # Uma nova instância não tem a memória local, mas encontra o áudio no bucket
+    lambda_function._processed_messages.clear()
+    response = lambda_function.sqs_handler(event, None)
+
+    assert response == {'batchItemFailures': []}
+    assert polly_stub.billed_characters == len('Delivered twice.')
@@ -0,0 +1,23 @@
+from utils.text_splitter import MAX_BILLED_CHARACTERS, SSML_TAG, split_text
+
+
+def test_ssml_sentence_tags_are_chunk_boundaries():
+    body = ''.join(f'<p><s>Sentence {i} is about nothing in particular at all, really</s>'
+                   f'<s>It goes on {i}.</s></p>' for i in range(200))
+    document = f'<speak><prosody rate="fast">{body}</prosody></speak>'
+    assert len(SSML_TAG.sub('', document)) > MAX_BILLED_CHARACTERS
+
+    chunks = split_text(document)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.startswith('<speak><prosody rate="fast"><p><s>Sentence ')
+        # Nenhum corte no meio de uma sentença: cada chunk termina em um </s> completo
+        assert chunk.endswith('.</s></p></prosody></speak>')
+        assert len(SSML_TAG.sub('', chunk)) <= MAX_BILLED_CHARACTERS
+
+
+def test_punctuation_before_tag_ends_sentence():
+    sentences = split_text('<speak>Hi there.<break time="1s"/>Next one.</speak>', max_billed_chars=12)
+
+    assert sentences == ['<speak>Hi there.</speak>', '<speak><break time="1s"/>Next one.</speak>']
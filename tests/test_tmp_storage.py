@@ -0,0 +1,64 @@
+import os
+import time
+
+from utils.tmp_storage import MIN_FILE_AGE_SECONDS, TmpStorageManager
+
+
+def write_file(root, name, size, age):
+    path = root / name
+    path.write_bytes(bytes(size))
+    used_at = time.time() - age
+    os.utime(path, (used_at, used_at))
+    return path
+
+
+def test_cleanup_removes_least_recently_used_files_below_low_water(tmp_path):
+    for index in range(5):
+        write_file(tmp_path, f'tts_audio_{index}.mp3', 100, age=600 - index)
+    write_file(tmp_path, 'tts_audio_recent.mp3', 100, age=0)
+    write_file(tmp_path, 'other.bin', 1000, age=600)
+    storage = TmpStorageManager(str(tmp_path), max_bytes=500)
+
+    result = storage.cleanup()
+
+    # 600 bytes gerenciados, orçamento de 500: removidos até 400 (80%), começando pelos mais antigos
+    assert result == {'removed': 2, 'freed_bytes': 200, 'used_bytes': 400}
+    assert sorted(os.listdir(tmp_path)) == ['other.bin', 'tts_audio_2.mp3', 'tts_audio_3.mp3',
+                                            'tts_audio_4.mp3', 'tts_audio_recent.mp3']
+
+
+def test_files_in_use_are_never_removed(tmp_path):
+    for index in range(3):
+        write_file(tmp_path, f'tts_streaming_{index}.mp3', 100, age=MIN_FILE_AGE_SECONDS / 2)
+    storage = TmpStorageManager(str(tmp_path), max_bytes=100)
+
+    assert storage.cleanup()['removed'] == 0
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_expired_files_are_removed_within_budget(tmp_path):
+    write_file(tmp_path, 'tts_audio_old.mp3', 100, age=7200)
+    write_file(tmp_path, 'tts_audio_new.mp3', 100, age=60)
+    storage = TmpStorageManager(str(tmp_path), max_bytes=10_000)
+
+    assert storage.cleanup(max_age_seconds=3600)['removed'] == 1
+    assert os.listdir(tmp_path) == ['tts_audio_new.mp3']
+
+
+def test_tracked_files_trigger_background_cleanup_only_over_budget(tmp_path):
+    storage = TmpStorageManager(str(tmp_path), max_bytes=300)
+    storage.cleanup()
+
+    for index in range(4):
+        path = write_file(tmp_path, f'tts_audio_{index}.mp3', 100, age=600 - index)
+        storage.track(str(path), 100)
+        if index < 2:
+            # Dentro do orçamento: nenhuma varredura do diretório
+            assert storage.maybe_cleanup() is None
+            assert storage.usage()['scans'] == 1
+
+    assert storage.maybe_cleanup() is None
+    storage._worker.join(timeout=5)
+
+    usage = storage.usage()
+    assert (usage['used_bytes'], usage['files'], usage['evictions'], usage['scans']) == (200, 2, 2, 2)
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+import lambda_function
+from benchmarks.polly_stub import PollyStub
+from services.voice_catalog import InvalidVoiceError, VoiceCatalog, get_voice_catalog
+
+
+@pytest.fixture
+def catalog(tmp_path, polly_stub):
+    return VoiceCatalog(polly_stub, str(tmp_path / 'voices.json'))
+
+
+@pytest.mark.parametrize('voice_id, use_neural, expected', [
+    ('Joanna', True, {'engine': 'neural', 'language_code': 'en-US'}),
+    ('Joanna', False, {'engine': 'standard', 'language_code': 'en-US'}),
+    # Sem engine standard: usa a neural mesmo sem pedido
+    ('Kevin', False, {'engine': 'neural', 'language_code': 'en-US'}),
+    # Sem engine neural: usa a standard
+    ('Ricardo', True, {'engine': 'standard', 'language_code': 'pt-BR'}),
+])
+def test_engine_and_language_are_resolved_locally(catalog, voice_id, use_neural, expected):
+    assert catalog.resolve(voice_id, use_neural, 'en-US') == expected
+
+
+def test_unknown_voice_is_rejected(catalog):
+    with pytest.raises(InvalidVoiceError):
+        catalog.resolve('Nope', True, 'en-US')
+
+
+def test_catalog_is_listed_once_and_read_back_from_disk(tmp_path, catalog, polly_stub):
+    catalog.get('Joanna')
+    catalog.get('Matthew')
+    assert polly_stub.calls == 1
+
+    other_client = PollyStub()
+    assert VoiceCatalog(other_client, str(tmp_path / 'voices.json')).get('Ruth')['engines'] >= {'generative'}
+    assert other_client.calls == 0
+
+
+def test_catalogs_are_not_shared_between_clients():
+    first, second = PollyStub(), PollyStub()
+
+    assert get_voice_catalog(first, 'us-east-1') is get_voice_catalog(first, 'us-east-1')
+    assert get_voice_catalog(first, 'us-east-1') is not get_voice_catalog(second, 'us-east-1')
+
+
+def test_unknown_voice_fails_before_synthesis(tts_service, polly_stub):
+    result = tts_service.text_to_speech('Hello.', voice_id='Nope', write_file=False)
+
+    assert result['success'] is False
+    assert result['error_type'] == 'validation_error'
+    assert polly_stub.billed_characters == 0
+
+
+def test_unknown_voice_is_a_bad_request(tts_service, monkeypatch):
+    monkeypatch.setattr(lambda_function, 'S3_BUCKET_NAME', None)
+    monkeypatch.setattr(lambda_function, 'TASK_BUCKET_NAME', None)
+    monkeypatch.setattr(lambda_function, 'get_tts_service', lambda **_: tts_service)
+
+    response = lambda_function.lambda_handler({'text': 'Hello.', 'voice_id': 'Nope'}, None)
+
+    assert response['statusCode'] == 400
+    assert "Voice 'Nope'" in json.loads(response['body'])['message']
@@ -0,0 +1,226 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Extensão usada para os arquivos do cache (o formato faz parte da chave)
+CACHE_FILE_SUFFIX = '.audio'
+
+# Sequências de espaços (não alteram a fala e não devem gerar uma nova síntese)
+WHITESPACE = re.compile(r'\s+')
+
+
+def synthesis_cache_key(synthesis_params: Dict) -> str:
+    """
+    Gera a chave do cache a partir dos parâmetros finais enviados ao Polly
+
+    O texto entra na chave com os espaços normalizados, para que o mesmo trecho seja reaproveitado
+    mesmo quando a formatação do documento muda
+
+    Args:
+        synthesis_params (dict): Parâmetros de synthesize_speech (texto, voz, engine, formato...)
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal dos parâmetros serializados
+    """
+    if isinstance(synthesis_params.get('Text'), str):
+        synthesis_params = dict(synthesis_params, Text=WHITESPACE.sub(' ', synthesis_params['Text']).strip())
+    payload = json.dumps(synthesis_params, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LocalAudioCache:
+    """
+    Cache local de áudio endereçado por conteúdo, com limite de tamanho e remoção LRU
+    Os arquivos ficam em disco, portanto sobrevivem entre invocações "warm" da Lambda
+
+    O lock protege apenas o índice em memória: leituras, gravações e remoções de arquivos são
+    feitas fora dele, para que threads concorrentes não esperem pelo disco umas das outras
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        Inicializa o cache local
+
+        Args:
+            cache_dir (str): Diretório onde os áudios em cache são armazenados
+            max_bytes (int): Tamanho máximo do cache em bytes
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+        # Índice LRU em memória: chave -> tamanho em bytes (mais recente no final)
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        # Serializa a primeira leitura do diretório (feita fora de _lock)
+        self._load_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_FILE_SUFFIX)
+
+    def _ensure_loaded(self):
+        """
+        Reconstrói o índice LRU a partir do disco na primeira utilização (uma única passagem com scandir)
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self._load()
+
+    def _load(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        found = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(CACHE_FILE_SUFFIX) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name[:-len(CACHE_FILE_SUFFIX)], stat.st_size))
+
+        # Arquivos usados mais recentemente ficam no final do índice
+        with self._lock:
+            for _, key, size in sorted(found):
+                self._entries[key] = size
+                self._total_bytes += size
+            evicted = self._evict()
+            self._loaded = True
+        self._remove_files(evicted)
+
+    def _evict(self) -> list:
+        """
+        Remove do índice as entradas menos usadas recentemente até respeitar o limite de tamanho
+        (deve ser chamado com _lock; os arquivos são removidos depois, com _remove_files)
+
+        Returns:
+            list: Chaves removidas do índice
+        """
+        evicted = []
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(key)
+        return evicted
+
+    def _remove_files(self, keys: list):
+        for key in keys:
+            try:
+                os.remove(self._path_for(key))
+            except FileNotFoundError:
+                pass
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Obtém o áudio em cache para a chave informada
+
+        Args:
+            key (str): Chave gerada por synthesis_cache_key
+
+        Returns:
+            bytes: Conteúdo do áudio, ou None se não estiver em cache
+        """
+        self._ensure_loaded()
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            # Atualiza a posição LRU em memória antes da leitura (evita a remoção durante a leitura)
+            self._entries.move_to_end(key)
+
+        path = self._path_for(key)
+        try:
+            with open(path, 'rb') as cached_file:
+                data = cached_file.read()
+            # mtime atualizado em disco para a ordem LRU do próximo cold start
+            os.utime(path, None)
+        except FileNotFoundError:
+            # Arquivo removido por fora do cache (ex.: limpeza do /tmp)
+            with self._lock:
+                if key in self._entries:
+                    self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> bool:
+        """
+        Armazena o áudio no cache, removendo entradas antigas se necessário
+
+        Args:
+            key (str): Chave gerada por synthesis_cache_key
+            data (bytes): Conteúdo do áudio
+
+        Returns:
+            bool: True se o áudio foi armazenado
+        """
+        size = len(data)
+        if size > self.max_bytes:
+            return False
+
+        self._ensure_loaded()
+
+        # Escrita atômica: evita que leitores concorrentes vejam arquivos parciais
+        path = self._path_for(key)
+        tmp_path = f"{path}.{threading.get_ident()}.part"
+        with open(tmp_path, 'wb') as cached_file:
+            cached_file.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            evicted = self._evict()
+
+        self._remove_files(evicted)
+        return True
+
+    def stats(self) -> Dict:
+        """
+        Retorna estatísticas de uso do cache
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+# Caches compartilhados pelo processo (persistem entre invocações "warm")
+_local_caches = {}
+_local_caches_lock = threading.Lock()
+
+
+def get_local_cache(cache_dir: str, max_bytes: int) -> LocalAudioCache:
+    """
+    Retorna o cache local do diretório informado, criando-o apenas uma vez por processo
+
+    Args:
+        cache_dir (str): Diretório do cache
+        max_bytes (int): Tamanho máximo do cache em bytes
+    """
+    cache_dir = os.path.abspath(cache_dir)
+    with _local_caches_lock:
+        cache = _local_caches.get(cache_dir)
+        if cache is None:
+            cache = LocalAudioCache(cache_dir, max_bytes)
+            _local_caches[cache_dir] = cache
+        else:
+            cache.max_bytes = max_bytes
+        return cache
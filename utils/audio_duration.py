@@ -0,0 +1,260 @@
+from typing import Dict, Optional, Tuple
+
+# Bitrates (kbps) por versão do MPEG e layer: [versão 1 / versão 2 e 2.5][layer 1, 2, 3]
+MP3_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Taxas de amostragem pelos bits de versão do cabeçalho
+MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG 1
+    2: (22050, 24000, 16000),  # MPEG 2
+    0: (11025, 12000, 8000),   # MPEG 2.5
+}
+
+# PCM do Polly: 16 bits, mono, little-endian
+PCM_BYTES_PER_SAMPLE = 2
+
+# Tamanho da tag ID3v1 no fim do arquivo
+ID3V1_SIZE = 128
+
+
+def parse_mp3_header(data: bytes, offset: int) -> Optional[Tuple[int, int, int]]:
+    """
+    Lê o cabeçalho de um frame MP3
+
+    Returns:
+        tuple: (tamanho do frame em bytes, amostras por frame, taxa de amostragem) ou None se inválido
+    """
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+
+    version_bits = (data[offset + 1] >> 3) & 0x03
+    layer_bits = (data[offset + 1] >> 1) & 0x03
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0x03
+    padding = (data[offset + 2] >> 1) & 0x01
+
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    layer = 4 - layer_bits
+    version = 1 if version_bits == 3 else 2
+    bitrate = MP3_BITRATES[(version, layer)][bitrate_index] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version_bits][sample_rate_index]
+
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+
+    samples = 1152 if layer == 2 or version == 1 else 576
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+
+def skip_id3(data: bytes, offset: int = 0) -> int:
+    """
+    Pula uma tag ID3v2 (se existir) a partir da posição informada
+    """
+    if data[offset:offset + 3] == b'ID3' and len(data) >= offset + 10:
+        size = (data[offset + 6] << 21) | (data[offset + 7] << 14) | (data[offset + 8] << 7) | data[offset + 9]
+        footer = 10 if data[offset + 5] & 0x10 else 0
+        return offset + 10 + size + footer
+    return offset
+
+
+def read_vbr_tag(data: bytes, offset: int) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Lê a tag Xing/Info ou VBRI do frame informado, se existir
+
+    Returns:
+        tuple: (número de frames, tamanho do stream em bytes ou None) ou None se o frame não tiver tag
+    """
+    version_bits = (data[offset + 1] >> 3) & 0x03
+    mono = (data[offset + 3] >> 6) == 3
+    if version_bits == 3:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b'Xing', b'Info'):
+        flags = data[xing + 7]
+        frames = int.from_bytes(data[xing + 8:xing + 12], 'big') if flags & 0x01 else None
+        field = xing + 12 if flags & 0x01 else xing + 8
+        stream_bytes = int.from_bytes(data[field:field + 4], 'big') if flags & 0x02 else None
+        return (frames, stream_bytes) if frames is not None else (0, None)
+
+    vbri = offset + 36
+    if data[vbri:vbri + 4] == b'VBRI':
+        return int.from_bytes(data[vbri + 14:vbri + 18], 'big'), int.from_bytes(data[vbri + 10:vbri + 14], 'big')
+    return None
+
+
+# Cache (tamanho do frame, duração do frame) por valor dos bytes 1-2 do cabeçalho, preenchido sob demanda
+_frames: Dict[int, Optional[Tuple[int, float]]] = {}
+
+
+def _frame_info(key: int) -> Optional[Tuple[int, float]]:
+    """
+    Interpreta e guarda no cache os bytes 1-2 de um cabeçalho de frame
+    """
+    header = parse_mp3_header(bytes((0xFF, key >> 8, key & 0xFF, 0)), 0)
+    frame = (header[0], header[1] / header[2]) if header is not None else None
+    _frames[key] = frame
+    return frame
+
+
+def cbr_duration(data: bytes, offset: int, frame_size: int) -> Optional[float]:
+    """
+    Calcula a duração de um stream CBR único (como o MP3 do Polly) pelo tamanho em bytes e o
+    bitrate do primeiro frame, sem percorrer os frames
+    Apenas o último frame é conferido; o buffer não deve ser formado por vários MP3 concatenados
+
+    Args:
+        data (bytes): Conteúdo do MP3
+        offset (int): Posição do primeiro frame de áudio
+        frame_size (int): Tamanho do primeiro frame em bytes
+
+    Returns:
+        float: Duração em segundos, ou None se o último frame tiver outro bitrate ou taxa de amostragem
+    """
+    end = len(data)
+    if end - ID3V1_SIZE >= offset and data[end - ID3V1_SIZE:end - ID3V1_SIZE + 3] == b'TAG':
+        end -= ID3V1_SIZE
+
+    # O último frame precisa ter o mesmo bitrate e taxa de amostragem do primeiro (bit de padding ignorado)
+    last = data.rfind(data[offset:offset + 2], max(offset, end - 2 * frame_size - 4), end - 3)
+    if last < 0 or (data[last + 2] & 0xFC) != (data[offset + 2] & 0xFC):
+        return None
+
+    version_bits = (data[offset + 1] >> 3) & 0x03
+    layer = 4 - ((data[offset + 1] >> 1) & 0x03)
+    bitrate = MP3_BITRATES[(1 if version_bits == 3 else 2, layer)][data[offset + 2] >> 4] * 1000
+    return (end - offset) * 8 / bitrate
+
+
+def mp3_duration(data: bytes, concatenated: bool = False) -> Optional[float]:
+    """
+    Calcula a duração de um MP3 lendo apenas os cabeçalhos dos frames (sem decodificar o áudio)
+
+    O MP3 do Polly é CBR: sem tag Xing/VBRI no primeiro frame, a duração vem do tamanho em bytes e
+    do bitrate desse frame (cbr_duration). Com a tag, usa o número de frames dela quando ela cobre o
+    buffer inteiro; nos demais casos, e com concatenated=True, percorre os frames.
+
+    Args:
+        data (bytes): Conteúdo do MP3
+        concatenated (bool): Se o buffer pode ser formado por vários MP3 concatenados
+
+    Returns:
+        float: Duração em segundos, ou None se nenhum frame válido for encontrado
+    """
+    frames_table = _frames
+
+    offset = skip_id3(data)
+    length = len(data)
+    duration = 0.0
+    found = False
+    check_tag = True
+
+    while offset < length - 3:
+        frame = None
+        if data[offset] == 0xFF:
+            key = (data[offset + 1] << 8) | data[offset + 2]
+            frame = frames_table[key] if key in frames_table else _frame_info(key)
+        if frame is None:
+            # Tag ID3 no meio do buffer (chunks concatenados) ou lixo: procura o próximo sincronismo
+            next_offset = skip_id3(data, offset)
+            if next_offset == offset:
+                next_offset = data.find(b'\xff', offset + 1)
+                if next_offset < 0:
+                    break
+            offset = next_offset
+            check_tag = True
+            continue
+
+        frame_size, frame_duration = frame
+        if check_tag:
+            # Tags Xing/VBRI só aparecem no primeiro frame de cada stream
+            check_tag = False
+            tag = read_vbr_tag(data, offset)
+            if tag is not None:
+                frames, stream_bytes = tag
+                # Tag no início cobrindo todo o buffer (ignora até 128 bytes de uma tag ID3v1 no fim)
+                if not found and frames and stream_bytes and offset + stream_bytes >= length - 128:
+                    return frames * frame_duration
+                # Frame de tag não contém áudio
+                offset += frame_size
+                continue
+            if not found and not concatenated:
+                cbr = cbr_duration(data, offset, frame_size)
+                if cbr is not None:
+                    return cbr
+
+        found = True
+        duration += frame_duration
+        offset += frame_size
+
+    return duration if found else None
+
+
+def pcm_duration(data: bytes, sample_rate: int, channels: int = 1) -> float:
+    """
+    Calcula a duração de um áudio PCM 16 bits (com ou sem cabeçalho WAV)
+
+    Args:
+        data (bytes): Conteúdo do áudio
+        sample_rate (int): Taxa de amostragem em Hz
+        channels (int): Número de canais
+    """
+    size = len(data)
+    if data[:4] == b'RIFF' and data[8:12] == b'WAVE':
+        size -= 44
+    return max(size, 0) / (sample_rate * channels * PCM_BYTES_PER_SAMPLE)
+
+
+def ogg_duration(data: bytes) -> Optional[float]:
+    """
+    Calcula a duração de um Ogg Vorbis pela posição (granule) da última página
+
+    Args:
+        data (bytes): Conteúdo do Ogg
+    """
+    ident = data.find(b'\x01vorbis')
+    last_page = data.rfind(b'OggS')
+    if ident < 0 or last_page < 0 or last_page + 14 > len(data):
+        return None
+
+    sample_rate = int.from_bytes(data[ident + 12:ident + 16], 'little')
+    granule = int.from_bytes(data[last_page + 6:last_page + 14], 'little')
+    if not sample_rate or granule == 0xFFFFFFFFFFFFFFFF:
+        return None
+    return granule / sample_rate
+
+
+def audio_duration(data: bytes, output_format: str, sample_rate: Optional[int] = None,
+                   concatenated: bool = False) -> Optional[float]:
+    """
+    Retorna a duração real do áudio gerado pelo Polly a partir dos cabeçalhos
+
+    Args:
+        data (bytes): Conteúdo do áudio em memória
+        output_format (str): Formato do Polly ('mp3', 'pcm', 'ogg_vorbis')
+        sample_rate (int, optional): Taxa de amostragem (obrigatória para 'pcm')
+        concatenated (bool): Se o áudio pode ser formado por várias respostas do Polly concatenadas
+
+    Returns:
+        float: Duração em segundos, ou None se o formato não puder ser lido
+    """
+    if not data:
+        return 0.0
+    if output_format == 'mp3':
+        return mp3_duration(data, concatenated)
+    if output_format == 'pcm':
+        return pcm_duration(data, int(sample_rate or 16000))
+    if output_format == 'ogg_vorbis':
+        return ogg_duration(data)
+    return None
@@ -0,0 +1,131 @@
+import struct
+from typing import Iterable, Optional
+
+from utils.audio_duration import PCM_BYTES_PER_SAMPLE, parse_mp3_header, read_vbr_tag, skip_id3
+
+# Extensão e Content-Type do arquivo final quando o formato do Polly precisa de um contêiner
+CONTAINERS = {
+    'pcm': ('wav', 'audio/wav'),
+    'mp3': ('mp3', 'audio/mpeg'),
+    'ogg_vorbis': ('ogg', 'audio/ogg')
+}
+
+# Tamanho do cabeçalho WAV canônico (RIFF + fmt + data)
+WAV_HEADER_BYTES = 44
+
+# Tamanho usado no cabeçalho quando o total só é conhecido no fim (streaming)
+WAV_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def container_extension(output_format: str) -> str:
+    """
+    Retorna a extensão do arquivo final para o formato do Polly
+    """
+    return CONTAINERS.get(output_format, (output_format, None))[0]
+
+
+def wav_header(sample_rate: int, data_size: Optional[int] = None, channels: int = 1) -> bytes:
+    """
+    Monta o cabeçalho WAV para PCM 16 bits
+
+    Args:
+        sample_rate (int): Taxa de amostragem em Hz
+        data_size (int, optional): Tamanho dos dados de áudio (None = desconhecido, para streaming)
+        channels (int): Número de canais
+    """
+    if data_size is None:
+        riff_size = data_size = WAV_UNKNOWN_SIZE
+    else:
+        riff_size = min(data_size + WAV_HEADER_BYTES - 8, WAV_UNKNOWN_SIZE)
+    block_align = channels * PCM_BYTES_PER_SAMPLE
+    return struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', riff_size, b'WAVE', b'fmt ', 16, 1, channels,
+                       sample_rate, sample_rate * block_align, block_align, PCM_BYTES_PER_SAMPLE * 8,
+                       b'data', min(data_size, WAV_UNKNOWN_SIZE))
+
+
+class AudioStitcher:
+    """
+    Concatena o áudio de vários chunks do Polly em um único arquivo válido, sem recodificar
+
+    MP3: remove tags ID3 repetidas e frames Xing/Info (que descreveriam apenas o próprio chunk),
+    evitando que o player reinicie o decodificador ou calcule a duração errada.
+    PCM: os dados são contínuos; o contêiner WAV é dado por header(), com o tamanho final
+    (arquivos e memória) ou com tamanho desconhecido (streaming).
+    Ogg Vorbis: os chunks são mantidos como streams encadeados (chained Ogg).
+    """
+
+    def __init__(self, output_format: str, sample_rate: int):
+        """
+        Args:
+            output_format (str): Formato do Polly ('mp3', 'pcm', 'ogg_vorbis')
+            sample_rate (int): Taxa de amostragem em Hz
+        """
+        self.output_format = output_format
+        self.sample_rate = int(sample_rate)
+        self.data_size = 0
+        self._chunks = 0
+
+    @property
+    def extension(self) -> str:
+        return container_extension(self.output_format)
+
+    @property
+    def content_type(self) -> str:
+        return CONTAINERS.get(self.output_format, (None, 'application/octet-stream'))[1]
+
+    def header(self, data_size: Optional[int] = None) -> bytes:
+        """
+        Retorna o cabeçalho do contêiner (apenas PCM precisa de um)
+
+        Args:
+            data_size (int, optional): Tamanho total dos dados (padrão: desconhecido, para streaming)
+        """
+        if self.output_format != 'pcm':
+            return b''
+        return wav_header(self.sample_rate, data_size)
+
+    def feed(self, chunk: bytes) -> bytes:
+        """
+        Recebe o áudio de um chunk e retorna os bytes a acrescentar à saída
+
+        Args:
+            chunk (bytes): Áudio do chunk como retornado pelo Polly
+        """
+        if self.output_format == 'mp3':
+            chunk = self._strip_mp3(chunk, keep_id3=self._chunks == 0)
+        self._chunks += 1
+        self.data_size += len(chunk)
+        return chunk
+
+    @staticmethod
+    def _strip_mp3(chunk: bytes, keep_id3: bool) -> bytes:
+        id3_end = skip_id3(chunk)
+        start = id3_end
+        end = len(chunk)
+
+        # Frame Xing/Info/VBRI no início do chunk (não contém áudio)
+        header = parse_mp3_header(chunk, start)
+        if header is not None and read_vbr_tag(chunk, start) is not None:
+            start += header[0]
+
+        # Tag ID3v1 no fim do chunk
+        if end - start >= 128 and chunk[end - 128:end - 125] == b'TAG':
+            end -= 128
+
+        if start == 0 and end == len(chunk):
+            return chunk
+        return (chunk[:id3_end] if keep_id3 else b'') + chunk[start:end]
+
+
+def stitch_audio(chunks: Iterable[bytes], output_format: str, sample_rate: int) -> bytes:
+    """
+    Concatena os chunks em memória com o contêiner correto (cabeçalho WAV com tamanho final para PCM)
+
+    Args:
+        chunks (iterable): Áudio de cada chunk, na ordem
+        output_format (str): Formato do Polly
+        sample_rate (int): Taxa de amostragem em Hz
+    """
+    stitcher = AudioStitcher(output_format, sample_rate)
+    parts = [stitcher.feed(chunk) for chunk in chunks]
+    return stitcher.header(stitcher.data_size) + b''.join(parts)
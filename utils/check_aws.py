@@ -16,6 +16,10 @@ class AWS_SERVICES:
 
     
     def login_session_AWS(self):
+        # Reaproveita a sessão já criada no construtor, evitando criar uma segunda sessão.
+        if getattr(self, 'session', None) is not None:
+            return self.session
+
         # Função que cria uma sessão AWS usando as credenciais fornecidas (ACCESS_KEY, SECRET_KEY, SESSION_TOKEN).
         session = boto3.Session(aws_access_key_id=self.ACESS_KEY, 
                                 aws_secret_access_key=self.SECRET_KEY, 
@@ -0,0 +1,75 @@
+import os
+import threading
+from typing import Optional
+
+# Conexões HTTP mantidas por cliente (deve cobrir o número de chamadas simultâneas)
+MAX_POOL_CONNECTIONS = int(os.getenv('AWS_MAX_POOL_CONNECTIONS', '32'))
+
+# Retentativas do botocore por perfil de cliente (serviço, perfil). O perfil 'synthesis' do Polly é usado
+# apenas no synthesize_speech, repetido pelo limitador de taxa (utils.rate_limiter), que precisa enxergar
+# cada limitação para ajustar a taxa; os demais clientes mantêm as retentativas padrão do botocore
+CLIENT_RETRIES = {
+    ('polly', 'synthesis'): {'mode': 'standard', 'total_max_attempts': 1}
+}
+
+# Sessão e clientes compartilhados pelo processo (reaproveitados entre invocações "warm")
+_session = None
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Retorna a sessão AWS do processo, criando-a apenas na primeira chamada
+    O boto3 e as credenciais só são carregados aqui, nunca na importação dos módulos
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            from utils.check_aws import AWS_SERVICES
+            _session = AWS_SERVICES().session
+        return _session
+
+
+def get_client(service_name: str, region_name: str = 'us-east-1', profile: Optional[str] = None):
+    """
+    Retorna um cliente boto3 compartilhado para o serviço e região informados
+
+    Os clientes são criados uma única vez por processo, com pool de conexões
+    dimensionado para chamadas concorrentes e TCP keep-alive habilitado.
+
+    Args:
+        service_name (str): Nome do serviço AWS (ex.: 'polly', 's3')
+        region_name (str): Região AWS do cliente
+        profile (str, optional): Perfil do cliente em CLIENT_RETRIES (ex.: 'synthesis'); None = retentativas padrão
+    """
+    key = (service_name, region_name, profile)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    session = get_session()
+    from botocore.config import Config
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            config = Config(max_pool_connections=MAX_POOL_CONNECTIONS, tcp_keepalive=True,
+                            retries=CLIENT_RETRIES.get((service_name, profile)))
+            client = session.client(service_name, region_name=region_name, config=config)
+            _clients[key] = client
+        return client
+
+
+def register_client(service_name: str, region_name: str, client):
+    """
+    Registra um cliente já criado (ex.: stub para testes e benchmarks locais) para todos os perfis do serviço
+
+    Args:
+        service_name (str): Nome do serviço AWS
+        region_name (str): Região AWS do cliente
+        client: Cliente a ser usado no lugar do cliente boto3
+    """
+    profiles = [None] + [profile for service, profile in CLIENT_RETRIES if service == service_name]
+    with _lock:
+        for profile in profiles:
+            _clients[(service_name, region_name, profile)] = client
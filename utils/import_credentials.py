@@ -1,9 +1,10 @@
 import os
-from dotenv import load_dotenv
 
 def aws_credentials():
-    # Carregar variáveis de ambiente do arquivo .env
-    load_dotenv()
+    # Carregar variáveis de ambiente do arquivo .env (apenas fora da Lambda, onde o .env não existe)
+    if not os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+        from dotenv import load_dotenv
+        load_dotenv()
 
     # Acessa as variáveis definidas
     ACESS_KEY = os.getenv('AWS_ACCESS_KEY_ID')
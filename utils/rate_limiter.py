@@ -0,0 +1,305 @@
+import os
+import time
+import asyncio
+import random
+import threading
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+
+# Códigos de erro que indicam limitação de taxa pela AWS
+THROTTLING_ERROR_CODES = frozenset({
+    'ThrottlingException', 'Throttling', 'TooManyRequestsException',
+    'RequestLimitExceeded', 'ServiceQuotaExceededException', 'SlowDown'
+})
+
+# Falhas transitórias do serviço, repetidas sem reduzir a taxa
+TRANSIENT_ERROR_CODES = frozenset({
+    'ServiceFailureException', 'ServiceUnavailable', 'InternalFailure', 'InternalServerError'
+})
+
+# Falhas de conexão (endpoint inacessível, conexão encerrada, tempo de leitura esgotado), repetidas sem reduzir a taxa
+CONNECTION_ERRORS = (BotoConnectionError, HTTPClientError)
+
+# Cotas padrão do synthesize_speech por engine (transações por segundo e rajada), ajustáveis por ambiente
+ENGINE_QUOTAS = {
+    'standard': (float(os.getenv('TTS_POLLY_STANDARD_TPS', '80')), float(os.getenv('TTS_POLLY_STANDARD_BURST', '100'))),
+    'neural': (float(os.getenv('TTS_POLLY_NEURAL_TPS', '8')), float(os.getenv('TTS_POLLY_NEURAL_BURST', '10'))),
+    'long-form': (float(os.getenv('TTS_POLLY_LONG_FORM_TPS', '8')), float(os.getenv('TTS_POLLY_LONG_FORM_BURST', '10'))),
+    'generative': (float(os.getenv('TTS_POLLY_GENERATIVE_TPS', '8')), float(os.getenv('TTS_POLLY_GENERATIVE_BURST', '10')))
+}
+
+# Tentativas e backoff para chamadas limitadas
+MAX_ATTEMPTS = int(os.getenv('TTS_POLLY_MAX_ATTEMPTS', '5'))
+BACKOFF_BASE_SECONDS = 0.1
+BACKOFF_MAX_SECONDS = 5.0
+
+T = TypeVar('T')
+
+
+def _error_code(error: ClientError) -> Optional[str]:
+    return error.response.get('Error', {}).get('Code')
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """
+    Verifica se o erro retornado pela AWS é de limitação de taxa
+    """
+    return isinstance(error, ClientError) and _error_code(error) in THROTTLING_ERROR_CODES
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Verifica se o erro é transitório (limitação, falha 5xx do serviço ou falha de conexão)
+    e a mesma requisição pode ter sucesso se repetida mais tarde
+    """
+    if isinstance(error, CONNECTION_ERRORS):
+        return True
+    if not isinstance(error, ClientError):
+        return False
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode') or 0
+    return (is_throttling_error(error) or _error_code(error) in TRANSIENT_ERROR_CODES or status >= 500)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket compartilhado entre threads, com taxa adaptativa (AIMD):
+    a taxa cai pela metade a cada limitação recebida e sobe aos poucos a cada sucesso,
+    sem passar da cota configurada
+    """
+
+    def __init__(self, max_rate: float, burst: Optional[float] = None, min_rate: float = 0.5,
+                 increase_per_success: Optional[float] = None):
+        """
+        Args:
+            max_rate (float): Taxa máxima em chamadas por segundo (cota do serviço)
+            burst (float, optional): Capacidade do bucket (padrão: max_rate)
+            min_rate (float): Taxa mínima após sucessivas limitações
+            increase_per_success (float, optional): Aumento da taxa por sucesso (padrão: 5% da taxa máxima)
+        """
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.capacity = burst or max_rate
+        self.increase_per_success = increase_per_success or max_rate * 0.05
+
+        self.rate = max_rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.waiting = 0
+        self.throttles = 0
+        self.calls = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self) -> float:
+        """
+        Tenta obter um token sem esperar
+
+        Returns:
+            float: 0 se o token foi obtido, ou a espera estimada até o próximo token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.calls += 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Aguarda um token disponível
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera em segundos (None = sem limite)
+
+        Returns:
+            bool: True se o token foi obtido, False se o tempo de espera se esgotou
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                wait = self._take()
+                if not wait:
+                    return True
+
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+    async def acquire_async(self):
+        """
+        Versão de acquire() para asyncio: aguarda o token sem bloquear o loop de eventos
+        """
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                wait = self._take()
+                if not wait:
+                    return
+                await asyncio.sleep(wait)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+    def on_success(self):
+        """
+        Aumenta a taxa gradualmente após uma chamada bem-sucedida
+        """
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.increase_per_success)
+
+    def on_throttle(self):
+        """
+        Reduz a taxa pela metade e esvazia o bucket após uma limitação do serviço
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0)
+            self.throttles += 1
+
+    def stats(self) -> Dict:
+        """
+        Retorna a taxa atual e a fila de espera (para monitoramento)
+        """
+        with self._lock:
+            return {
+                'rate': round(self.rate, 3),
+                'max_rate': self.max_rate,
+                'queue_depth': self.waiting,
+                'calls': self.calls,
+                'throttles': self.throttles
+            }
+
+
+def _retry_delay(limiter: AdaptiveRateLimiter, error: Exception, attempt: int, max_attempts: int,
+                 base_delay: float, max_delay: float) -> Optional[float]:
+    """
+    Registra a falha da tentativa no limitador e retorna a espera até a próxima
+
+    Returns:
+        float: Espera em segundos, ou None se o erro não deve ser repetido
+    """
+    if is_throttling_error(error):
+        limiter.on_throttle()
+    elif isinstance(error, ClientError) and _error_code(error) not in TRANSIENT_ERROR_CODES:
+        return None
+    if attempt >= max_attempts:
+        return None
+    # Full jitter: evita que as chamadas limitadas voltem todas ao mesmo tempo
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_retry(limiter: AdaptiveRateLimiter, function: Callable[[], T], max_attempts: int = MAX_ATTEMPTS,
+                    base_delay: float = BACKOFF_BASE_SECONDS, max_delay: float = BACKOFF_MAX_SECONDS) -> T:
+    """
+    Executa a chamada respeitando o limitador e repetindo limitações (e falhas transitórias
+    do serviço ou da conexão) com backoff exponencial e jitter
+
+    Args:
+        limiter (AdaptiveRateLimiter): Limitador do serviço/engine
+        function (callable): Chamada sem argumentos
+        max_attempts (int): Número máximo de tentativas
+        base_delay (float): Espera base do backoff em segundos
+        max_delay (float): Espera máxima entre tentativas em segundos
+
+    Returns:
+        Resultado da chamada (o último erro é propagado se as tentativas se esgotarem)
+    """
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            result = function()
+        except (ClientError,) + CONNECTION_ERRORS as e:
+            attempt += 1
+            delay = _retry_delay(limiter, e, attempt, max_attempts, base_delay, max_delay)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        limiter.on_success()
+        return result
+
+
+async def call_with_retry_async(limiter: AdaptiveRateLimiter, function: Callable[[], Awaitable[T]],
+                                max_attempts: int = MAX_ATTEMPTS, base_delay: float = BACKOFF_BASE_SECONDS,
+                                max_delay: float = BACKOFF_MAX_SECONDS) -> T:
+    """
+    Versão de call_with_retry para asyncio: as esperas do limitador e do backoff
+    não ocupam threads nem bloqueiam o loop de eventos
+
+    Args:
+        limiter (AdaptiveRateLimiter): Limitador do serviço/engine
+        function (callable): Função sem argumentos que retorna a corrotina da chamada
+        max_attempts (int): Número máximo de tentativas
+        base_delay (float): Espera base do backoff em segundos
+        max_delay (float): Espera máxima entre tentativas em segundos
+
+    Returns:
+        Resultado da chamada (o último erro é propagado se as tentativas se esgotarem)
+    """
+    attempt = 0
+    while True:
+        await limiter.acquire_async()
+        try:
+            result = await function()
+        except (ClientError,) + CONNECTION_ERRORS as e:
+            attempt += 1
+            delay = _retry_delay(limiter, e, attempt, max_attempts, base_delay, max_delay)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        limiter.on_success()
+        return result
+
+
+# Limitadores compartilhados pelo processo, um por engine do Polly
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(engine: str) -> AdaptiveRateLimiter:
+    """
+    Retorna o limitador da engine informada (chave de ENGINE_QUOTAS), criando-o apenas uma vez por processo
+    As cotas do Polly valem por conta/região; cada processo usa a cota inteira como teto
+    e a adaptação às limitações reparte a capacidade entre instâncias
+
+    Raises:
+        ValueError: Se a engine não tiver cota configurada
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(engine)
+        if limiter is None:
+            if engine not in ENGINE_QUOTAS:
+                raise ValueError(f"No rate limit quota configured for Polly engine '{engine}'")
+            max_rate, burst = ENGINE_QUOTAS[engine]
+            limiter = AdaptiveRateLimiter(max_rate, burst)
+            _limiters[engine] = limiter
+        return limiter
+
+
+def rate_limiter_stats() -> Dict:
+    """
+    Retorna as estatísticas de todos os limitadores criados no processo
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {engine: limiter.stats() for engine, limiter in limiters.items()}
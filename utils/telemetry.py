@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import functools
+import threading
+from typing import Callable, Dict, Optional
+
+# Nível de log (DEBUG, INFO, WARNING, ERROR); em produção use INFO ou acima
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+LOG_LEVEL = LOG_LEVELS.get(os.getenv('TTS_LOG_LEVEL', 'INFO').upper(), LOG_LEVELS['INFO'])
+
+# Métricas por invocação no CloudWatch Embedded Metric Format (uma linha JSON por invocação)
+METRICS_ENABLED = os.getenv('TTS_METRICS_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+METRICS_NAMESPACE = os.getenv('TTS_METRICS_NAMESPACE', 'TextToSpeech')
+
+
+def log_enabled(level: str) -> bool:
+    """
+    Verifica se o nível informado está habilitado (use antes de montar mensagens caras)
+    """
+    return LOG_LEVELS[level] >= LOG_LEVEL
+
+
+def log(level: str, message: str):
+    """
+    Imprime a mensagem com o prefixo do nível, se o nível estiver habilitado
+    """
+    if LOG_LEVELS[level] >= LOG_LEVEL:
+        print(f'[{level}] {message}')
+
+
+def debug(message: str):
+    log('DEBUG', message)
+
+
+def info(message: str):
+    log('INFO', message)
+
+
+def error(message: str):
+    log('ERROR', message)
+
+
+class InvocationMetrics:
+    """
+    Acumula o tempo de cada etapa de uma invocação e gera a linha de métricas EMF
+    Etapas executadas em paralelo (chunks, itens de lote) têm os tempos somados
+    """
+
+    def __init__(self, handler: str, cold_start: bool = False):
+        self.handler = handler
+        self.cold_start = cold_start
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.counts = {}
+        self.properties = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        """
+        Soma a duração de uma etapa
+        """
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def set(self, **properties):
+        """
+        Registra propriedades da invocação (não viram métricas, apenas campos pesquisáveis no log)
+        """
+        with self._lock:
+            self.properties.update(properties)
+
+    def to_emf(self) -> Dict:
+        """
+        Monta o documento no CloudWatch Embedded Metric Format
+        """
+        with self._lock:
+            stages = {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+            counts = dict(self.counts)
+            properties = dict(self.properties)
+
+        stages['total'] = round((time.perf_counter() - self.started) * 1000, 3)
+        document = {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': METRICS_NAMESPACE,
+                    'Dimensions': [['Handler']],
+                    'Metrics': [{'Name': name, 'Unit': 'Milliseconds'} for name in stages]
+                }]
+            },
+            'Handler': self.handler,
+            'cold_start': self.cold_start,
+            'stage_counts': counts
+        }
+        document.update(properties)
+        document.update(stages)
+        return document
+
+
+class _Stage:
+    """
+    Context manager que mede uma etapa na invocação ativa (sem custo fora de uma invocação)
+    """
+
+    __slots__ = ('name', 'metrics', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.metrics = _current
+        if self.metrics is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.metrics is not None:
+            self.metrics.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+# Invocação ativa no processo (a Lambda executa uma invocação por vez em cada instância)
+_current: Optional[InvocationMetrics] = None
+_cold_start = True
+
+
+def stage(name: str) -> _Stage:
+    """
+    Mede a duração de uma etapa da invocação ativa
+
+    Exemplo:
+        with stage('polly_call'):
+            response = polly_client.synthesize_speech(**params)
+    """
+    return _Stage(name)
+
+
+def current_metrics() -> Optional[InvocationMetrics]:
+    """
+    Retorna as métricas da invocação ativa, se houver
+    """
+    return _current
+
+
+def instrumented_handler(name: str) -> Callable:
+    """
+    Decorator para handlers da Lambda: mede a invocação e emite uma linha EMF no fim
+    Handlers chamados por outro handler instrumentado registram na mesma invocação
+    """
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(event, *args, **kwargs):
+            global _current, _cold_start
+            if _current is not None:
+                return handler(event, *args, **kwargs)
+
+            _current = InvocationMetrics(name, cold_start=_cold_start)
+            _cold_start = False
+            try:
+                response = handler(event, *args, **kwargs)
+                if isinstance(response, dict) and 'statusCode' in response:
+                    _current.set(status_code=response['statusCode'])
+                return response
+            finally:
+                metrics, _current = _current, None
+                if METRICS_ENABLED:
+                    print(json.dumps(metrics.to_emf(), separators=(',', ':')))
+        return wrapper
+    return decorator
@@ -0,0 +1,308 @@
+import re
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+# Limites do synthesize_speech: caracteres cobrados (sem tags SSML) e tamanho total da requisição
+MAX_BILLED_CHARACTERS = 3000
+MAX_TOTAL_CHARACTERS = 6000
+
+# Abreviações comuns que terminam em ponto mas não encerram a sentença
+ABBREVIATIONS = frozenset({
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'sra', 'srta', 'jr', 'st', 'vs', 'etc',
+    'no', 'nº', 'fig', 'inc', 'ltd', 'co', 'corp', 'av', 'gen', 'col', 'lt', 'capt',
+    'e.g', 'i.e', 'approx', 'dept', 'est', 'vol', 'p', 'pp'
+})
+
+# Tags SSML (inclui comentários e instruções de processamento)
+SSML_TAG = re.compile(r'<[^>]*>')
+
+# Fim de sentença: pontuação final (com aspas/parênteses de fechamento) seguida de espaço ou do fim do
+# trecho (no SSML, pontuação colada a uma tag), ou quebra de linha
+SENTENCE_END = re.compile(r'[.!?…]+["\'”’»)\]]*(?:\s+|$)|\s*\n\s*')
+
+# Acrônimos com pontos (U.S., U.N.S.) e iniciais (J. Smith)
+DOTTED_ACRONYM = re.compile(r'(?:[A-Za-z]\.)*[A-Za-z]')
+
+# Palavras (com o espaço seguinte) para a quebra de sentenças longas demais
+WORD = re.compile(r'\S+\s*|\s+')
+
+TAG_NAME = re.compile(r'<\s*([\w:.-]+)')
+
+# Tags SSML de sentença e parágrafo: o fechamento sempre encerra uma sentença
+BOUNDARY_TAGS = frozenset({'s', 'p'})
+
+# Espaços ignorados na escolha dos cortes definidos pelo conteúdo
+WHITESPACE = re.compile(r'\s+')
+
+# Parte de uma sentença: (conteúdo, é_tag)
+Part = Tuple[str, bool]
+
+
+def _is_abbreviation(text: str, start: int, dot: int) -> bool:
+    """
+    Verifica se o ponto em text[dot] pertence a uma abreviação e não encerra a sentença
+    """
+    word_start = max(text.rfind(' ', start, dot), text.rfind('\n', start, dot), start - 1) + 1
+    word = text[word_start:dot].lstrip('"\'“‘«([')
+    if not word:
+        return False
+    return word.lower() in ABBREVIATIONS or (len(word) <= 8 and DOTTED_ACRONYM.fullmatch(word) is not None)
+
+
+def _iter_text_sentences(text: str) -> Iterator[Tuple[str, bool]]:
+    """
+    Divide um trecho de texto (sem tags) em sentenças, preservando os espaços
+
+    Yields:
+        tuple: (trecho, True se o trecho encerra uma sentença)
+    """
+    position = 0
+    for match in SENTENCE_END.finditer(text):
+        punctuation = match.group()
+        if punctuation[0] == '.' and '\n' not in punctuation and not punctuation.startswith('..'):
+            if _is_abbreviation(text, position, match.start()):
+                continue
+        yield text[position:match.end()], True
+        position = match.end()
+
+    if position < len(text):
+        yield text[position:], False
+
+
+def _iter_sentences(text: str, ssml: bool) -> Iterator[List[Part]]:
+    """
+    Percorre o texto uma única vez, agrupando texto e tags em sentenças
+    Tags SSML nunca são divididas; </s> e </p> encerram a sentença, e a pontuação final colada
+    a uma tag a encerra depois das tags de fechamento que a seguem (ex.: 'fim.</emphasis>')
+    """
+    sentence = []
+    # A sentença atual terminou em pontuação colada à próxima tag
+    ended = False
+
+    if ssml:
+        position = 0
+        segments = []
+        for match in SSML_TAG.finditer(text):
+            if match.start() > position:
+                segments.append((text[position:match.start()], False))
+            segments.append((match.group(), True))
+            position = match.end()
+        if position < len(text):
+            segments.append((text[position:], False))
+    else:
+        segments = [(text, False)]
+
+    for segment, is_tag in segments:
+        if is_tag:
+            closing = segment.startswith('</')
+            if ended and not closing:
+                yield sentence
+                sentence = []
+                ended = False
+            sentence.append((segment, True))
+            if closing and segment[2:-1].strip() in BOUNDARY_TAGS:
+                yield sentence
+                sentence = []
+                ended = False
+            continue
+
+        if ended:
+            yield sentence
+            sentence = []
+            ended = False
+
+        for piece, ends_sentence in _iter_text_sentences(segment):
+            sentence.append((piece, False))
+            if ends_sentence:
+                if not piece[-1].isspace():
+                    ended = True
+                    continue
+                yield sentence
+                sentence = []
+
+    if sentence:
+        yield sentence
+
+
+class _ChunkPacker:
+    """
+    Agrupa sentenças em chunks o mais próximos possível do limite do Polly
+    Mantém a pilha de tags SSML abertas para fechá-las no fim de um chunk e reabri-las no seguinte
+    """
+
+    def __init__(self, max_billed: int, max_total: int, first_max_billed: Optional[int] = None):
+        self.max_total = max_total
+
+        # O primeiro chunk pode ter um limite menor (reduz a latência até o primeiro áudio)
+        self.chunk_max_billed = max_billed
+        self.max_billed = min(first_max_billed, max_billed) if first_max_billed else max_billed
+
+        # Pilha de tags abertas: (nome, tag de abertura)
+        self.stack = []
+        self._reset()
+
+    def _reset(self):
+        self.parts = [tag for _, tag in self.stack]
+        self.billed = 0
+        self.total = sum(len(tag) for tag in self.parts)
+        self.has_text = False
+
+    @staticmethod
+    def _apply_tag(stack: list, tag: str):
+        if tag.startswith('</'):
+            name = tag[2:-1].strip()
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == name:
+                    del stack[depth:]
+                    break
+        elif not tag.endswith('/>') and not tag.startswith(('<!', '<?')):
+            match = TAG_NAME.match(tag)
+            if match:
+                stack.append((match.group(1), tag))
+
+    @staticmethod
+    def _closing_length(stack: list) -> int:
+        return sum(len(name) + 3 for name, _ in stack)
+
+    def _flush(self) -> Optional[str]:
+        closing = ''.join(f'</{name}>' for name, _ in reversed(self.stack))
+        chunk = (''.join(self.parts) + closing).strip() if self.has_text else None
+        self._reset()
+        if chunk:
+            self.max_billed = self.chunk_max_billed
+        return chunk
+
+    def add(self, parts: List[Part], allow_split: bool = True) -> Iterator[str]:
+        """
+        Adiciona uma sentença, emitindo os chunks que forem completados
+
+        Args:
+            parts (list): Partes da sentença (texto e tags)
+            allow_split (bool): Se uma sentença maior que um chunk pode ser quebrada em palavras
+        """
+        billed = 0
+        total = 0
+        has_text = False
+        stack = self.stack
+        for content, is_tag in parts:
+            total += len(content)
+            if is_tag:
+                if stack is self.stack:
+                    stack = list(self.stack)
+                self._apply_tag(stack, content)
+            else:
+                billed += len(content)
+                has_text = has_text or not content.isspace()
+
+        fits = (self.billed + billed <= self.max_billed and
+                self.total + total + self._closing_length(stack) <= self.max_total)
+
+        if not fits and self.has_text:
+            chunk = self._flush()
+            if chunk:
+                yield chunk
+            fits = (billed <= self.max_billed and
+                    self.total + total + self._closing_length(stack) <= self.max_total)
+
+        if not fits and allow_split:
+            # Sentença maior que um chunk inteiro: quebra em palavras
+            yield from self._add_words(parts)
+            return
+
+        self.parts.extend(content for content, _ in parts)
+        self.billed += billed
+        self.total += total
+        self.has_text = self.has_text or has_text
+        self.stack = stack
+
+    def _add_words(self, parts: List[Part]) -> Iterator[str]:
+        for content, is_tag in parts:
+            if is_tag:
+                yield from self.add([(content, True)], allow_split=False)
+                continue
+
+            for match in WORD.finditer(content):
+                word = match.group()
+                limit = min(self.max_billed,
+                            self.max_total - self.total - self._closing_length(self.stack))
+                if len(word) <= limit:
+                    yield from self.add([(word, False)], allow_split=False)
+                    continue
+
+                # Palavra maior que o limite: corte direto por caracteres
+                step = max(min(self.max_billed, self.max_total - self._closing_length(self.stack)), 1)
+                for start in range(0, len(word), step):
+                    yield from self.add([(word[start:start + step], False)], allow_split=False)
+
+    def finish(self) -> Iterator[str]:
+        chunk = self._flush()
+        if chunk:
+            yield chunk
+
+
+def _is_content_boundary(parts: List[Part], average_chars: int) -> bool:
+    """
+    Decide, apenas pelo conteúdo da sentença, se um chunk pode terminar depois dela
+
+    A probabilidade é proporcional ao tamanho da sentença (média de um corte a cada average_chars).
+    Como a decisão não depende da posição no texto, editar uma sentença altera só o chunk
+    em que ela está: os cortes seguintes se repetem e os demais chunks mantêm o mesmo texto.
+    """
+    text = WHITESPACE.sub(' ', ''.join(content for content, is_tag in parts if not is_tag)).strip()
+    if not text:
+        return False
+    return zlib.crc32(text.encode('utf-8')) < min(len(text) / average_chars, 1.0) * 0x100000000
+
+
+def iter_text_chunks(text: str, max_billed_chars: int = MAX_BILLED_CHARACTERS,
+                     max_total_chars: int = MAX_TOTAL_CHARACTERS, ssml: Optional[bool] = None,
+                     first_chunk_chars: Optional[int] = None,
+                     target_chunk_chars: Optional[int] = None) -> Iterator[str]:
+    """
+    Divide o texto em chunks para o Polly em uma única passagem
+
+    Os cortes acontecem em fim de sentença (. ! ? e quebras de linha, ignorando abreviações),
+    nunca dentro de tags SSML. Sentenças maiores que o limite são quebradas entre palavras.
+
+    Com target_chunk_chars, os cortes são definidos pelo conteúdo das sentenças (chunks de
+    target_chunk_chars caracteres em média, nunca acima dos limites): versões editadas de um texto
+    geram os mesmos chunks fora do trecho alterado, e esses chunks são reaproveitados do cache.
+
+    Args:
+        text (str): Texto ou documento SSML
+        max_billed_chars (int): Máximo de caracteres cobrados (sem tags) por chunk
+        max_total_chars (int): Máximo de caracteres totais (com tags) por chunk
+        ssml (bool, optional): Se o texto é SSML (padrão: detecta pela tag <speak>)
+        first_chunk_chars (int, optional): Máximo de caracteres cobrados apenas no primeiro chunk
+        target_chunk_chars (int, optional): Tamanho médio dos chunks com cortes definidos pelo conteúdo
+
+    Yields:
+        str: Chunks de texto (ou documentos SSML completos)
+    """
+    if ssml is None:
+        ssml = text.lstrip().startswith('<speak')
+
+    packer = _ChunkPacker(max_billed_chars, max_total_chars, first_chunk_chars)
+
+    # Chunks menores que metade da média não são cortados (evita chamadas ao Polly com poucas palavras)
+    min_chunk_chars = 0
+    if target_chunk_chars:
+        target_chunk_chars = min(target_chunk_chars, max_billed_chars)
+        min_chunk_chars = target_chunk_chars // 2
+
+    for sentence in _iter_sentences(text, ssml):
+        yield from packer.add(sentence)
+        if (target_chunk_chars and packer.billed >= min_chunk_chars and
+                _is_content_boundary(sentence, target_chunk_chars - min_chunk_chars)):
+            yield from packer.finish()
+    yield from packer.finish()
+
+
+def split_text(text: str, max_billed_chars: int = MAX_BILLED_CHARACTERS,
+               max_total_chars: int = MAX_TOTAL_CHARACTERS, ssml: Optional[bool] = None,
+               first_chunk_chars: Optional[int] = None, target_chunk_chars: Optional[int] = None) -> List[str]:
+    """
+    Versão em lista de iter_text_chunks
+    """
+    return list(iter_text_chunks(text, max_billed_chars, max_total_chars, ssml, first_chunk_chars,
+                                 target_chunk_chars))
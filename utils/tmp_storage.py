@@ -0,0 +1,301 @@
+import os
+import time
+import functools
+import threading
+from typing import Callable, Dict, Optional
+
+from utils import telemetry
+
+# Orçamento dos áudios gerados em TMP_DIR e espaço livre mínimo no disco
+TMP_MAX_MB = float(os.getenv('TTS_TMP_MAX_MB', '256'))
+TMP_MIN_FREE_MB = float(os.getenv('TTS_TMP_MIN_FREE_MB', '64'))
+
+# Depois de uma limpeza o uso fica abaixo desta fração do orçamento (evita limpar a cada resposta)
+LOW_WATER_FRACTION = 0.8
+
+# Arquivos usados há menos tempo que isto não são removidos (podem estar em uso por outra requisição)
+MIN_FILE_AGE_SECONDS = 30
+
+# Apenas os arquivos criados pelo serviço (tts_audio_*, tts_streaming_*) são contados e removidos;
+# o cache local de áudio (diretório tts_cache) tem limite próprio
+MANAGED_PREFIX = 'tts_'
+
+
+class TmpStorageManager:
+    """
+    Mantém os arquivos gerados em um diretório temporário dentro de um orçamento de bytes
+
+    O uso é conhecido após uma varredura (feita em background quando o gerenciador é criado) e
+    atualizado a cada arquivo registrado com track(), de modo que a verificação depois de cada
+    resposta não acessa o disco (além de um statvfs). Ao passar do orçamento, uma única passagem
+    com scandir, em uma thread em background, remove os arquivos usados há mais tempo; apenas com
+    o disco quase cheio a limpeza é feita antes de responder.
+    """
+
+    def __init__(self, root: str, max_bytes: int, min_free_bytes: int = 0):
+        """
+        Args:
+            root (str): Diretório gerenciado
+            max_bytes (int): Orçamento em bytes dos arquivos do diretório
+            min_free_bytes (int): Espaço livre mínimo no disco do diretório
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.min_free_bytes = min_free_bytes
+
+        # Bytes e arquivos no diretório (None até a primeira varredura)
+        self._used_bytes = None
+        self._files = 0
+        # [bytes, arquivos] registrados com track() durante a varredura em andamento
+        self._tracked_during_scan = None
+        self._lock = threading.Lock()
+        # Serializa as varreduras, que rodam fora de _lock (track() não espera pelo disco)
+        self._scan_lock = threading.Lock()
+        # Limpeza em background (no máximo uma por vez)
+        self._worker = None
+
+        self.scans = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def track(self, path: str, size: int):
+        """
+        Registra um arquivo gravado no diretório (mantém o uso atualizado sem nova varredura)
+        """
+        with self._lock:
+            if self._tracked_during_scan is not None:
+                self._tracked_during_scan[0] += size
+                self._tracked_during_scan[1] += 1
+            if self._used_bytes is not None:
+                self._used_bytes += size
+                self._files += 1
+
+    def free_bytes(self) -> Optional[int]:
+        """
+        Espaço livre no disco do diretório, ou None se não puder ser lido
+        """
+        try:
+            stats = os.statvfs(self.root)
+        except (OSError, AttributeError):
+            return None
+        return stats.f_bavail * stats.f_frsize
+
+    def disk_full(self) -> bool:
+        free = self.free_bytes()
+        return free is not None and free < self.min_free_bytes
+
+    def needs_cleanup(self) -> bool:
+        return self._used_bytes is None or self._used_bytes > self.max_bytes or self.disk_full()
+
+    def maybe_cleanup(self) -> Optional[Dict]:
+        """
+        Limpa o diretório apenas se o orçamento foi ultrapassado, o disco está quase cheio ou o
+        uso ainda não é conhecido
+
+        A verificação usa apenas o total mantido por track() e um statvfs. A varredura roda em
+        background (na Lambda ela continua quando a instância é reativada), exceto com o disco
+        quase cheio, quando a próxima gravação poderia falhar
+
+        Returns:
+            dict: Resultado de cleanup() se a limpeza foi feita agora, ou None
+        """
+        if self.disk_full() and not self.cleanup_running():
+            return self.cleanup()
+        if self._used_bytes is not None and self._used_bytes <= self.max_bytes:
+            return None
+        self.cleanup_in_background()
+        return None
+
+    def cleanup_running(self) -> bool:
+        worker = self._worker
+        return worker is not None and worker.is_alive()
+
+    def cleanup_in_background(self):
+        """
+        Agenda cleanup() em uma thread em background, se nenhuma limpeza estiver em andamento
+        """
+        with self._lock:
+            if self.cleanup_running():
+                return
+            self._worker = threading.Thread(target=self._background_cleanup, name='tts-tmp-cleanup', daemon=True)
+            self._worker.start()
+
+    def _background_cleanup(self):
+        try:
+            self.cleanup()
+        except OSError as e:
+            telemetry.error(f'Temporary storage cleanup failed: {e}')
+
+    def _scan(self) -> list:
+        """
+        Lista os arquivos gerenciados do diretório em uma única passagem com scandir
+
+        Returns:
+            list: (último uso, tamanho, caminho) de cada arquivo
+        """
+        files = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if not entry.name.startswith(MANAGED_PREFIX):
+                    continue
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files.append((max(stat.st_atime, stat.st_mtime), stat.st_size, entry.path))
+                except FileNotFoundError:
+                    continue
+        return files
+
+    def cleanup(self, max_age_seconds: Optional[float] = None) -> Dict:
+        """
+        Remove os arquivos usados há mais tempo até o uso ficar abaixo de LOW_WATER_FRACTION
+        do orçamento (e o disco voltar a ter min_free_bytes livres)
+
+        O disco é acessado fora de _lock; os arquivos registrados durante a varredura são
+        somados ao uso calculado
+
+        Args:
+            max_age_seconds (float, optional): Remove também os arquivos sem uso há mais que este tempo
+
+        Returns:
+            dict: Arquivos removidos, bytes liberados e uso atual
+        """
+        with self._scan_lock:
+            with self._lock:
+                self._tracked_during_scan = [0, 0]
+            try:
+                now = time.time()
+                files = self._scan()
+            except OSError:
+                with self._lock:
+                    self._tracked_during_scan = None
+                raise
+
+            used = sum(size for _, size, _ in files)
+            target = self.max_bytes * LOW_WATER_FRACTION if used > self.max_bytes else self.max_bytes
+            free = self.free_bytes()
+            deficit = self.min_free_bytes - free if free is not None else 0
+
+            removed = 0
+            freed = 0
+            files.sort()
+            for last_used, size, path in files:
+                age = now - last_used
+                if age < MIN_FILE_AGE_SECONDS:
+                    break
+                expired = max_age_seconds is not None and age > max_age_seconds
+                if not expired and used <= target and deficit <= 0:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    telemetry.error(f'Could not remove {path}: {e}')
+                    continue
+                used -= size
+                deficit -= size
+                freed += size
+                removed += 1
+
+            with self._lock:
+                tracked_bytes, tracked_files = self._tracked_during_scan
+                self._tracked_during_scan = None
+                self._used_bytes = used + tracked_bytes
+                self._files = len(files) - removed + tracked_files
+                self.scans += 1
+                self.evictions += removed
+                self.evicted_bytes += freed
+
+        if removed:
+            telemetry.debug(f'Removed {removed} files ({freed} bytes) from {self.root}')
+        return {'removed': removed, 'freed_bytes': freed, 'used_bytes': used}
+
+    def usage(self) -> Dict:
+        """
+        Retorna o uso atual do diretório e do disco
+        """
+        if self._used_bytes is None:
+            with self._scan_lock:
+                if self._used_bytes is None:
+                    files = self._scan()
+                    with self._lock:
+                        self._used_bytes = sum(size for _, size, _ in files)
+                        self._files = len(files)
+                        self.scans += 1
+        with self._lock:
+            return {
+                'used_bytes': self._used_bytes,
+                'files': self._files,
+                'max_bytes': self.max_bytes,
+                'free_bytes': self.free_bytes(),
+                'scans': self.scans,
+                'evictions': self.evictions,
+                'evicted_bytes': self.evicted_bytes
+            }
+
+
+# Gerenciadores compartilhados pelo processo (um por diretório)
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_tmp_storage(root: str) -> TmpStorageManager:
+    """
+    Retorna o gerenciador do diretório informado, criando-o apenas uma vez por processo
+
+    Args:
+        root (str): Diretório temporário (ex.: TMP_DIR)
+    """
+    root = os.path.abspath(root)
+    with _managers_lock:
+        manager = _managers.get(root)
+        if manager is None:
+            os.makedirs(root, exist_ok=True)
+            manager = TmpStorageManager(root, int(TMP_MAX_MB * 1024 * 1024), int(TMP_MIN_FREE_MB * 1024 * 1024))
+            # A primeira varredura roda durante a inicialização, fora do caminho da resposta
+            manager.cleanup_in_background()
+            _managers[root] = manager
+        return manager
+
+
+# Handlers decorados em execução na thread (a limpeza roda apenas no mais externo)
+_active_handlers = threading.local()
+
+
+def manages_tmp_storage(root: str, on_finish: Optional[Callable[[], None]] = None) -> Callable:
+    """
+    Decorator para handlers da Lambda: com a resposta pronta, verifica o uso do diretório
+    temporário e agenda a limpeza em background se necessário (sem acesso ao disco enquanto o
+    uso estiver dentro do orçamento)
+    Handlers decorados chamados por outro handler decorado (ex.: lambda_handler -> batch_handler)
+    não repetem a verificação
+
+    Args:
+        root (str): Diretório temporário (ex.: TMP_DIR)
+        on_finish (callable, optional): Executado antes da limpeza, com a resposta pronta
+            (ex.: aguardar gravações em background antes de a instância ser congelada)
+    """
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            if getattr(_active_handlers, 'running', False):
+                return handler(*args, **kwargs)
+
+            _active_handlers.running = True
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                _active_handlers.running = False
+                if on_finish is not None:
+                    try:
+                        on_finish()
+                    except Exception as e:
+                        telemetry.error(f'Post-response task failed: {e}')
+                try:
+                    with telemetry.stage('tmp_cleanup'):
+                        get_tmp_storage(root).maybe_cleanup()
+                except OSError as e:
+                    telemetry.error(f'Temporary storage cleanup failed: {e}')
+        return wrapper
+    return decorator